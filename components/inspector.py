@@ -20,6 +20,7 @@ class Inspector:
         dataframe_dict_path: str = "obj_dictionaries/dataframes.csv",
         model_dict_path: str = "obj_dictionaries/models.csv",
         tensor_dict_path: str = "obj_dictionaries/tensors.csv",
+        file_cache: dict = None,
     ):
         """
         Initializes the Inspector with the output path for
@@ -30,8 +31,12 @@ class Inspector:
         - dataframe_dict_path (str): Path to the DataFrame dictionary CSV.
         - model_dict_path (str): Path to the model dictionary CSV.
         - tensor_dict_path (str): Path to the tensor operations CSV.
+        - file_cache (dict): Optional dict filled with {absolute path: source}
+          for every file read, so later passes can skip re-reading it. A
+          size-capped dict may decline entries; those are simply read again.
         """
         self.output_path = output_path
+        self.file_cache = file_cache
         self._setup(dataframe_dict_path, model_dict_path, tensor_dict_path)
 
     def inspect(self, filename: str) -> pd.DataFrame:
@@ -59,6 +64,8 @@ class Inspector:
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 source = file.read()
+            if self.file_cache is not None:
+                self.file_cache[file_path] = source
 
             # Parse the file into an AST
             tree = ast.parse(source)
@@ -13,12 +13,14 @@ class ProjectAnalyzer:
     and manages all file-related operations.
     """
 
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, file_cache: dict = None):
         """
         Initializes the ProjectAnalyzer.
 
         Parameters:
         - output_path (str): Directory where analysis results will be saved.
+        - file_cache (dict): Optional dict populated with the source of every
+          analyzed file, keyed by absolute path.
         """
         self.base_output_path = output_path
         self.output_path = os.path.join(output_path, "output")
@@ -26,7 +28,7 @@ class ProjectAnalyzer:
         # Create output directory if it doesn't exist, but don't clean it
         os.makedirs(self.output_path, exist_ok=True)
 
-        self.inspector = Inspector(self.output_path)
+        self.inspector = Inspector(self.output_path, file_cache=file_cache)
 
     def clean_output_directory(self):
         """
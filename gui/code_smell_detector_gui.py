@@ -1,14 +1,63 @@
+import mmap
 import os
 import sys
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from tkinter import filedialog, messagebox, ttk
-from components.project_analyzer import ProjectAnalyzer
 from gui.textbox_redirect import TextBoxRedirect
 from llm_detection.catalog_service import LLMCatalogService
-from llm_detection.types import ProviderKind, PromptMode
-from llm_detection.providers import LocalLLMProvider, ApiLLMProvider
-from llm_detection.orchestrator import LLMOrchestrator
+from llm_detection.types import DetectionTarget, ProviderKind, PromptMode
+
+
+@lru_cache(maxsize=16)
+def _count_projects(input_path, mtime_ns):
+    """
+    Count the project folders directly under input_path.
+    mtime_ns is part of the cache key: adding or removing a folder changes it.
+    """
+    with os.scandir(input_path) as entries:
+        return sum(
+            1 for entry in entries
+            if entry.is_dir() and entry.name not in {"output", "execution_log.txt"}
+        )
+
+
+class _SourceCache(dict):
+    """
+    {absolute path: source} handed from the static pass to the LLM pass.
+    Holds at most max_chars characters: sources beyond the budget are not
+    kept and are simply read again by the LLM pass.
+    """
+
+    def __init__(self, max_chars):
+        super().__init__()
+        self.max_chars = max_chars
+        self._chars = 0
+        # The static pass may fill the cache from several worker threads
+        self._lock = threading.Lock()
+
+    def __setitem__(self, file_path, source):
+        with self._lock:
+            if file_path in self or self._chars + len(source) > self.max_chars:
+                return
+            self._chars += len(source)
+            super().__setitem__(file_path, source)
+
+    def pop(self, file_path, default=None):
+        with self._lock:
+            source = super().pop(file_path, None)
+            if source is None:
+                return default
+            self._chars -= len(source)
+            return source
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._chars = 0
 
 
 class CodeSmellDetectorGUI:
@@ -16,9 +65,31 @@ class CodeSmellDetectorGUI:
     The main GUI for the AI-specific Code Smells Detector application.
     """
 
+    # Directories never searched for Python files
+    _PRUNED_DIRS = frozenset({'.git', '__pycache__', '.venv', 'venv', 'node_modules'})
+    # Number of files held in memory at once during LLM detection
+    LLM_BATCH_SIZE = 32
+    # Files longer than this are sent to the LLM as several statement-aligned windows
+    LLM_MAX_TARGET_CHARS = 16000
+    # ... or longer than this many lines, to keep each prompt's token count down
+    LLM_MAX_TARGET_LINES = 500
+    # Characters of source kept from the static pass for the LLM pass
+    FILE_CACHE_MAX_CHARS = 8 * 1024 * 1024
+    # Sources at least this large are decoded straight from a memory map
+    MMAP_MIN_SIZE = 4 * 1024 * 1024
+    # Interval at which printed output is flushed into the textbox
+    STDOUT_POLL_MS = 50
+    # Provider type radiobutton value -> provider kind
+    _PROVIDER_KINDS = {"local": ProviderKind.LOCAL, "api": ProviderKind.API}
+
     def __init__(self, master):
         self.master = master
         self.catalog_service = LLMCatalogService()
+        self.catalog = None
+        self._providers_by_key = {}
+        # Detectable smells snapshot shown in the listbox (refreshed by update_smell_list)
+        self._detectable_smells = []
+        self._smell_id_by_name = {}
         self.setup_gui()
         self.configure_stdout()
         self.project_analyzer = None
@@ -156,9 +227,6 @@ class CodeSmellDetectorGUI:
         self.smell_listbox.pack(side=tk.LEFT, fill=tk.BOTH)
         smell_scrollbar.config(command=self.smell_listbox.yview)
 
-        # Initialize LLM data
-        self.load_llm_data()
-
         # Output Textbox
         self.output_textbox = tk.Text(
             self.master, height=10, width=60, state="disabled"
@@ -183,12 +251,25 @@ class CodeSmellDetectorGUI:
         self.master.grid_rowconfigure(6, weight=1)
         self.master.grid_columnconfigure(1, weight=1)
 
+        # Initialize LLM data once the window is up, so the catalog read
+        # does not delay the first paint
+        self.master.after_idle(self.load_llm_data)
+
     def configure_stdout(self):
         """
         Redirects stdout to the GUI Text widget.
         """
-        output_redirect = TextBoxRedirect(self.output_textbox)
-        sys.stdout = output_redirect
+        self._stdout_redirect = TextBoxRedirect(self.output_textbox)
+        sys.stdout = self._stdout_redirect
+        self.master.after(self.STDOUT_POLL_MS, self._drain_stdout)
+
+    def _drain_stdout(self):
+        """
+        Moves text printed (possibly by worker threads) into the output box.
+        Runs on the Tk main loop every STDOUT_POLL_MS milliseconds.
+        """
+        self._stdout_redirect.drain()
+        self.master.after(self.STDOUT_POLL_MS, self._drain_stdout)
 
     def disable_key_press(self, event):
         """
@@ -218,6 +299,12 @@ class CodeSmellDetectorGUI:
         """
         try:
             self.catalog = self.catalog_service.load()
+            # (kind, display name) -> provider; the first definition wins
+            self._providers_by_key = {}
+            for provider in self.catalog.providers:
+                self._providers_by_key.setdefault(
+                    (provider.kind, provider.display_name), provider
+                )
             self.update_provider_list()
             self.update_smell_list()
         except Exception as e:
@@ -236,16 +323,14 @@ class CodeSmellDetectorGUI:
         """
         Update provider combobox based on selected provider type (Local/API).
         """
+        if self.catalog is None:
+            # Catalog not loaded yet: load_llm_data will populate the list
+            return
         try:
-            provider_type = self.provider_type_var.get()
-            kind = ProviderKind.LOCAL if provider_type == "local" else ProviderKind.API
-            
-            providers = [
-                p for p in self.catalog.providers 
-                if p.kind == kind
+            kind = self._PROVIDER_KINDS[self.provider_type_var.get()]
+            provider_names = [
+                p.display_name for p in self.catalog.providers if p.kind == kind
             ]
-            
-            provider_names = [p.display_name for p in providers]
             self.provider_combo['values'] = provider_names
             
             if provider_names:
@@ -260,8 +345,14 @@ class CodeSmellDetectorGUI:
         """
         Update smell listbox with only detectable smells (those with default prompt).
         """
+        if self.catalog is None:
+            return
         try:
             detectable_smells = self.catalog_service.list_detectable_smells()
+            self._detectable_smells = detectable_smells
+            self._smell_id_by_name = {
+                s.display_name: s.smell_id for s in detectable_smells
+            }
             
             self.smell_listbox.delete(0, tk.END)
             
@@ -315,41 +406,31 @@ class CodeSmellDetectorGUI:
                 return
             
             # Find provider by display name
-            provider_type = self.provider_type_var.get()
-            kind = ProviderKind.LOCAL if provider_type == "local" else ProviderKind.API
-            matching_providers = [
-                p for p in self.catalog.providers 
-                if p.display_name == provider_name and p.kind == kind
-            ]
+            kind = self._PROVIDER_KINDS[self.provider_type_var.get()]
+            matching_provider = self._providers_by_key.get((kind, provider_name))
             
-            if not matching_providers:
+            if matching_provider is None:
                 print(f"Error: Provider '{provider_name}' not found.")
                 return
                 
-            llm_provider_id = matching_providers[0].provider_id
+            llm_provider_id = matching_provider.provider_id
             
             # Validate smell selection (UC01 Step 13)
             selected_indices = self.smell_listbox.curselection()
             if not selected_indices:
                 # Check if there are any detectable smells (UC01 Scenario 11.a1)
-                detectable_smells = self.catalog_service.list_detectable_smells()
-                if not detectable_smells:
+                if not self._detectable_smells:
                     print("Warning: Non sono presenti Code Smell detectabili tramite LLM, l'analisi procederà in modo statico")
                     use_llm = False
                 else:
                     print("Error: Please select at least one code smell.")
                     return
             else:
-                # Get selected smell IDs
-                detectable_smells = self.catalog_service.list_detectable_smells()
+                # Get selected smell IDs from the snapshot the listbox was built from
                 for idx in selected_indices:
-                    smell_name = self.smell_listbox.get(idx)
-                    matching_smell = next(
-                        (s for s in detectable_smells if s.display_name == smell_name), 
-                        None
-                    )
-                    if matching_smell:
-                        selected_smell_ids.append(matching_smell.smell_id)
+                    smell_id = self._smell_id_by_name.get(self.smell_listbox.get(idx))
+                    if smell_id:
+                        selected_smell_ids.append(smell_id)
 
         # Start analysis in a new thread
         analysis_thread = threading.Thread(
@@ -384,6 +465,7 @@ class CodeSmellDetectorGUI:
         """
         Performs the actual analysis. This runs on a separate thread.
         """
+        file_cache = None
         try:
             print(f"Input Path: {input_path}")
             print(f"Output Path: {output_path}")
@@ -397,17 +479,22 @@ class CodeSmellDetectorGUI:
                 print(f"LLM Provider: {llm_provider_id}")
                 print(f"Selected Smells: {', '.join(selected_smell_ids)}")
 
-            self.project_analyzer = ProjectAnalyzer(output_path)
+            # Sources read by the static analysis are handed over to the LLM
+            # pass instead of being read from disk a second time
+            run_llm = bool(use_llm and llm_provider_id and selected_smell_ids)
+            file_cache = _SourceCache(self.FILE_CACHE_MAX_CHARS) if run_llm else None
+            # Imported on first run: pulls in pandas and the AST rule set
+            from components.project_analyzer import ProjectAnalyzer
+
+            self.project_analyzer = ProjectAnalyzer(output_path, file_cache=file_cache)
 
             if not is_resume:
                 self.project_analyzer.clean_output_directory()
 
             if is_multiple:
                 # Validate that there are at least 2 projects
-                project_count = sum(
-                    1 for item in os.listdir(input_path)
-                    if os.path.isdir(os.path.join(input_path, item))
-                    and item not in {"output", "execution_log.txt"}
+                project_count = _count_projects(
+                    input_path, os.stat(input_path).st_mtime_ns
                 )
                 
                 if project_count < 2:
@@ -449,17 +536,23 @@ class CodeSmellDetectorGUI:
                 )
             
             # LLM Detection (UC01 Steps 10-16)
-            if use_llm and llm_provider_id and selected_smell_ids:
+            if run_llm:
                 print("\n--- Starting LLM Detection ---")
                 self._run_llm_detection(
                     input_path, 
                     output_path, 
                     llm_provider_id, 
-                    selected_smell_ids
+                    selected_smell_ids,
+                    num_walkers,
+                    file_cache=file_cache,
                 )
 
         except Exception as e:
             print(f"An error occurred during analysis: {e}")
+        finally:
+            # Entries the LLM pass did not visit (e.g. pruned folders)
+            if file_cache is not None:
+                file_cache.clear()
 
     def _check_python_files(self, path):
         """
@@ -468,17 +561,95 @@ class CodeSmellDetectorGUI:
         if os.path.isfile(path):
             return path.endswith('.py')
         
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.endswith('.py'):
-                    return True
-        return False
+        # Stops at the first hit instead of walking the whole tree
+        return next(self._iter_python_files(path), None) is not None
+
+    def _iter_python_files(self, path):
+        """
+        Yield the paths of the Python files found under the given directory.
+        VCS, cache and virtualenv directories are not descended into.
+        """
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self._PRUNED_DIRS:
+                            yield from self._iter_python_files(entry.path)
+                    # Slice compare: cheaper than endswith() on this per-entry path
+                    elif entry.name[-3:] == '.py' and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Unreadable directories are skipped, as os.walk did
+            return
+
+    @classmethod
+    def _read_source(cls, file_path):
+        """
+        Read a UTF-8 source file with a single, exactly sized read.
+        Large files are decoded from a memory map, without an extra bytes copy.
+        Line endings are normalized to \\n, as a text-mode read (and so the
+        static analysis' file_cache) would give them.
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= cls.MMAP_MIN_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    code = str(mapped, 'utf-8')
+            else:
+                code = f.read(size).decode('utf-8')
+        if '\r' in code:
+            code = code.replace('\r\n', '\n').replace('\r', '\n')
+        return code
+
+    def _read_target(self, file_path, input_path, file_cache=None):
+        """
+        Read a Python file into a DetectionTarget, or None if it cannot be read.
+        Sources already present in file_cache are taken (and evicted) from it.
+        """
+        code = file_cache.pop(os.path.abspath(file_path), None) if file_cache else None
+        try:
+            if code is None:
+                code = self._read_source(file_path)
+        except Exception as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            return None
+        return DetectionTarget(
+            filename=os.path.relpath(file_path, input_path),
+            code=code
+        )
 
-    def _run_llm_detection(self, input_path, output_path, provider_id, smell_ids):
+    def _iter_targets(self, input_path, executor, file_cache=None):
+        """
+        Yield DetectionTargets for the Python files under input_path.
+        Files are read concurrently on the executor, one batch at a time.
+        """
+        file_paths = self._iter_python_files(input_path)
+        while True:
+            batch = list(islice(file_paths, self.LLM_BATCH_SIZE))
+            if not batch:
+                return
+            for target in executor.map(
+                lambda file_path: self._read_target(file_path, input_path, file_cache),
+                batch,
+            ):
+                if target is not None:
+                    yield target
+
+    def _run_llm_detection(
+        self, input_path, output_path, provider_id, smell_ids, num_walkers=1,
+        file_cache=None,
+    ):
         """
         Run LLM detection on the input path and save results.
+        Python files are streamed to the orchestrator in batches, read and
+        analyzed concurrently using num_walkers threads. Sources found in
+        file_cache (filled by the static analysis) are not read again.
         """
         try:
+            # LLM components are only imported when LLM detection is used
+            from llm_detection.orchestrator import LLMOrchestrator
+            from llm_detection.providers import ApiLLMProvider, LocalLLMProvider
+
             # Get provider configuration
             provider_def = self.catalog_service.get_provider(provider_id)
             
@@ -489,65 +660,73 @@ class CodeSmellDetectorGUI:
                     model_name=config.get("model_name", "qwen2.5-coder:7b"),
                     host=config.get("host"),
                     options=config.get("options"),
-                    response_format=config.get("format")
+                    # JSON mode unless the catalog configures a format
+                    response_format=config.get("format", "json")
                 )
                 print(f"Using local LLM: {provider_def.display_name}")
             else:
                 config = provider_def.config
                 provider = ApiLLMProvider(
                     base_url=config.get("base_url", "http://localhost:8000"),
-                    timeout_s=config.get("timeout_s", 60.0)
+                    timeout_s=config.get("timeout_s", 60.0),
+                    # one pooled keep-alive connection per walker thread
+                    max_connections=max(1, num_walkers),
                 )
                 print(f"Using API provider: {provider_def.display_name}")
             
             # Create orchestrator
             orchestrator = LLMOrchestrator(provider, self.catalog)
             
-            # Collect Python files as detection targets
-            from llm_detection.types import DetectionTarget
-            targets = []
+            findings = []
+            files_seen = set()
+            prompts_sent = 0
             
-            if os.path.isfile(input_path):
-                if input_path.endswith('.py'):
-                    with open(input_path, 'r', encoding='utf-8') as f:
-                        code = f.read()
-                    targets.append(DetectionTarget(
-                        filename=os.path.basename(input_path),
-                        code=code
-                    ))
-            else:
-                for root, dirs, files in os.walk(input_path):
-                    for file in files:
-                        if file.endswith('.py'):
-                            file_path = os.path.join(root, file)
-                            try:
-                                with open(file_path, 'r', encoding='utf-8') as f:
-                                    code = f.read()
-                                relative_path = os.path.relpath(file_path, input_path)
-                                targets.append(DetectionTarget(
-                                    filename=relative_path,
-                                    code=code
-                                ))
-                            except Exception as e:
-                                print(f"Warning: Could not read {file_path}: {e}")
+            # The provider keeps its connection open for the whole run and
+            # releases it when detection ends
+            with provider, ThreadPoolExecutor(max_workers=max(1, num_walkers)) as executor:
+                # Collect Python files as detection targets (lazily for folders,
+                # so only one batch of source code is read at a time, on top of
+                # the size-capped file_cache left by the static analysis)
+                if os.path.isfile(input_path):
+                    targets = []
+                    if input_path.endswith('.py'):
+                        code = (file_cache or {}).get(os.path.abspath(input_path))
+                        if code is None:
+                            code = self._read_source(input_path)
+                        targets.append(DetectionTarget(
+                            filename=os.path.basename(input_path),
+                            code=code
+                        ))
+                else:
+                    targets = self._iter_targets(input_path, executor, file_cache)
+                
+                # Oversized files become several prompt-sized windows
+                def _windows(targets):
+                    for target in targets:
+                        files_seen.add(target.filename)
+                        yield from target.split(self.LLM_MAX_TARGET_CHARS, self.LLM_MAX_TARGET_LINES)
+                
+                # Run detection; each batch's prompts are dispatched concurrently
+                print("Running LLM detection...")
+                for batch_findings, batch_stats in orchestrator.detect_iter(
+                    _windows(targets),
+                    smell_ids=smell_ids,
+                    prompt_mode=PromptMode.DEFAULT,
+                    batch_size=self.LLM_BATCH_SIZE,
+                    concurrency=max(1, num_walkers),
+                ):
+                    findings.extend(batch_findings)
+                    prompts_sent += batch_stats.prompts_sent
+                    print(f"  - {len(files_seen)} file(s) analyzed")
             
-            if not targets:
+            if not files_seen:
                 print("No Python files found for LLM detection.")
                 return
             
-            print(f"Running LLM detection on {len(targets)} file(s)...")
-            
-            # Run detection
-            findings, stats = orchestrator.detect(
-                targets=targets,
-                smell_ids=smell_ids,
-                prompt_mode=PromptMode.DEFAULT
-            )
-            
             print(f"\nLLM Detection completed:")
-            print(f"  - Files processed: {stats.targets_processed}")
-            print(f"  - Smells analyzed: {stats.smells_processed}")
-            print(f"  - Prompts sent: {stats.prompts_sent}")
+            print(f"  - Files processed: {len(files_seen)}")
+            print(f"  - Smells analyzed: {len(smell_ids)}")
+            print(f"  - Prompts sent: {prompts_sent}")
             print(f"  - Findings detected: {len(findings)}")
             
             # Breakdown per file
@@ -580,16 +759,22 @@ class CodeSmellDetectorGUI:
         """
         Save LLM findings to CSV file in the output directory.
         """
-        import pandas as pd
+        import csv
         
-        # Convert findings to dataframe format
-        rows = [finding.to_overview_row() for finding in findings]
-        df = pd.DataFrame(rows)
+        # Stream rows to disk: only one overview row is resident at a time
+        rows = (finding.to_overview_row() for finding in findings)
+        first = next(rows, None)
+        if first is None:
+            return
         
         # Ensure output directory exists
         os.makedirs(output_path, exist_ok=True)
         
         # Save to CSV
         output_file = os.path.join(output_path, "llm_detection_results.csv")
-        df.to_csv(output_file, index=False)
+        with open(output_file, "w", newline="", encoding="utf-8") as fp:
+            writer = csv.DictWriter(fp, fieldnames=list(first.keys()))
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
         print(f"LLM results saved to: {output_file}")
@@ -1,18 +1,36 @@
+import bisect
 import tkinter as tk
 from tkinter import messagebox, ttk
 from tkinter.scrolledtext import ScrolledText
 from typing import Optional
 
 from llm_detection.catalog_service import CatalogValidationError, LLMCatalogService
+from llm_detection.types import LLMCatalog
+
+# Errors raised by catalog loading/saving (I/O, bad JSON or validation, unknown ids)
+_CATALOG_ERRORS = (OSError, ValueError, KeyError)
+
 
 class ManageCodeSmellsGUI:
+    # Delay used to coalesce rapid combobox selections
+    SELECT_DEBOUNCE_MS = 50
+
     def __init__(self, master: tk.Tk, catalog_service: Optional[LLMCatalogService] = None):
         self.master = master
         self.catalog_service = catalog_service or LLMCatalogService()
 
         # State
         self._smell_display_to_id: dict[str, str] = {}
+        self._id_to_display: dict[str, str] = {}
         self._current_smell_id: Optional[str] = None
+        # Catalog read by the last dropdown refresh, reused by selection and save
+        self._catalog: Optional[LLMCatalog] = None
+        # Combobox labels, kept sorted case-insensitively (casefold, as sorted_smells)
+        self._smell_values: list[str] = []
+        # (smell_id, description) shown when the smell was selected, used to diff saves
+        self._loaded_desc: Optional[tuple[str, str]] = None
+        # Pending `after` id of a debounced selection update
+        self._pending_select_id: Optional[str] = None
 
         self._build_ui()
         self._load_smells_into_dropdown()
@@ -33,7 +51,7 @@ class ManageCodeSmellsGUI:
 
         self._smell_combo = ttk.Combobox(top, state="readonly", width=50)
         self._smell_combo.grid(row=0, column=1, sticky="w")
-        self._smell_combo.bind("<<ComboboxSelected>>", lambda _e: self._on_smell_selected())
+        self._smell_combo.bind("<<ComboboxSelected>>", lambda _e: self._schedule_smell_selected())
 
         # Add (+) and Remove (-) buttons
         btn_frame = ttk.Frame(top)
@@ -77,34 +95,44 @@ class ManageCodeSmellsGUI:
     def _load_smells_into_dropdown(self):
         try:
             catalog = self.catalog_service.load()
-        except Exception as e:
+        except _CATALOG_ERRORS as e:
             messagebox.showerror("Errore Caricamento", f"Impossibile caricare il catalogo: {e}")
             return
 
-        self._smell_display_to_id.clear()
-        values = []
+        self._populate_from_catalog(catalog)
 
-        # Sort by display name
-        sorted_smells = sorted(catalog.smells, key=lambda s: s.display_name.lower())
-        
-        for smell in sorted_smells:
-            label = f"{smell.display_name}"
-            self._smell_display_to_id[label] = smell.smell_id
-            values.append(label)
+    def _reload_catalog(self):
+        """Re-read the catalog after a failed lookup or save, leaving the widgets as they are.
+
+        The cached catalog may be out of date with the file at that point; the
+        description being edited is kept so the user can retry.
+        """
+        try:
+            self._catalog = self.catalog_service.load()
+        except _CATALOG_ERRORS:
+            pass
+
+    def _populate_from_catalog(self, catalog: LLMCatalog):
+        self._catalog = catalog
+
+        # Already ordered by display name
+        sorted_smells = catalog.sorted_smells()
+        self._smell_values = [s.display_name for s in sorted_smells]
+        self._smell_display_to_id = {s.display_name: s.smell_id for s in sorted_smells}
+        self._id_to_display = {s.smell_id: s.display_name for s in sorted_smells}
 
+        self._refresh_dropdown()
+
+    def _refresh_dropdown(self):
+        """Push the (already sorted) labels to the combobox and restore the selection."""
+        values = self._smell_values
         self._smell_combo["values"] = values
 
         if values:
-            if self._current_smell_id:
-                # Try to preserve selection
-                found = False
-                for display, sid in self._smell_display_to_id.items():
-                    if sid == self._current_smell_id:
-                        self._smell_combo.set(display)
-                        found = True
-                        break
-                if not found:
-                    self._smell_combo.current(0)
+            # Try to preserve selection
+            display = self._id_to_display.get(self._current_smell_id)
+            if display is not None:
+                self._smell_combo.set(display)
             else:
                 self._smell_combo.current(0)
             
@@ -114,6 +142,18 @@ class ManageCodeSmellsGUI:
             self._clear_details()
             self._disable_controls(no_smells=True)
 
+    def _schedule_smell_selected(self):
+        # Coalesce bursts of selection events (e.g. arrow keys) into one update
+        if self._pending_select_id is not None:
+            self.master.after_cancel(self._pending_select_id)
+        self._pending_select_id = self.master.after(
+            self.SELECT_DEBOUNCE_MS, self._run_pending_selection
+        )
+
+    def _run_pending_selection(self):
+        self._pending_select_id = None
+        self._on_smell_selected()
+
     def _on_smell_selected(self):
         display = self._smell_combo.get()
         if not display:
@@ -127,22 +167,24 @@ class ManageCodeSmellsGUI:
         
         # Load details
         try:
-            catalog = self.catalog_service.load()
-            smell = catalog.get_smell(smell_id)
+            smell = self._catalog.get_smell(smell_id)
             
             self._name_var.set(smell.display_name)
-            self._desc_text.delete("1.0", "end")
-            self._desc_text.insert("1.0", smell.description)
+            # One Tcl command (and one re-layout) instead of delete + insert
+            self._desc_text.replace("1.0", "end", smell.description)
+            self._loaded_desc = (smell_id, smell.description)
             
             self._enable_controls()
             
-        except Exception as e:
+        except _CATALOG_ERRORS as e:
             messagebox.showerror("Errore", f"Errore nel caricamento dei dettagli dello smell: {e}")
+            self._reload_catalog()
 
     def _clear_details(self):
         self._name_var.set("")
         self._desc_text.delete("1.0", "end")
         self._current_smell_id = None
+        self._loaded_desc = None
 
     def _disable_controls(self, no_smells=False):
         self._name_entry.configure(state="readonly")
@@ -166,9 +208,21 @@ class ManageCodeSmellsGUI:
         AddSmellDialog(self.master, self.catalog_service, self._on_smell_added_callback)
 
     def _on_smell_added_callback(self, new_smell_id):
-        # Callback after successful add
+        # Callback after successful add: insert only the new entry
         self._current_smell_id = new_smell_id
-        self._load_smells_into_dropdown()
+        try:
+            self._catalog = self.catalog_service.load()
+            smell = self._catalog.get_smell(new_smell_id)
+        except _CATALOG_ERRORS:
+            self._load_smells_into_dropdown()
+            return
+
+        label = smell.display_name
+        if label not in self._smell_display_to_id:
+            bisect.insort(self._smell_values, label, key=str.casefold)
+        self._smell_display_to_id[label] = new_smell_id
+        self._id_to_display[new_smell_id] = label
+        self._refresh_dropdown()
 
     def _on_remove_smell(self):
         # UC04 - Remove Code Smell
@@ -185,11 +239,14 @@ class ManageCodeSmellsGUI:
         if confirm:
             try:
                 self.catalog_service.remove_smell(self._current_smell_id)
+                self._drop_from_dropdown(self._current_smell_id)
                 self._current_smell_id = None
-                self._load_smells_into_dropdown()
+                self._refresh_dropdown()
                 messagebox.showinfo("Successo", "Code smell eliminato correttamente.")
-            except Exception as e:
+            except _CATALOG_ERRORS as e:
                 messagebox.showerror("Errore", f"Errore durante l'eliminazione: {e}")
+                # Resync the dropdown with what is actually saved
+                self._load_smells_into_dropdown()
 
     def _on_save_changes(self):
         # UC05 - Modify Code Smell
@@ -201,14 +258,18 @@ class ManageCodeSmellsGUI:
             messagebox.showwarning("Attenzione", "La descrizione non può essere vuota.")
             return
 
-        # Check if description actually changed to avoid unnecessary prompts
-        try:
-            catalog = self.catalog_service.load()
-            current_smell = catalog.get_smell(self._current_smell_id)
-            old_desc = current_smell.description
-        except Exception as e:
-            messagebox.showerror("Errore", f"Errore nel recupero dati originali: {e}")
-            return
+        # Check if description actually changed to avoid unnecessary prompts.
+        # The snapshot taken on selection avoids another catalog lookup.
+        smell_id = self._current_smell_id
+        if self._loaded_desc is not None and self._loaded_desc[0] == smell_id:
+            old_desc = self._loaded_desc[1]
+        else:
+            try:
+                old_desc = self._catalog.get_smell(smell_id).description
+            except _CATALOG_ERRORS as e:
+                messagebox.showerror("Errore", f"Errore nel recupero dati originali: {e}")
+                self._reload_catalog()
+                return
         
         if new_desc == old_desc:
              messagebox.showinfo("Info", "Nessuna modifica rilevata alla descrizione.")
@@ -229,12 +290,20 @@ class ManageCodeSmellsGUI:
             return
 
         try:
-            self.catalog_service.update_smell_description(self._current_smell_id, new_desc)
+            self.catalog_service.update_smell_description(smell_id, new_desc)
+            # Only the description changed: the dropdown labels stay as they are
+            # and the snapshot becomes the saved (stripped) text.
+            self._loaded_desc = (smell_id, new_desc.strip())
             messagebox.showinfo("Successo", "Descrizione aggiornata correttamente.")
-            # Reload to Ensure consistency? Not strictly necessary if local update matches DB, but safe.
-            self._load_smells_into_dropdown() 
-        except Exception as e:
+        except _CATALOG_ERRORS as e:
             messagebox.showerror("Errore", f"Errore durante il salvataggio: {e}")
+            self._reload_catalog()
+
+    def _drop_from_dropdown(self, smell_id: str):
+        display = self._id_to_display.pop(smell_id, None)
+        if display is not None:
+            del self._smell_display_to_id[display]
+            self._smell_values.remove(display)
 
     def _on_close(self):
         # Check for unsaved changes? 
@@ -247,27 +316,35 @@ class ManageCodeSmellsGUI:
         
         # We can implement a simple check if text modified vs loaded, but loading again is expensive?
         # Let's keep it simple: Just close.
+        if self._pending_select_id is not None:
+            self.master.after_cancel(self._pending_select_id)
+            self._pending_select_id = None
         self.master.destroy()
 
 
 class AddSmellDialog(tk.Toplevel):
+    WIDTH = 400
+    HEIGHT = 300
+
     def __init__(self, parent, catalog_service, on_success_callback):
         super().__init__(parent)
         self.catalog_service = catalog_service
         self.on_success = on_success_callback
         
         self.title("Aggiungi Code Smell")
-        self.geometry("400x300")
+        # Size and centered position in one call: the dialog size is fixed, so
+        # there is no need to realize it (update_idletasks) to measure it
+        self.geometry(self._centered_geometry(parent, self.WIDTH, self.HEIGHT))
         self.transient(parent)
         self.grab_set()
         
         self._build_dialog_ui()
-        
-        # Center dialog
-        self.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - (self.winfo_width() // 2)
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - (self.winfo_height() // 2)
-        self.geometry(f"+{x}+{y}")
+
+    @staticmethod
+    def _centered_geometry(parent, width: int, height: int) -> str:
+        x = parent.winfo_x() + (parent.winfo_width() - width) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - height) // 2
+        return f"{width}x{height}+{x}+{y}"
 
     def _build_dialog_ui(self):
         frame = ttk.Frame(self, padding="10")
@@ -313,7 +390,7 @@ class AddSmellDialog(tk.Toplevel):
             self.destroy()
         except CatalogValidationError as e:
             messagebox.showerror("Errore Validazione", str(e))
-        except Exception as e:
+        except _CATALOG_ERRORS as e:
             messagebox.showerror("Errore", f"Impossibile salvare: {e}")
 
     def _on_cancel(self):
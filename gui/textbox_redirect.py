@@ -1,22 +1,71 @@
 import io
+import queue
+from collections import deque
 import tkinter as tk
 
 
 class TextBoxRedirect(io.StringIO):
     """
     Redirects stdout to a tkinter Text widget.
+
+    write() is safe to call from worker threads: text is only queued, and
+    drain() (run on the Tk main thread) moves it into the widget in one insert.
+
+    With max_lines set, the widget is trimmed back to its last max_lines lines
+    whenever it grows past overflow_lines, so inserts do not slow down as the
+    buffer grows over a long run. A batch that alone fills max_lines replaces
+    the widget content with its own last max_lines lines, so lines that would
+    be trimmed straight away are never inserted.
     """
 
-    def __init__(self, textbox):
+    def __init__(self, textbox, max_chunks=1000, max_lines=None, overflow_lines=None):
         super().__init__()
         self.textbox = textbox
+        self.max_chunks = max_chunks
+        self.max_lines = max_lines
+        # Trimming in steps keeps the delete off the per-insert path
+        self.overflow_lines = overflow_lines or (max_lines and max_lines + max_lines // 4)
+        self.queue = queue.Queue()
 
     def write(self, text):
+        self.queue.put(text)
+        return len(text)
+
+    def drain(self):
+        """
+        Flushes the queued text into the widget. Must run on the Tk thread.
+        """
+        chunks = []
+        try:
+            while len(chunks) < self.max_chunks:
+                chunks.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not chunks:
+            # Idle tick: leave the widget alone
+            return
+
+        text = "".join(chunks)
         self.textbox.config(state="normal")
-        self.textbox.insert(tk.END, text)
+        if self.max_lines and text.count("\n") >= self.max_lines:
+            tail = deque(text.splitlines(keepends=True), maxlen=self.max_lines)
+            self.textbox.delete("1.0", tk.END)
+            self.textbox.insert(tk.END, "".join(tail))
+        else:
+            self.textbox.insert(tk.END, text)
+            if self.max_lines:
+                self._trim()
         self.textbox.config(state="disabled")
+        # Scroll and redraw once per batch rather than once per print
         self.textbox.see(tk.END)
-        # Automatically scroll to the end of the output
+        self.textbox.update_idletasks()
+
+    def _trim(self):
+        # Output ends with a newline, so the last line index is the empty
+        # line after it and the line count is one less
+        last_line = int(self.textbox.index("end-1c").split(".")[0])
+        if last_line - 1 > self.overflow_lines:
+            self.textbox.delete("1.0", f"{last_line - self.max_lines}.0")
 
     def flush(self):
         pass  # Overridden to comply with `io.StringIO`
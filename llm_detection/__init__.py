@@ -12,8 +12,16 @@ from .types import (
     DetectionTarget,
     PromptMode,
     ProviderKind,
+    FINDINGS_JSON_SCHEMA,
+    OVERVIEW_COLUMNS,
+)
+from .providers import (
+    LLMProvider,
+    MockLLMProvider,
+    LocalLLMProvider,
+    ApiLLMProvider,
+    CachedLLMProvider,
 )
-from .providers import LLMProvider, MockLLMProvider, LocalLLMProvider, ApiLLMProvider
 from .catalog_store import LLMCatalogStore
 from .catalog_service import LLMCatalogService, CatalogValidationError
 from .orchestrator import LLMOrchestrator
@@ -26,10 +34,13 @@ __all__ = [
     "DetectionTarget",
     "PromptMode",
     "ProviderKind",
+    "FINDINGS_JSON_SCHEMA",
+    "OVERVIEW_COLUMNS",
     "LLMProvider",
     "MockLLMProvider",
     "LocalLLMProvider",
     "ApiLLMProvider",
+    "CachedLLMProvider",
     "LLMCatalogStore",
     "LLMCatalogService",
     "CatalogValidationError",
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import os
 import re
-from dataclasses import replace
-from typing import Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
 
 from utils.file_utils import FileUtils
 
@@ -21,13 +21,46 @@ class CatalogValidationError(ValueError):
     pass
 
 
+_SLUG_WS = re.compile(r"\s+")
+_SLUG_STRIP = re.compile(r"[^a-z0-9\-_]")
+
+
 def _slugify(text: str) -> str:
     text = text.strip().lower()
-    text = re.sub(r"\s+", "-", text)
-    text = re.sub(r"[^a-z0-9\-_]", "", text)
+    text = _SLUG_WS.sub("-", text)
+    text = _SLUG_STRIP.sub("", text)
     return text or "smell"
 
 
+# Directories FileUtils.get_python_files does not descend into
+_SKIPPED_DIRS = ("venv", "lib")
+
+
+def _contains_python_file(path: str) -> bool:
+    """Whether get_python_files(path) would find anything, stopping at the first hit."""
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if (
+                            entry.name not in _SKIPPED_DIRS
+                            and not entry.is_symlink()
+                        ):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        return True
+        except OSError:
+            continue
+    return False
+
+
+def _read_target(filename: str) -> DetectionTarget:
+    with open(filename, "rb") as f:
+        return DetectionTarget(filename=filename, code=f.read().decode("utf-8"))
+
+
 class LLMCatalogService:
     """High-level API for UC03/UC02.
 
@@ -41,12 +74,48 @@ class LLMCatalogService:
 
     def __init__(self, store: Optional[LLMCatalogStore] = None):
         self.store = store or LLMCatalogStore()
+        # Parsed catalog and the (mtime, size) of the file it was read from
+        self._cached: Optional[LLMCatalog] = None
+        self._stamp: Optional[tuple[int, int]] = None
 
     def load(self) -> LLMCatalog:
-        return self.store.ensure_exists()
+        """Return the catalog, re-reading the JSON only when the file changed."""
+        stamp = self._file_stamp()
+        if stamp is None:
+            return self.store.ensure_exists()
+        if self._cached is not None and stamp == self._stamp:
+            return self._cached
+
+        catalog = self.store.ensure_exists()
+        self._cached, self._stamp = catalog, self._file_stamp()
+        return catalog
 
     def save(self, catalog: LLMCatalog) -> None:
-        self.store.save(catalog)
+        try:
+            self.store.save(catalog)
+        except Exception:
+            self.invalidate()
+            raise
+        stamp = self._file_stamp()
+        if stamp is not None:
+            self._cached, self._stamp = catalog, stamp
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog so the next load() reads from disk."""
+        self._cached = None
+        self._stamp = None
+
+    def _save_or_undo(self, catalog: LLMCatalog, undo: Callable[[], None]) -> None:
+        """Save an edited catalog, reverting the edit if the save fails.
+
+        The catalog handed out by load() is shared with the callers, so an
+        unsaved edit must not stay visible in memory.
+        """
+        try:
+            self.save(catalog)
+        except Exception:
+            undo()
+            raise
 
     # -------- UC03: Manage smells --------
 
@@ -88,16 +157,19 @@ class LLMCatalogService:
         )
 
         catalog.upsert_smell(smell)
-        self.save(catalog)
+        self._save_or_undo(catalog, lambda: catalog.remove_smell(smell_id))
         return smell_id
 
     def remove_smell(self, smell_id: str) -> None:
         catalog = self.load()
-        if not any(s.smell_id == smell_id for s in catalog.smells):
-            raise KeyError(f"Unknown smell_id: {smell_id}")
+        previous = catalog.smells
+        # remove_smell builds a new list, so `previous` is left untouched
+        catalog.remove_smell(smell_id)
+
+        def undo() -> None:
+            catalog.smells = previous
 
-        catalog.smells = [s for s in catalog.smells if s.smell_id != smell_id]
-        self.save(catalog)
+        self._save_or_undo(catalog, undo)
 
     def update_smell_description(self, smell_id: str, description: str) -> None:
         description = (description or "").strip()
@@ -106,9 +178,10 @@ class LLMCatalogService:
 
         catalog = self.load()
         smell = catalog.get_smell(smell_id)
-        updated = replace(smell, description=description)
-        catalog.upsert_smell(updated)
-        self.save(catalog)
+        # The smell is edited in place: it is already the catalog's entry
+        previous = smell.description
+        smell.description = description
+        self._save_or_undo(catalog, lambda: setattr(smell, "description", previous))
 
     def list_smells(self) -> list[LLMSmellDefinition]:
         return list(self.load().smells)
@@ -125,17 +198,21 @@ class LLMCatalogService:
 
         catalog = self.load()
         smell = catalog.get_smell(smell_id)
-        updated = replace(smell, draft_prompt=prompt_text)
-        catalog.upsert_smell(updated)
-        self.save(catalog)
+        previous = smell.draft_prompt
+        smell.draft_prompt = prompt_text
+        self._save_or_undo(catalog, lambda: setattr(smell, "draft_prompt", previous))
 
     def promote_draft_to_default(self, smell_id: str) -> None:
         catalog = self.load()
         smell = catalog.get_smell(smell_id)
+        previous = (smell.default_prompt, smell.enabled)
         # mutate via method for consistency
         smell.save_draft_as_default()
-        catalog.upsert_smell(smell)
-        self.save(catalog)
+
+        def undo() -> None:
+            smell.default_prompt, smell.enabled = previous
+
+        self._save_or_undo(catalog, undo)
 
     def get_prompt(self, smell_id: str, mode: PromptMode) -> str:
         catalog = self.load()
@@ -147,11 +224,7 @@ class LLMCatalogService:
         return list(self.load().providers)
 
     def get_provider(self, provider_id: str) -> LLMProviderDefinition:
-        catalog = self.load()
-        for provider in catalog.providers:
-            if provider.provider_id == provider_id:
-                return provider
-        raise KeyError(f"Unknown provider_id: {provider_id}")
+        return self.load().get_provider(provider_id)
 
     # -------- Targets / path handling --------
 
@@ -172,11 +245,13 @@ class LLMCatalogService:
                 "Input path contains no Python files (.py)"
             )
 
-        targets: list[DetectionTarget] = []
-        for filename in filenames:
-            with open(filename, "r", encoding="utf-8") as f:
-                targets.append(DetectionTarget(filename=filename, code=f.read()))
-        return targets
+        if len(filenames) == 1:
+            return [_read_target(filenames[0])]
+
+        # Overlap the per-file open/read latency; map() keeps the input order.
+        workers = min(32, (os.cpu_count() or 1) * 4, len(filenames))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_read_target, filenames))
 
     @staticmethod
     def validate_prompt_engineering_input_path(input_path: str) -> None:
@@ -189,46 +264,65 @@ class LLMCatalogService:
         input_path = (input_path or "").strip()
         if not input_path:
             raise CatalogValidationError("Input path must not be empty")
-        if not os.path.isdir(input_path):
-            raise CatalogValidationError("Input path must be a directory")
 
-        # Must contain at least 1 python file
-        if not FileUtils.get_python_files(input_path):
-            raise CatalogValidationError(
-                "Input path must contain at least one .py file"
-            )
+        # A failing scandir doubles as the "is a directory" check
+        try:
+            with os.scandir(input_path) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            raise CatalogValidationError("Input path must be a directory") from None
 
         # Heuristic: if there are multiple immediate subdirectories each containing
         # python files and there are no python files at root, treat as multi-project.
-        root_py = [
-            f
-            for f in os.listdir(input_path)
-            if f.endswith(".py") and os.path.isfile(os.path.join(input_path, f))
-        ]
-        if root_py:
+        # Entry types come from the scandir above; each subdirectory is searched
+        # only until its first .py file instead of being listed in full.
+        if any(e.name.endswith(".py") and e.is_file() for e in entries):
             return
 
         project_like_dirs = 0
-        for name in os.listdir(input_path):
-            p = os.path.join(input_path, name)
-            if not os.path.isdir(p):
+        # get_python_files(input_path) would skip these, so on their own they do
+        # not count as "the input contains a .py file"
+        has_python = False
+        for entry in entries:
+            if not entry.is_dir():
                 continue
-            if FileUtils.get_python_files(p):
+            if _contains_python_file(entry.path):
                 project_like_dirs += 1
-                if project_like_dirs > 1:
+                has_python = has_python or entry.name not in _SKIPPED_DIRS
+                if project_like_dirs > 1 and has_python:
                     raise CatalogValidationError(
                         "Prompt engineering expects a single project folder; "
                         "input path looks like it contains multiple projects"
                     )
 
+        # Must contain at least 1 python file
+        if not has_python:
+            raise CatalogValidationError(
+                "Input path must contain at least one .py file"
+            )
+
     # -------- Internal helpers --------
 
+    def _file_stamp(self) -> Optional[tuple[int, int]]:
+        """(mtime_ns, size) of the backing file, or None when it has none yet.
+
+        Stores without a ``file_path`` (e.g. in-memory test stores) are never
+        cached since they already hold the catalog in memory.
+        """
+        file_path = getattr(self.store, "file_path", None)
+        if file_path is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     @staticmethod
     def _next_available_smell_id(catalog: LLMCatalog, base_id: str) -> str:
-        existing = {s.smell_id for s in catalog.smells}
-        if base_id not in existing:
+        if not catalog.has_smell(base_id):
             return base_id
         i = 2
-        while f"{base_id}-{i}" in existing:
+        while catalog.has_smell(f"{base_id}-{i}"):
             i += 1
         return f"{base_id}-{i}"
@@ -3,7 +3,6 @@ from __future__ import annotations
 import json
 import os
 import tempfile
-from dataclasses import asdict
 from typing import Any, Optional
 
 from llm_detection.types import (
@@ -13,6 +12,29 @@ from llm_detection.types import (
     ProviderKind,
 )
 
+try:  # optional, faster (de)serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(payload: Any, pretty: bool = False) -> bytes:
+    # orjson serializes the dataclasses (and enums) natively, with no
+    # intermediate dict; the stdlib fallback needs plain containers.
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if pretty else None)
+    if isinstance(payload, LLMCatalog):
+        payload = _catalog_to_dict(payload)
+    if pretty:
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def _smell_from_dict(d: dict[str, Any]) -> LLMSmellDefinition:
     return LLMSmellDefinition(
@@ -26,10 +48,51 @@ def _smell_from_dict(d: dict[str, Any]) -> LLMSmellDefinition:
     )
 
 
+def _catalog_to_dict(catalog: LLMCatalog) -> dict[str, Any]:
+    """JSON-ready dict of the catalog (same layout as dataclasses.asdict)."""
+    return {
+        "schema_version": catalog.schema_version,
+        "smells": [
+            {
+                "smell_id": s.smell_id,
+                "display_name": s.display_name,
+                "description": s.description,
+                "default_prompt": s.default_prompt,
+                "draft_prompt": s.draft_prompt,
+                "created_by_user": s.created_by_user,
+                "enabled": s.enabled,
+            }
+            for s in catalog.smells
+        ],
+        "providers": [
+            {
+                "provider_id": p.provider_id,
+                # Enums are stored as their value (json-serializable)
+                "kind": p.kind.value if isinstance(p.kind, ProviderKind) else p.kind,
+                "display_name": p.display_name,
+                "config": p.config,
+            }
+            for p in catalog.providers
+        ],
+    }
+
+
+# Persisted kind value -> enum member, without going through Enum lookup
+_KIND_MAP = {k.value: k for k in ProviderKind}
+
+
+def _provider_kind(value: Any) -> ProviderKind:
+    kind = _KIND_MAP.get(value)
+    if kind is None:
+        # Falls back to the Enum constructor (members, error message)
+        return ProviderKind(value)
+    return kind
+
+
 def _provider_from_dict(d: dict[str, Any]) -> LLMProviderDefinition:
     return LLMProviderDefinition(
         provider_id=d["provider_id"],
-        kind=ProviderKind(d["kind"]),
+        kind=_provider_kind(d["kind"]),
         display_name=d.get("display_name", d["provider_id"]),
         config=dict(d.get("config", {})),
     )
@@ -45,8 +108,7 @@ class LLMCatalogStore:
         return os.path.exists(self.file_path)
 
     def load(self) -> LLMCatalog:
-        with open(self.file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(self._read_bytes(self.file_path))
 
         smells = [_smell_from_dict(x) for x in data.get("smells", [])]
         providers = [_provider_from_dict(x) for x in data.get("providers", [])]
@@ -57,26 +119,60 @@ class LLMCatalogStore:
             providers=providers,
         )
 
-    def save(self, catalog: LLMCatalog) -> None:
-        os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
-
-        payload = asdict(catalog)
-        # Enums are stored as their value (json-serializable)
-        for p in payload.get("providers", []):
-            if isinstance(p.get("kind"), ProviderKind):
-                p["kind"] = p["kind"].value
+    def save(self, catalog: LLMCatalog, pretty: bool = False) -> None:
+        """Write the catalog as compact JSON (indented when ``pretty``)."""
+        directory = os.path.dirname(self.file_path) or "."
+        os.makedirs(directory, exist_ok=True)
 
-        json_text = json.dumps(payload, ensure_ascii=False, indent=2)
+        data = _dumps(catalog, pretty)
 
-        # Atomic-ish write on Windows: write to temp file then replace.
-        dir_name = os.path.dirname(self.file_path) or "."
-        with tempfile.NamedTemporaryFile(
-            mode="w", encoding="utf-8", delete=False, dir=dir_name, suffix=".tmp"
-        ) as tmp:
-            tmp.write(json_text)
-            tmp_path = tmp.name
-
-        os.replace(tmp_path, self.file_path)
+        # Atomic-ish write on Windows: write to a sibling temp file then replace.
+        # The temp name is unique per save, so concurrent saves never share it
+        # and readers only ever see a complete file.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=os.path.basename(self.file_path) + ".", suffix=".tmp"
+        )
+        try:
+            try:
+                self._write_all(fd, data)
+            finally:
+                os.close(fd)
+            # mkstemp creates the file owner-only; keep the usual config mode
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.file_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _read_bytes(path: str) -> bytes:
+        # open/fstat/read/close: the whole catalog normally comes in one read
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            size = os.fstat(fd).st_size
+            # Asking for one extra byte tells EOF apart from a file that grew
+            data = os.read(fd, size + 1)
+            if len(data) != size:
+                # Short read, or the file changed since fstat: read the rest
+                chunks = [data]
+                while True:
+                    chunk = os.read(fd, max(size, 1 << 16))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+            return data
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
 
     def ensure_exists(self, seed: Optional[LLMCatalog] = None) -> LLMCatalog:
         if self.exists():
@@ -1,22 +1,113 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Iterable, Sequence
-
-import pandas as pd
+from itertools import islice, takewhile
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, Sequence
 
 from llm_detection.providers import LLMProvider
 from llm_detection.types import (
     DetectionTarget,
     LLMCatalog,
+    LLMSmellDefinition,
     LLMSmellFinding,
     NormalizationMode,
     PromptMode,
 )
 
+try:  # optional, faster parsing
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# NOTE: keep ONE single output contract here (not duplicated in smell prompts).
+# The smell prompt should focus on definition + rules; this block enforces schema.
+# Built once: build_prompt only joins it with the per-call parts.
+_OUTPUT_CONTRACT = (
+    "You are a code smell detector.\n"
+    "OUTPUT FORMAT (STRICT):\n"
+    "Return ONLY valid JSON.\n"
+    "Do NOT include explanations, markdown, or extra text.\n\n"
+    "The JSON schema MUST be exactly:\n"
+    "{\n"
+    '  "findings": [\n'
+    "    {\n"
+    '      "function_name": "<name of the function or method where the smell occurs, or null if global>",\n'
+    '      "line": <line number where the smell starts>,\n'
+    '      "description": "<short explanation>",\n'
+    '      "additional_info": "<optional refactoring hint or summary>"\n'
+    "    }\n"
+    "  ]\n"
+    "}\n\n"
+    "IMPORTANT:\n"
+    "- The top-level JSON object MUST contain ONLY the key 'findings'.\n"
+    "- Do NOT wrap the JSON in ``` fences.\n\n"
+    "GUIDELINES:\n"
+    "- If no smell is detected, return: { \"findings\": [] }\n"
+    "- If multiple occurrences exist, return one item per occurrence in 'findings' (do not group them).\n"
+    "- Never return per-function keys (e.g., {\"func\": {...}}). Always return a 'findings' array.\n"
+    "- Keep the response concise. If you are unsure, return fewer findings but keep valid JSON.\n"
+    "- Use precise line numbers.\n"
+    "- The code is provided with 1-based line numbers as a prefix like '12: ...'.\n"
+    "  When you report 'line', use that exact prefix number.\n"
+    "- Be conservative: avoid false positives.\n\n"
+)
+
+_JSON_DECODER = json.JSONDecoder()
+_FENCE_STRIP = re.compile(r"\A```[^\n]*(?:\n|\Z)|\n[^\n]*```\Z")
+_FENCED_BLOCK = re.compile(r"```(?:json)?[ \t]*\n(.*?)\n[ \t]*```", re.DOTALL)
+
+
+def _safe_str(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _safe_list(value: Any) -> list[dict[str, Any]] | None:
+    if not isinstance(value, list):
+        return None
+    if not all(isinstance(x, dict) for x in value):
+        return None
+    return value
+
 
-@dataclass(frozen=True)
+def _safe_single_finding(value: Any) -> dict[str, Any] | None:
+    if not isinstance(value, dict):
+        return None
+    if "line" in value or "line_number" in value:
+        return value
+    return None
+
+
+def _finding_line(item: dict[str, Any]) -> int | None:
+    """Positive line of a finding item ("line", else "line_number"), or None."""
+    line = item.get("line", -1)
+    if line == -1:
+        line = item.get("line_number", -1)
+    try:
+        line_int = int(line)
+    except Exception:
+        return None
+    return line_int if line_int > 0 else None
+
+
+def _finding_confidence(item: dict[str, Any]) -> float | None:
+    confidence = item.get("confidence")
+    if confidence is None:
+        return None
+    try:
+        return float(confidence)
+    except Exception:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class OrchestratorStats:
     prompts_sent: int = 0
     targets_processed: int = 0
@@ -34,10 +125,11 @@ class LLMOrchestrator:
         self.catalog = catalog
 
     @staticmethod
-    def _code_with_line_numbers(code: str) -> str:
+    def _code_with_line_numbers(code: str, start: int = 1) -> str:
         lines = (code or "").splitlines()
         # 1-based line numbering to match typical editors
-        return "\n".join(f"{i}: {line}" for i, line in enumerate(lines, start=1))
+        # A list (not a generator): str.join materialises its input anyway.
+        return "\n".join([f"{i}: {line}" for i, line in enumerate(lines, start=start)])
 
     def build_prompt(
         self,
@@ -48,43 +140,142 @@ class LLMOrchestrator:
         smell = self.catalog.get_smell(smell_id)
         smell_prompt = smell.get_prompt(prompt_mode)
 
-        numbered_code = self._code_with_line_numbers(target.code)
-
-        # NOTE: keep ONE single output contract here (not duplicated in smell prompts).
-        # The smell prompt should focus on definition + rules; this block enforces schema.
-        return (
-            f"{smell_prompt}\n\n"
-            "You are a code smell detector.\n"
-            "OUTPUT FORMAT (STRICT):\n"
-            "Return ONLY valid JSON.\n"
-            "Do NOT include explanations, markdown, or extra text.\n\n"
-            "The JSON schema MUST be exactly:\n"
-            "{\n"
-            '  "findings": [\n'
-            "    {\n"
-            '      "function_name": "<name of the function or method where the smell occurs, or null if global>",\n'
-            '      "line": <line number where the smell starts>,\n'
-            '      "description": "<short explanation>",\n'
-            '      "additional_info": "<optional refactoring hint or summary>"\n'
-            "    }\n"
-            "  ]\n"
-            "}\n\n"
-            "IMPORTANT:\n"
-            "- The top-level JSON object MUST contain ONLY the key 'findings'.\n"
-            "- Do NOT wrap the JSON in ``` fences.\n\n"
-            "GUIDELINES:\n"
-            "- If no smell is detected, return: { \"findings\": [] }\n"
-            "- If multiple occurrences exist, return one item per occurrence in 'findings' (do not group them).\n"
-            "- Never return per-function keys (e.g., {\"func\": {...}}). Always return a 'findings' array.\n"
-            "- Keep the response concise. If you are unsure, return fewer findings but keep valid JSON.\n"
-            "- Use precise line numbers.\n"
-            "- The code is provided with 1-based line numbers as a prefix like '12: ...'.\n"
-            "  When you report 'line', use that exact prefix number.\n"
-            "- Be conservative: avoid false positives.\n\n"
-            f"FILENAME: {target.filename}\n"
-            "CODE (numbered):\n"
-            f"{numbered_code}\n"
-        )
+        numbered_code = self._code_with_line_numbers(target.code, target.first_line)
+
+        return self._assemble_prompt(smell_prompt, target.filename, numbered_code)
+
+    @staticmethod
+    def _assemble_prompt(smell_prompt: str, filename: str, numbered_code: str) -> str:
+        return "".join((
+            smell_prompt,
+            "\n\n",
+            _OUTPUT_CONTRACT,
+            "FILENAME: ",
+            filename,
+            "\nCODE (numbered):\n",
+            numbered_code,
+            "\n",
+        ))
+
+    def _prepare_smells(
+        self,
+        smell_ids: Sequence[str],
+        prompt_mode: PromptMode,
+    ) -> list[tuple[LLMSmellDefinition, str]]:
+        """(smell, prompt text) for every ready smell, looked up once per run."""
+        prepared: list[tuple[LLMSmellDefinition, str]] = []
+        for smell_id in smell_ids:
+            smell = self.catalog.get_smell(smell_id)
+            if smell.is_ready_for_detection():
+                prepared.append((smell, smell.get_prompt(prompt_mode)))
+        return prepared
+
+    def _build_jobs(
+        self,
+        targets: Sequence[DetectionTarget],
+        smell_ids: Sequence[str],
+        prompt_mode: PromptMode,
+    ) -> list[tuple[DetectionTarget, LLMSmellDefinition, str]]:
+        """(target, smell, prompt) for every ready smell, in (target, smell) order.
+
+        Smells are resolved once and each target's code is numbered once, then
+        shared by all of its prompts.
+        """
+        jobs: list[tuple[DetectionTarget, LLMSmellDefinition, str]] = []
+        if not targets:
+            return jobs
+        prepared = self._prepare_smells(smell_ids, prompt_mode)
+        if not prepared:
+            return jobs
+        for target in targets:
+            numbered_code = self._code_with_line_numbers(target.code, target.first_line)
+            for smell, smell_prompt in prepared:
+                prompt = self._assemble_prompt(smell_prompt, target.filename, numbered_code)
+                jobs.append((target, smell, prompt))
+        return jobs
+
+    def _build_prompts(
+        self,
+        targets: Sequence[DetectionTarget],
+        smell_id: str,
+        prompt_mode: PromptMode,
+        prompt_override: Optional[str] = None,
+    ) -> list[str]:
+        """One prompt per target for a single smell, resolving its prompt once."""
+        if not targets:
+            return []
+        if prompt_override is not None:
+            smell_prompt = prompt_override
+        else:
+            smell_prompt = self.catalog.get_smell(smell_id).get_prompt(prompt_mode)
+        return [
+            self._assemble_prompt(
+                smell_prompt,
+                target.filename,
+                self._code_with_line_numbers(target.code, target.first_line),
+            )
+            for target in targets
+        ]
+
+    def _iter_findings(
+        self,
+        jobs: Sequence[tuple[DetectionTarget, LLMSmellDefinition, str]],
+        raws: Iterable[str],
+        normalize_mode: NormalizationMode,
+    ) -> Iterator[LLMSmellFinding]:
+        for (target, smell, _), raw in zip(jobs, raws):
+            yield from self._normalize_response(
+                raw,
+                target.filename,
+                smell.smell_id,
+                normalize_mode=normalize_mode,
+                smell=smell,
+            )
+
+    def _collect_findings(
+        self,
+        jobs: Sequence[tuple[DetectionTarget, LLMSmellDefinition, str]],
+        raws: Sequence[str],
+        normalize_mode: NormalizationMode,
+    ) -> list[LLMSmellFinding]:
+        return list(self._iter_findings(jobs, raws, normalize_mode))
+
+    def _generate_all(self, prompts: Sequence[str], max_workers: int) -> list[str]:
+        """Responses for `prompts`, in order.
+
+        With max_workers > 1 they are sent from a thread pool; otherwise the
+        whole list goes to the provider's generate_batch(), which backends able
+        to batch requests (e.g. a local Ollama server) send concurrently.
+        """
+        # Identical prompts (e.g. copy-pasted files) are sent once
+        unique = list(dict.fromkeys(prompts))
+        if len(unique) < len(prompts):
+            responses = dict(zip(unique, self._generate_all(unique, max_workers)))
+            return [responses[prompt] for prompt in prompts]
+        if max_workers > 1 and len(prompts) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+                return list(executor.map(self.provider.generate, prompts))
+        return self.provider.generate_batch(list(prompts))
+
+    def _generate_until_cancelled(
+        self,
+        prompts: Sequence[str],
+        max_workers: int,
+        cancel_check: Callable[[], bool],
+    ) -> list[str]:
+        """Responses for the leading prompts sent before cancel_check() turned true.
+
+        The check runs before each prompt goes out, so a cancel waits for the
+        prompts already in flight instead of the whole list.
+        """
+
+        def generate(prompt: str) -> Optional[str]:
+            return None if cancel_check() else self.provider.generate(prompt)
+
+        if max_workers > 1 and len(prompts) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+                return list(takewhile(lambda raw: raw is not None, executor.map(generate, prompts)))
+        return list(takewhile(lambda raw: raw is not None, map(generate, prompts)))
 
     def detect(
         self,
@@ -93,35 +284,120 @@ class LLMOrchestrator:
         prompt_mode: PromptMode = PromptMode.DRAFT_IF_AVAILABLE,
         *,
         normalize_mode: NormalizationMode = NormalizationMode.STRICT,
+        max_workers: int = 1,
     ) -> tuple[list[LLMSmellFinding], OrchestratorStats]:
-        findings: list[LLMSmellFinding] = []
-        prompts_sent = 0
+        """Run every ready smell against every target.
 
-        for target in targets:
-            for smell_id in smell_ids:
-                smell = self.catalog.get_smell(smell_id)
-                if not smell.is_ready_for_detection():
-                    continue
-
-                prompt = self.build_prompt(smell_id, target, prompt_mode)
-                raw = self.provider.generate(prompt)
-                prompts_sent += 1
-
-                findings.extend(
-                    self._normalize_response(
-                        raw,
-                        target.filename,
-                        smell_id,
-                        normalize_mode=normalize_mode,
-                    )
+        With max_workers > 1 the prompts are sent from a thread pool; the
+        provider interface stays synchronous and findings keep their order.
+        """
+        jobs = self._build_jobs(targets, smell_ids, prompt_mode)
+        raws = self._generate_all([prompt for _, _, prompt in jobs], max_workers)
+
+        stats = OrchestratorStats(
+            prompts_sent=len(jobs),
+            targets_processed=len(targets),
+            smells_processed=len(smell_ids),
+        )
+        return self._collect_findings(jobs, raws, normalize_mode), stats
+
+    def idetect(
+        self,
+        targets: Sequence[DetectionTarget],
+        smell_ids: Sequence[str],
+        prompt_mode: PromptMode = PromptMode.DRAFT_IF_AVAILABLE,
+        *,
+        normalize_mode: NormalizationMode = NormalizationMode.STRICT,
+        max_workers: int = 1,
+    ) -> Iterator[LLMSmellFinding]:
+        """Lazy variant of detect(): findings are yielded as each response arrives.
+
+        Prompts are sent one at a time (or from a thread pool with
+        max_workers > 1), so callers writing findings out incrementally never
+        hold them all. Findings keep detect()'s (target, smell) order.
+        """
+        jobs = self._build_jobs(targets, smell_ids, prompt_mode)
+        prompts = [prompt for _, _, prompt in jobs]
+        if max_workers > 1 and len(prompts) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+                yield from self._iter_findings(
+                    jobs, executor.map(self.provider.generate, prompts), normalize_mode
                 )
+        else:
+            yield from self._iter_findings(
+                jobs, map(self.provider.generate, prompts), normalize_mode
+            )
+
+    async def detect_async(
+        self,
+        targets: Sequence[DetectionTarget],
+        smell_ids: Sequence[str],
+        prompt_mode: PromptMode = PromptMode.DRAFT_IF_AVAILABLE,
+        *,
+        normalize_mode: NormalizationMode = NormalizationMode.STRICT,
+        concurrency: int = 4,
+    ) -> tuple[list[LLMSmellFinding], OrchestratorStats]:
+        """Async variant of detect(): prompts are sent concurrently.
+
+        At most `concurrency` requests are in flight at once; findings keep the
+        same (target, smell) order that detect() produces.
+        """
+        jobs = self._build_jobs(targets, smell_ids, prompt_mode)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _generate(prompt: str) -> str:
+            async with semaphore:
+                return await self.provider.agenerate(prompt)
+
+        prompts = [prompt for _, _, prompt in jobs]
+        unique = list(dict.fromkeys(prompts))
+        responses = dict(zip(unique, await asyncio.gather(*(_generate(p) for p in unique))))
+        raws = [responses[prompt] for prompt in prompts]
 
         stats = OrchestratorStats(
-            prompts_sent=prompts_sent,
+            prompts_sent=len(jobs),
             targets_processed=len(targets),
             smells_processed=len(smell_ids),
         )
-        return findings, stats
+        return self._collect_findings(jobs, raws, normalize_mode), stats
+
+    def detect_iter(
+        self,
+        targets: Iterable[DetectionTarget],
+        smell_ids: Sequence[str],
+        prompt_mode: PromptMode = PromptMode.DRAFT_IF_AVAILABLE,
+        *,
+        normalize_mode: NormalizationMode = NormalizationMode.STRICT,
+        batch_size: int = 32,
+        concurrency: int = 4,
+    ) -> Iterator[tuple[list[LLMSmellFinding], OrchestratorStats]]:
+        """Streaming variant of detect_async(): targets are pulled in batches.
+
+        Only one batch of source code is held at a time; findings and stats are
+        yielded per batch. Must be called from a thread without a running loop.
+        """
+        iterator = iter(targets)
+        # One event loop (and default executor) for the whole stream, instead of
+        # asyncio.run() rebuilding both for every batch
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                batch = list(islice(iterator, max(1, batch_size)))
+                if not batch:
+                    return
+                yield loop.run_until_complete(
+                    self.detect_async(
+                        batch,
+                        smell_ids,
+                        prompt_mode,
+                        normalize_mode=normalize_mode,
+                        concurrency=concurrency,
+                    )
+                )
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
 
     def detect_for_prompt_engineering(
         self,
@@ -130,27 +406,41 @@ class LLMOrchestrator:
         prompt_mode: PromptMode,
         *,
         normalize_mode: NormalizationMode = NormalizationMode.SALVAGE,
+        max_workers: int = 1,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        draft_prompt_override: Optional[str] = None,
     ) -> tuple[list[LLMSmellFinding], OrchestratorStats]:
-        """UC02 helper: allows testing draft prompt before saving as default."""
+        """UC02 helper: allows testing draft prompt before saving as default.
+
+        With max_workers > 1 the per-file prompts are sent from a thread pool.
+        When cancel_check() returns True no further prompt is sent and only the
+        targets answered so far are reported. draft_prompt_override, when given,
+        is used as the smell prompt instead of the catalog's one, so a draft can
+        be tried without writing it into the catalog.
+        """
         findings: list[LLMSmellFinding] = []
-        prompts_sent = 0
-
-        for target in targets:
-            prompt = self.build_prompt(smell_id, target, prompt_mode)
-            raw = self.provider.generate(prompt)
-            prompts_sent += 1
+        prompts = self._build_prompts(targets, smell_id, prompt_mode, draft_prompt_override)
+        if cancel_check is None:
+            raws = self._generate_all(prompts, max_workers)
+        else:
+            raws = self._generate_until_cancelled(prompts, max_workers, cancel_check)
+        prompts_sent = len(raws)
+
+        smell = self.catalog.get_smell(smell_id) if targets else None
+        for target, raw in zip(targets, raws):
             findings.extend(
                 self._normalize_response(
                     raw,
                     target.filename,
                     smell_id,
                     normalize_mode=normalize_mode,
+                    smell=smell,
                 )
             )
 
         stats = OrchestratorStats(
             prompts_sent=prompts_sent,
-            targets_processed=len(targets),
+            targets_processed=len(raws),
             smells_processed=1,
         )
         return findings, stats
@@ -162,33 +452,50 @@ class LLMOrchestrator:
         prompt_mode: PromptMode,
         *,
         normalize_mode: NormalizationMode = NormalizationMode.SALVAGE,
+        max_workers: int = 1,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        draft_prompt_override: Optional[str] = None,
     ) -> tuple[list[LLMSmellFinding], OrchestratorStats, dict[str, str]]:
         """UC02 helper: like detect_for_prompt_engineering but returns raw responses per file."""
         findings: list[LLMSmellFinding] = []
         raw_by_filename: dict[str, str] = {}
-        prompts_sent = 0
-
-        for target in targets:
-            prompt = self.build_prompt(smell_id, target, prompt_mode)
-            raw = self.provider.generate(prompt)
+        prompts = self._build_prompts(targets, smell_id, prompt_mode, draft_prompt_override)
+        if cancel_check is None:
+            raws = self._generate_all(prompts, max_workers)
+        else:
+            raws = self._generate_until_cancelled(prompts, max_workers, cancel_check)
+        prompts_sent = len(raws)
+
+        smell = self.catalog.get_smell(smell_id) if targets else None
+        for target, raw in zip(targets, raws):
             raw_by_filename[target.filename] = raw
-            prompts_sent += 1
             findings.extend(
                 self._normalize_response(
                     raw,
                     target.filename,
                     smell_id,
                     normalize_mode=normalize_mode,
+                    smell=smell,
                 )
             )
 
         stats = OrchestratorStats(
             prompts_sent=prompts_sent,
-            targets_processed=len(targets),
+            targets_processed=len(raws),
             smells_processed=1,
         )
         return findings, stats, raw_by_filename
 
+    def _parse_payload(self, raw: str) -> Any | None:
+        # Providers in JSON mode return the bare document: parse it directly and
+        # only fall back to fence/prose extraction if the model still strayed
+        if self.provider.returns_json and isinstance(raw, str):
+            try:
+                return _json_loads(raw)
+            except ValueError:
+                pass
+        return self._try_parse_json_payload(raw)
+
     @staticmethod
     def _try_parse_json_payload(raw: str) -> Any | None:
         """Best-effort JSON parsing: strips common fences and extracts the first JSON object/array."""
@@ -201,54 +508,43 @@ class LLMOrchestrator:
 
         # Fast path
         try:
-            return json.loads(text)
+            return _json_loads(text)
         except Exception:
             pass
 
-        # Strip markdown fences (best-effort)
+        # Strip markdown fences (best-effort): the opening fence line and a
+        # closing fence line, in one regex pass
+        if text.startswith("```") or text.endswith("```"):
+            text = _FENCE_STRIP.sub("", text).strip()
+
+        # A fenced block after some prose: its body is the likeliest payload
         if "```" in text:
-            lines = text.splitlines()
-            # drop leading fence
-            if lines and lines[0].lstrip().startswith("```"):
-                lines = lines[1:]
-            # drop trailing fence
-            if lines and lines[-1].rstrip().endswith("```"):
-                lines = lines[:-1]
-            text = "\n".join(lines).strip()
-
-        # Extract first balanced JSON object/array
-        for start_char, end_char in [("{", "}"), ("[", "]")]:
+            block = _FENCED_BLOCK.search(text)
+            if block is not None:
+                try:
+                    return _json_loads(block.group(1))
+                except ValueError:
+                    pass
+
+        # A payload followed by trailing prose: one raw_decode of the leading
+        # value, read the same way as a clean response would be
+        leading = 0 if text[:1] in ("{", "[") else -1
+        if leading == 0:
+            try:
+                return _JSON_DECODER.raw_decode(text)[0]
+            except ValueError:
+                pass
+
+        # Decode the first JSON object/array; raw_decode stops at the end of
+        # that value, so trailing prose is ignored without a manual scan
+        for start_char in ("{", "["):
             start = text.find(start_char)
-            if start == -1:
+            if start == -1 or start == leading:
+                continue
+            try:
+                return _JSON_DECODER.raw_decode(text, start)[0]
+            except ValueError:
                 continue
-
-            depth = 0
-            in_string = False
-            escape = False
-            for i in range(start, len(text)):
-                ch = text[i]
-                if escape:
-                    escape = False
-                    continue
-                if ch == "\\":
-                    escape = True
-                    continue
-                if ch == '"':
-                    in_string = not in_string
-                    continue
-                if in_string:
-                    continue
-
-                if ch == start_char:
-                    depth += 1
-                elif ch == end_char:
-                    depth -= 1
-                    if depth == 0:
-                        candidate = text[start : i + 1].strip()
-                        try:
-                            return json.loads(candidate)
-                        except Exception:
-                            break
 
         return None
 
@@ -259,30 +555,64 @@ class LLMOrchestrator:
             smell_id: str,
             *,
             normalize_mode: NormalizationMode,
+            smell: LLMSmellDefinition | None = None,
     ) -> list[LLMSmellFinding]:
-        smell = self.catalog.get_smell(smell_id)
+        # Callers normalizing many responses pass the already-resolved smell
+        if smell is None:
+            smell = self.catalog.get_smell(smell_id)
+        payload = self._parse_payload(raw)
+        if normalize_mode == NormalizationMode.STRICT:
+            return self._normalize_strict(payload, raw, filename, smell_id, smell)
+        return self._normalize_salvage(payload, raw, filename, smell_id, smell)
 
-        def _safe_str(value: Any) -> str:
-            return "" if value is None else str(value)
-
-        def _safe_list(value: Any) -> list[dict[str, Any]] | None:
-            if not isinstance(value, list):
-                return None
-            if not all(isinstance(x, dict) for x in value):
-                return None
-            return value
-
-        def _safe_single_finding(value: Any) -> dict[str, Any] | None:
-            if not isinstance(value, dict):
-                return None
-            if "line" in value or "line_number" in value:
-                return value
-            return None
+    @staticmethod
+    def _normalize_strict(
+            payload: Any,
+            raw: str,
+            filename: str,
+            smell_id: str,
+            smell: LLMSmellDefinition,
+    ) -> list[LLMSmellFinding]:
+        # STRICT: accept ONLY {"findings": [ ... ]} with dict items
+        if not isinstance(payload, dict):
+            return []
+        strict_findings = payload.get("findings")
+        if not isinstance(strict_findings, list):
+            return []
+        if not all(isinstance(x, dict) for x in strict_findings):
+            return []
+
+        out: list[LLMSmellFinding] = []
+        for item in strict_findings:
+            line_int = _finding_line(item)
+            if line_int is None:
+                continue
+
+            out.append(
+                LLMSmellFinding(
+                    filename=filename,
+                    function_name=_safe_str(item.get("function_name", "")),
+                    smell_name=smell.display_name,
+                    line=line_int,
+                    description=_safe_str(
+                        item.get("description", smell.description or smell.display_name)
+                    ),
+                    additional_info=_safe_str(item.get("additional_info", "")),
+                    smell_id=smell_id,
+                    confidence=_finding_confidence(item),
+                )
+            )
+        return out
 
-        payload = self._try_parse_json_payload(raw)
+    @staticmethod
+    def _normalize_salvage(
+            payload: Any,
+            raw: str,
+            filename: str,
+            smell_id: str,
+            smell: LLMSmellDefinition,
+    ) -> list[LLMSmellFinding]:
         if payload is None:
-            if normalize_mode == NormalizationMode.STRICT:
-                return []
             # SALVAGE: keep a trace as a non-finding (line=-1) for debugging
             return [
                 LLMSmellFinding(
@@ -297,56 +627,6 @@ class LLMOrchestrator:
                 )
             ]
 
-        # STRICT: accept ONLY {"findings": [ ... ]} with dict items
-        if normalize_mode == NormalizationMode.STRICT:
-            if not isinstance(payload, dict):
-                return []
-            strict_findings = payload.get("findings")
-            if not isinstance(strict_findings, list):
-                return []
-            if not all(isinstance(x, dict) for x in strict_findings):
-                return []
-
-            out: list[LLMSmellFinding] = []
-            for item in strict_findings:
-                line = item.get("line", -1)
-                if line == -1 and "line_number" in item:
-                    line = item.get("line_number", -1)
-
-                try:
-                    line_int = int(line)
-                except Exception:
-                    continue
-                if line_int <= 0:
-                    continue
-
-                confidence = item.get("confidence")
-                confidence_f = None
-                if confidence is not None:
-                    try:
-                        confidence_f = float(confidence)
-                    except Exception:
-                        confidence_f = None
-
-                out.append(
-                    LLMSmellFinding(
-                        filename=filename,
-                        function_name=_safe_str(item.get("function_name", "")),
-                        smell_name=smell.display_name,
-                        line=line_int,
-                        description=_safe_str(
-                            item.get("description", smell.description or smell.display_name)
-                        ),
-                        additional_info=_safe_str(item.get("additional_info", "")),
-                        smell_id=smell_id,
-                        confidence=confidence_f,
-                        raw_response=raw,
-                    )
-                )
-            return out
-
-        # ---------------- SALVAGE ----------------
-
         # Start from "findings"; if missing, try fallback keys.
         findings_payload: Any = payload.get("findings") if isinstance(payload, dict) else None
         source_key: str | None = None
@@ -397,24 +677,10 @@ class LLMOrchestrator:
             if not isinstance(item, dict):
                 continue
 
-            line = item.get("line", -1)
-            if line == -1 and "line_number" in item:
-                line = item.get("line_number", -1)
-            try:
-                line_int = int(line)
-            except Exception:
-                continue
-            if line_int <= 0:
+            line_int = _finding_line(item)
+            if line_int is None:
                 continue
 
-            confidence = item.get("confidence")
-            confidence_f = None
-            if confidence is not None:
-                try:
-                    confidence_f = float(confidence)
-                except Exception:
-                    confidence_f = None
-
             desc = item.get("description")
             if not desc:
                 desc = (
@@ -437,8 +703,7 @@ class LLMOrchestrator:
                         )
                     ),
                     smell_id=smell_id,
-                    confidence=confidence_f,
-                    raw_response=raw,
+                    confidence=_finding_confidence(item),
                 )
             )
 
@@ -446,13 +711,15 @@ class LLMOrchestrator:
 
     @staticmethod
     def findings_to_dataframe(findings: Iterable[LLMSmellFinding]) -> pd.DataFrame:
-        rows = [f.to_overview_row() for f in findings]
-        columns = [
-            "filename",
-            "function_name",
-            "smell_name",
-            "line",
-            "description",
-            "additional_info",
-        ]
-        return pd.DataFrame(rows, columns=columns)
+        import pandas as pd  # lazy: only needed when exporting findings
+
+        # Built column by column: no per-finding row dict for pandas to re-infer
+        findings = list(findings)
+        return pd.DataFrame({
+            "filename": [f.filename for f in findings],
+            "function_name": [f.function_name for f in findings],
+            "smell_name": [f.smell_name for f in findings],
+            "line": pd.array([f.line for f in findings], dtype="int32"),
+            "description": [f.description for f in findings],
+            "additional_info": [f.additional_info for f in findings],
+        })
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
@@ -12,6 +17,30 @@ class LLMProvider(ABC):
     def generate(self, prompt: str) -> str:
         raise NotImplementedError
 
+    def generate_batch(self, prompts: list[str]) -> list[str]:
+        """Responses for several prompts, in order; sequential by default."""
+        return [self.generate(prompt) for prompt in prompts]
+
+    async def agenerate(self, prompt: str) -> str:
+        """Async generation; by default runs generate() in the loop's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt)
+
+    @property
+    def returns_json(self) -> bool:
+        """True when the backend is constrained to emit JSON (JSON mode / schema)."""
+        return False
+
+    def close(self) -> None:
+        """Release pooled connections, if the provider holds any."""
+
+    def __enter__(self) -> "LLMProvider":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
 
 @dataclass
 class MockLLMProvider(LLMProvider):
@@ -43,12 +72,27 @@ class LocalLLMProvider(LLMProvider):
         model_name: str,
         host: Optional[str] = None,
         options: Optional[dict[str, Any]] = None,
-        response_format: Optional[str] = None,
+        response_format: Optional[str | dict[str, Any]] = None,
+        num_parallel: int = 4,
     ):
         self.model_name = model_name
         self.host = host
         self.options = options
+        # Ollama's `format`: "json" for JSON mode, or a JSON schema dict
+        # (e.g. FINDINGS_JSON_SCHEMA) for schema-constrained decoding
         self.response_format = response_format
+        # Requests kept in flight by generate_batch (Ollama's OLLAMA_NUM_PARALLEL)
+        self.num_parallel = num_parallel
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    def _get_client(self, ollama: Any) -> Any:
+        # Created once and reused, so the underlying HTTP connection is kept alive.
+        # Without a host the module-level API already shares a default client.
+        with self._lock:
+            if self._client is None:
+                self._client = ollama.Client(host=self.host) if self.host else ollama
+            return self._client
 
     def generate(self, prompt: str) -> str:
         try:
@@ -58,26 +102,16 @@ class LocalLLMProvider(LLMProvider):
                 "ollama is not available; cannot use LocalLLMProvider"
             ) from e
 
+        kwargs: dict[str, Any] = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "options": self.options,
+        }
+        if self.response_format:
+            kwargs["format"] = self.response_format
+
         try:
-            if self.host:
-                client = ollama.Client(host=self.host)
-                kwargs: dict[str, Any] = {
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "options": self.options,
-                }
-                if self.response_format:
-                    kwargs["format"] = self.response_format
-                response = client.generate(**kwargs)
-            else:
-                kwargs2: dict[str, Any] = {
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "options": self.options,
-                }
-                if self.response_format:
-                    kwargs2["format"] = self.response_format
-                response = ollama.generate(**kwargs2)
+            response = self._get_client(ollama).generate(**kwargs)
             return response.get("response", "")
         except Exception as e:
             host_hint = f" ({self.host})" if self.host else ""
@@ -86,6 +120,22 @@ class LocalLLMProvider(LLMProvider):
                 "Ensure Ollama is installed and running (default: http://localhost:11434)."
             ) from e
 
+    @property
+    def returns_json(self) -> bool:
+        return bool(self.response_format)
+
+    def generate_batch(self, prompts: list[str]) -> list[str]:
+        """Send the prompts concurrently so Ollama can batch them server-side."""
+        if self.num_parallel <= 1 or len(prompts) <= 1:
+            return super().generate_batch(prompts)
+        workers = min(self.num_parallel, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.generate, prompts))
+
+    def close(self) -> None:
+        with self._lock:
+            self._client = None
+
 
 class ApiLLMProvider(LLMProvider):
     """API provider stub.
@@ -94,11 +144,25 @@ class ApiLLMProvider(LLMProvider):
     For now, it can call a generic HTTP endpoint that returns plain text.
     """
 
-    def __init__(self, base_url: str, timeout_s: float = 60.0):
+    def __init__(
+        self,
+        base_url: str,
+        timeout_s: float = 60.0,
+        response_schema: Optional[dict[str, Any]] = None,
+        max_connections: Optional[int] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.timeout_s = timeout_s
+        # Pool size; set it to the number of threads sending prompts so every
+        # worker keeps its connection alive (httpx keeps 20 idle by default)
+        self.max_connections = max_connections
+        # Sent as an OpenAI-style `response_format` so the server constrains
+        # decoding to this JSON schema (e.g. FINDINGS_JSON_SCHEMA)
+        self.response_schema = response_schema
+        self._client: Any = None
+        self._lock = threading.Lock()
 
-    def generate(self, prompt: str) -> str:
+    def _get_client(self) -> Any:
         try:
             import httpx  # lazy import
         except Exception as e:
@@ -106,12 +170,121 @@ class ApiLLMProvider(LLMProvider):
                 "httpx is not available; cannot use ApiLLMProvider"
             ) from e
 
+        # One pooled client per provider: keep-alive connections are reused
+        # across prompts, including calls made from executor threads.
+        with self._lock:
+            if self._client is None:
+                if self.max_connections:
+                    limits = httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    )
+                    self._client = httpx.Client(timeout=self.timeout_s, limits=limits)
+                else:
+                    self._client = httpx.Client(timeout=self.timeout_s)
+            return self._client
+
+    def generate(self, prompt: str) -> str:
+        client = self._get_client()
+
         # Generic endpoint contract (to be refined): POST /generate {prompt}
         url = f"{self.base_url}/generate"
-        with httpx.Client(timeout=self.timeout_s) as client:
-            resp = client.post(url, json={"prompt": prompt})
-            resp.raise_for_status()
-            data = resp.json() if "application/json" in resp.headers.get("content-type", "") else None
-            if isinstance(data, dict) and "response" in data:
-                return str(data["response"])
-            return resp.text
+        payload: dict[str, Any] = {"prompt": prompt}
+        if self.response_schema is not None:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "findings", "schema": self.response_schema},
+            }
+        resp = client.post(url, json=payload)
+        return self._read_response(resp)
+
+    @property
+    def returns_json(self) -> bool:
+        return self.response_schema is not None
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    @staticmethod
+    def _read_response(resp: Any) -> str:
+        resp.raise_for_status()
+        data = resp.json() if "application/json" in resp.headers.get("content-type", "") else None
+        if isinstance(data, dict) and "response" in data:
+            return str(data["response"])
+        return resp.text
+
+
+class CachedLLMProvider(LLMProvider):
+    """Decorator that memoizes another provider's responses per exact prompt.
+
+    Prompts built by the orchestrator are deterministic, so an unchanged file
+    checked for the same smell with the same prompt is answered from memory
+    instead of being sent again. Entries are evicted least-recently-used.
+    """
+
+    def __init__(self, inner: LLMProvider, max_size: int = 1024):
+        self.inner = inner
+        self.max_size = max_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            response = self._cache.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def _put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def generate(self, prompt: str) -> str:
+        key = self._key(prompt)
+        response = self._get(key)
+        if response is None:
+            response = self.inner.generate(prompt)
+            self._put(key, response)
+        return response
+
+    def generate_batch(self, prompts: list[str]) -> list[str]:
+        keys = [self._key(prompt) for prompt in prompts]
+        responses: list[Optional[str]] = [self._get(key) for key in keys]
+
+        # Send each missing prompt once, still as a single batch
+        missing: dict[str, str] = {}
+        for key, prompt, response in zip(keys, prompts, responses):
+            if response is None:
+                missing.setdefault(key, prompt)
+        if missing:
+            fresh = dict(zip(missing, self.inner.generate_batch(list(missing.values()))))
+            for key, response in fresh.items():
+                self._put(key, response)
+            responses = [fresh[key] if r is None else r for key, r in zip(keys, responses)]
+        return responses  # type: ignore[return-value]
+
+    @property
+    def returns_json(self) -> bool:
+        return self.inner.returns_json
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        self.inner.close()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import ast
+import io
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
@@ -54,28 +56,45 @@ class LLMSmellDefinition:
     def is_ready_for_detection(self) -> bool:
         return self.enabled and bool(self.default_prompt.strip())
 
+    def _has_draft(self) -> bool:
+        return self.draft_prompt is not None and bool(self.draft_prompt.strip())
+
+    def _default_or_raise(self, message: str) -> str:
+        if not self.default_prompt.strip():
+            raise ValueError(f"{message} for smell_id='{self.smell_id}'")
+        return self.default_prompt
+
+    def _default_prompt(self) -> str:
+        return self._default_or_raise("Default prompt is empty")
+
+    def _draft_prompt(self) -> str:
+        if not self._has_draft():
+            raise ValueError(
+                f"No draft prompt available for smell_id='{self.smell_id}'"
+            )
+        return self.draft_prompt  # type: ignore[return-value]
+
+    def _draft_if_available_prompt(self) -> str:
+        if self._has_draft():
+            return self.draft_prompt  # type: ignore[return-value]
+        return self._default_or_raise("No default prompt available")
+
+    # Not annotated, so not a dataclass field
+    _PROMPT_GETTERS = {
+        PromptMode.DEFAULT: _default_prompt,
+        PromptMode.DRAFT: _draft_prompt,
+        PromptMode.DRAFT_IF_AVAILABLE: _draft_if_available_prompt,
+    }
+
     def get_prompt(self, prompt_mode: PromptMode) -> str:
-        if prompt_mode == PromptMode.DEFAULT:
-            if not self.default_prompt.strip():
-                raise ValueError(
-                    f"Default prompt is empty for smell_id='{self.smell_id}'"
-                )
-            return self.default_prompt
-        if prompt_mode == PromptMode.DRAFT:
-            if self.draft_prompt is None or not self.draft_prompt.strip():
-                raise ValueError(
-                    f"No draft prompt available for smell_id='{self.smell_id}'"
-                )
-            return self.draft_prompt
-        if prompt_mode == PromptMode.DRAFT_IF_AVAILABLE:
-            if self.draft_prompt is not None and self.draft_prompt.strip():
-                return self.draft_prompt
-            if not self.default_prompt.strip():
-                raise ValueError(
-                    f"No default prompt available for smell_id='{self.smell_id}'"
-                )
-            return self.default_prompt
-        raise ValueError(f"Unknown prompt_mode: {prompt_mode}")
+        getter = self._PROMPT_GETTERS.get(prompt_mode)
+        if getter is None:
+            # plain strings ("draft") hash differently from the str-enum members
+            try:
+                getter = self._PROMPT_GETTERS[PromptMode(prompt_mode)]
+            except ValueError:
+                raise ValueError(f"Unknown prompt_mode: {prompt_mode}") from None
+        return getter(self)
 
     def save_draft_as_default(self) -> None:
         """Promote the current draft prompt to default and enable detection."""
@@ -95,27 +114,195 @@ class LLMCatalog:
     smells: list[LLMSmellDefinition] = field(default_factory=list)
     providers: list[LLMProviderDefinition] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        # smell_id -> position in `smells`. Kept outside the dataclass fields so
+        # it is not persisted by asdict(); rebuilt when `smells` is reassigned or
+        # changes length behind the catalog's back.
+        self._positions: dict[str, int] = {}
+        self._indexed: Optional[list[LLMSmellDefinition]] = None
+        self._indexed_len = -1
+        # smells ordered by display name, plus the (smell, display_name) pairs
+        # of `smells` it was sorted from, to tell when it went stale
+        self._sorted: Optional[list[LLMSmellDefinition]] = None
+        self._sorted_from: list[tuple[LLMSmellDefinition, str]] = []
+        # provider_id -> position in `providers`, kept fresh like the smell index
+        self._provider_positions: dict[str, int] = {}
+        self._providers_indexed: Optional[list[LLMProviderDefinition]] = None
+        self._providers_indexed_len = -1
+
+    def _index(self) -> dict[str, int]:
+        if self._indexed is not self.smells or self._indexed_len != len(self.smells):
+            positions: dict[str, int] = {}
+            for index, smell in enumerate(self.smells):
+                positions.setdefault(smell.smell_id, index)
+            self._positions = positions
+            self._indexed = self.smells
+            self._indexed_len = len(self.smells)
+        return self._positions
+
+    def sorted_smells(self) -> list[LLMSmellDefinition]:
+        """Smells ordered by display name (case-insensitive), cached between changes.
+
+        The cache is checked against the current items and their names, so
+        in-place edits (smells[i] = ..., smell.display_name = ...) are seen too.
+        """
+        smells = self.smells
+        if (
+            self._sorted is None
+            or len(self._sorted_from) != len(smells)
+            or any(
+                s is not old or s.display_name != name
+                for s, (old, name) in zip(smells, self._sorted_from)
+            )
+        ):
+            self._sorted = sorted(smells, key=lambda s: s.display_name.casefold())
+            self._sorted_from = [(s, s.display_name) for s in smells]
+        return list(self._sorted)
+
+    def _position(self, smell_id: str) -> Optional[int]:
+        index = self._index().get(smell_id)
+        if index is not None and self.smells[index].smell_id == smell_id:
+            return index
+        # smells[i] = ... keeps the list and its length, so the index cannot
+        # tell it changed: re-check a miss or a mismatch against a fresh index.
+        self._indexed = None
+        return self._index().get(smell_id)
+
+    def has_smell(self, smell_id: str) -> bool:
+        return self._position(smell_id) is not None
+
     def get_smell(self, smell_id: str) -> LLMSmellDefinition:
-        for smell in self.smells:
-            if smell.smell_id == smell_id:
-                return smell
-        raise KeyError(f"Unknown smell_id: {smell_id}")
+        index = self._position(smell_id)
+        if index is None:
+            raise KeyError(f"Unknown smell_id: {smell_id}")
+        return self.smells[index]
 
     def upsert_smell(self, smell: LLMSmellDefinition) -> None:
-        for index, existing in enumerate(self.smells):
-            if existing.smell_id == smell.smell_id:
-                self.smells[index] = smell
-                return
+        index = self._position(smell.smell_id)
+        if index is not None:
+            self.smells[index] = smell
+            return
+        self._positions[smell.smell_id] = len(self.smells)
         self.smells.append(smell)
+        self._indexed_len = len(self.smells)
+
+    def remove_smell(self, smell_id: str) -> None:
+        if self._position(smell_id) is None:
+            raise KeyError(f"Unknown smell_id: {smell_id}")
+        self.smells = [s for s in self.smells if s.smell_id != smell_id]
+
+    def _provider_index(self) -> dict[str, int]:
+        if (
+            self._providers_indexed is not self.providers
+            or self._providers_indexed_len != len(self.providers)
+        ):
+            positions: dict[str, int] = {}
+            for index, provider in enumerate(self.providers):
+                positions.setdefault(provider.provider_id, index)
+            self._provider_positions = positions
+            self._providers_indexed = self.providers
+            self._providers_indexed_len = len(self.providers)
+        return self._provider_positions
+
+    def get_provider(self, provider_id: str) -> LLMProviderDefinition:
+        index = self._provider_index().get(provider_id)
+        if index is None or self.providers[index].provider_id != provider_id:
+            # Same re-check as _position(): providers[i] = ... goes unnoticed
+            self._providers_indexed = None
+            index = self._provider_index().get(provider_id)
+        if index is None:
+            raise KeyError(f"Unknown provider_id: {provider_id}")
+        return self.providers[index]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DetectionTarget:
     filename: str
     code: str
+    # Line of the original file where `code` starts (> 1 for a chunk of a file)
+    first_line: int = 1
+
+    def split(self, max_chars: int, max_lines: Optional[int] = None) -> list[DetectionTarget]:
+        """Split an oversized target into windows aligned on top-level statements.
+
+        Consecutive statements are packed up to max_chars (and max_lines, if
+        given) per window; a single larger statement gets a window of its own.
+        Windows keep the file name and their original line numbers, so findings
+        still point into the real file. Targets that fit, or that do not parse,
+        are returned unchanged.
+        """
+        too_long = max_lines is not None and self.code.count("\n") > max_lines
+        if len(self.code) <= max_chars and not too_long:
+            return [self]
+        try:
+            tree = ast.parse(self.code)
+        except (SyntaxError, ValueError):
+            return [self]
+
+        # Split like the tokenizer (\n, \r\n, \r only), so the AST line numbers
+        # line up; str.splitlines also breaks on \f, \u2028 and friends.
+        lines = io.StringIO(self.code, newline="").readlines()
+        # 0-based first line of each top-level statement, decorators included
+        starts = sorted(
+            {
+                min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])]) - 1
+                for node in tree.body
+            }
+        )
+        if len(starts) < 2:
+            return [self]
+        starts[0] = 0  # leading comments belong to the first window
 
+        line_limit = max_lines if max_lines is not None else len(lines)
+        windows: list[tuple[int, int]] = []
+        window_start, window_size = 0, 0
+        for begin, end in zip(starts, starts[1:] + [len(lines)]):
+            size = sum(len(line) for line in lines[begin:end])
+            if window_size and (
+                window_size + size > max_chars or end - window_start > line_limit
+            ):
+                windows.append((window_start, begin))
+                window_start, window_size = begin, 0
+            window_size += size
+        windows.append((window_start, len(lines)))
 
-@dataclass(frozen=True)
+        if len(windows) == 1:
+            return [self]
+        return [
+            DetectionTarget(
+                filename=self.filename,
+                code="".join(lines[begin:end]),
+                first_line=self.first_line + begin,
+            )
+            for begin, end in windows
+        ]
+
+
+# JSON Schema of the {"findings": [...]} payload the orchestrator asks for;
+# providers with structured output can have the model decode against it.
+FINDINGS_JSON_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "function_name": {"type": ["string", "null"]},
+                    "line": {"type": "integer"},
+                    "description": {"type": "string"},
+                    "additional_info": {"type": "string"},
+                },
+                "required": ["function_name", "line", "description"],
+            },
+        },
+    },
+    "required": ["findings"],
+    "additionalProperties": False,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class LLMSmellFinding:
     """Normalized LLM output, designed to be convertible to the existing CSV schema."""
 
@@ -127,6 +314,8 @@ class LLMSmellFinding:
     additional_info: str = ""
     smell_id: Optional[str] = None
     confidence: Optional[float] = None
+    # Only set on diagnostic rows (line == -1); callers needing the raw text of
+    # successful responses keep it per file (see detect_for_prompt_engineering_with_raw)
     raw_response: Optional[str] = None
 
     def to_overview_row(self) -> dict[str, Any]:
@@ -138,3 +327,14 @@ class LLMSmellFinding:
             "description": self.description,
             "additional_info": self.additional_info,
         }
+
+
+# Keys of LLMSmellFinding.to_overview_row(), in CSV column order
+OVERVIEW_COLUMNS: tuple[str, ...] = (
+    "filename",
+    "function_name",
+    "smell_name",
+    "line",
+    "description",
+    "additional_info",
+)
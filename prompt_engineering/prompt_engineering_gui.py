@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import csv
 import json
 import os
+import queue
 import threading
-from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
 from time import monotonic
-from typing import Optional
+from typing import NamedTuple, Optional
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
@@ -15,12 +19,56 @@ from tkinter.scrolledtext import ScrolledText
 from llm_detection.catalog_service import CatalogValidationError, LLMCatalogService
 from llm_detection.orchestrator import LLMOrchestrator
 from llm_detection.providers import LocalLLMProvider
-from llm_detection.types import DetectionTarget, PromptMode, ProviderKind
+from llm_detection.types import (
+    OVERVIEW_COLUMNS,
+    DetectionTarget,
+    LLMCatalog,
+    PromptMode,
+    ProviderKind,
+)
 from utils.file_utils import FileUtils
 from gui.manage_code_smells_gui import AddSmellDialog
+from gui.textbox_redirect import TextBoxRedirect
+
+try:  # optional, faster serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _jsonl_line(record: dict[str, str]) -> bytes:
+    """One UTF-8 encoded JSON Lines record, newline included."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class _TestJob(NamedTuple):
+    """Arguments of one test run, queued for the window's worker thread."""
+
+    smell_id: str
+    mode: PromptMode
+    input_path: str
+    output_path: str
+    provider_id: str
+    # Prompt text of a draft run, read on the UI thread when the run was queued
+    draft_prompt: Optional[str] = None
 
 
 class PromptEngineeringGUI:
+    # Interval at which queued output is flushed into the output box
+    OUTPUT_FLUSH_MS = 50
+    # Lines kept in the output box; older ones are dropped once it exceeds
+    # the overflow threshold
+    OUTPUT_MAX_LINES = 2000
+    OUTPUT_OVERFLOW_LINES = 2500
+    # Runs over more files than this ask for confirmation first
+    CONFIRM_FILE_COUNT = 15
+    # Files handed to the orchestrator per call during a test run
+    TEST_BATCH_SIZE = 8
+    # Quiet period after the last keystroke before a prompt edit is applied
+    PROMPT_EDIT_DEBOUNCE_MS = 100
+
     def __init__(self, master: tk.Tk, catalog_service: Optional[LLMCatalogService] = None):
         self.master = master
         self.catalog_service = catalog_service or LLMCatalogService()
@@ -28,10 +76,14 @@ class PromptEngineeringGUI:
         # --- state ---
         self._current_smell_id: Optional[str] = None
         self._draft_dirty: bool = False
+        self._edited_after_id: Optional[str] = None
         self._ui_disabled_no_smells: bool = False
 
         self._mode_var = tk.StringVar(value=PromptMode.DRAFT.value)
         self._smell_display_to_id: dict[str, str] = {}
+        # smell_id -> (draft prompt, default prompt), so switching smell or
+        # mode does not go back to the catalog
+        self._prompt_cache: dict[str, tuple[str, str]] = {}
 
         self._local_provider_display_to_id: dict[str, str] = {}
         self._selected_local_provider_id: Optional[str] = None
@@ -45,6 +97,14 @@ class PromptEngineeringGUI:
         self._running_total: int = 0
         self._running_index: int = 0
         self._running_filename: str = ""
+        self._output_flush_id: Optional[str] = None
+
+        # Test runs go to one long-lived worker thread, started on the first run
+        self._job_queue: queue.Queue[Optional[_TestJob]] = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        # provider_id -> (config it was built from, provider); only touched by
+        # the worker, so a provider and its client are reused across runs
+        self._local_providers: dict[str, tuple[dict, LocalLLMProvider]] = {}
 
         # --- ui ---
         self._build_ui()
@@ -130,6 +190,8 @@ class PromptEngineeringGUI:
         self._default_radio.grid(row=0, column=1, sticky="w")
 
         self._prompt_text = ScrolledText(mode_frame, height=8, wrap="word")
+        # Last state set on the prompt box; see _set_prompt_state()
+        self._prompt_state = "normal"
         self._prompt_text.grid(row=2, column=0, sticky="nsew", padx=10, pady=(4, 10))
         self._prompt_text.bind("<KeyRelease>", self._on_prompt_edited)
 
@@ -195,18 +257,29 @@ class PromptEngineeringGUI:
 
         self._output_text = ScrolledText(out, height=12, wrap="word", state="disabled")
         self._output_text.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        self._output_sink = TextBoxRedirect(
+            self._output_text,
+            max_lines=self.OUTPUT_MAX_LINES,
+            overflow_lines=self.OUTPUT_OVERFLOW_LINES,
+        )
 
     # ---------------- Data loading ----------------
 
+    def _get_catalog(self) -> LLMCatalog:
+        """Current catalog (the service re-reads the JSON only after the file changed)."""
+        return self.catalog_service.load()
+
     def _load_smells_into_dropdown(self) -> None:
-        catalog = self.catalog_service.load()
+        catalog = self._get_catalog()
 
         self._smell_display_to_id.clear()
+        self._prompt_cache.clear()
         values: list[str] = []
 
-        for smell in sorted(catalog.smells, key=lambda s: s.display_name.lower()):
+        for smell in catalog.sorted_smells():
             label = f"{smell.display_name}  ({smell.smell_id})"
             self._smell_display_to_id[label] = smell.smell_id
+            self._prompt_cache[smell.smell_id] = (smell.draft_prompt or "", smell.default_prompt or "")
             values.append(label)
 
         self._smell_combo["values"] = values
@@ -230,7 +303,7 @@ class PromptEngineeringGUI:
         self._on_smell_selected()
 
     def _load_local_providers_into_dropdown(self) -> None:
-        catalog = self.catalog_service.load()
+        catalog = self._get_catalog()
 
         self._local_provider_display_to_id.clear()
         values: list[str] = []
@@ -294,7 +367,7 @@ class PromptEngineeringGUI:
         self._add_smell_btn.configure(state="normal")
         self._draft_radio.configure(state="disabled")
         self._default_radio.configure(state="disabled")
-        self._prompt_text.configure(state="disabled")
+        self._set_prompt_state("disabled")
         self._test_btn.configure(state="disabled")
         self._save_default_btn.configure(state="disabled")
         self._local_provider_combo.configure(state="disabled")
@@ -322,7 +395,7 @@ class PromptEngineeringGUI:
 
         selected = self._smell_combo.get()
         self._current_smell_id = self._smell_display_to_id.get(selected)
-        self._draft_dirty = False
+        self._mark_draft_clean()
         self._refresh_prompt_view()
         self._sync_test_button_state()
 
@@ -339,7 +412,7 @@ class PromptEngineeringGUI:
             if not self._confirm_discard_unsaved_draft_if_needed(context="passare al prompt di default"):
                 self._mode_var.set(PromptMode.DRAFT.value)
                 return
-        self._draft_dirty = False
+        self._mark_draft_clean()
         self._refresh_prompt_view()
 
     def _refresh_prompt_view(self) -> None:
@@ -347,26 +420,55 @@ class PromptEngineeringGUI:
             self._set_prompt_text("", editable=False)
             return
 
-        mode = PromptMode(self._mode_var.get())
-        catalog = self.catalog_service.load()
-        smell = catalog.get_smell(self._current_smell_id)
-
-        if mode == PromptMode.DRAFT:
-            self._set_prompt_text(smell.draft_prompt or "", editable=True)
+        draft_prompt, default_prompt = self._prompt_cache.get(self._current_smell_id, ("", ""))
+        if self._mode_var.get() == PromptMode.DRAFT.value:
+            self._set_prompt_text(draft_prompt, editable=True)
         else:
-            self._set_prompt_text(smell.default_prompt or "", editable=False)
+            self._set_prompt_text(default_prompt, editable=False)
+
+    def _recache_prompts(self, smell_id: str) -> None:
+        """Refresh the cached prompts of a smell after this window saved them."""
+        smell = self._get_catalog().get_smell(smell_id)
+        self._prompt_cache[smell_id] = (smell.draft_prompt or "", smell.default_prompt or "")
 
     def _set_prompt_text(self, text: str, editable: bool) -> None:
-        self._prompt_text.configure(state="normal")
+        self._set_prompt_state("normal")
         self._prompt_text.delete("1.0", "end")
         self._prompt_text.insert("1.0", text)
-        self._prompt_text.configure(state="normal" if editable else "disabled")
+        self._set_prompt_state("normal" if editable else "disabled")
+
+    def _set_prompt_state(self, state: str) -> None:
+        # configure() is a Tcl round trip even when the state does not change,
+        # so it is skipped when the prompt box is already in that state
+        if state != self._prompt_state:
+            self._prompt_text.configure(state=state)
+            self._prompt_state = state
 
     def _on_prompt_edited(self, _event) -> None:
         if self._mode_var.get() != PromptMode.DRAFT.value:
             return
+        # A burst of keystrokes is applied once, after the last one
+        if self._edited_after_id is not None:
+            self.master.after_cancel(self._edited_after_id)
+        self._edited_after_id = self.master.after(self.PROMPT_EDIT_DEBOUNCE_MS, self._apply_prompt_edit)
+
+    def _apply_prompt_edit(self) -> None:
+        self._edited_after_id = None
         self._draft_dirty = True
 
+    def _flush_prompt_edit(self) -> None:
+        """Apply a prompt edit still waiting for its debounce, so _draft_dirty is current."""
+        if self._edited_after_id is not None:
+            self.master.after_cancel(self._edited_after_id)
+            self._apply_prompt_edit()
+
+    def _mark_draft_clean(self) -> None:
+        # An edit still waiting for its debounce is covered by the save/reset
+        if self._edited_after_id is not None:
+            self.master.after_cancel(self._edited_after_id)
+            self._edited_after_id = None
+        self._draft_dirty = False
+
     def _choose_input_path(self) -> None:
         path = filedialog.askdirectory()
         if path:
@@ -417,20 +519,25 @@ class PromptEngineeringGUI:
         if mode == PromptMode.DRAFT:
             try:
                 self.catalog_service.save_draft_prompt(smell_id, prompt_text)
-                self._draft_dirty = False
+                self._recache_prompts(smell_id)
+                self._mark_draft_clean()
             except CatalogValidationError as e:
                 messagebox.showerror("Errore", str(e))
                 return
 
-        python_files = FileUtils.get_python_files(input_path)
-        if not python_files:
+        # Only enough of the tree is walked here to pick the right prompt; the
+        # worker thread collects the full file list
+        file_count = sum(
+            1 for _ in islice(FileUtils.iter_python_files(input_path), self.CONFIRM_FILE_COUNT + 1)
+        )
+        if not file_count:
             messagebox.showerror("Errore", "Input path contains no Python files (.py)")
             return
 
-        if len(python_files) > 15:
+        if file_count > self.CONFIRM_FILE_COUNT:
             ok = messagebox.askyesno(
                 "Conferma",
-                f"L'input contiene {len(python_files)} file .py.\n"
+                f"L'input contiene più di {self.CONFIRM_FILE_COUNT} file .py.\n"
                 "Il test potrebbe richiedere molto tempo.\n\nContinuare?",
             )
             if not ok:
@@ -439,7 +546,7 @@ class PromptEngineeringGUI:
         os.makedirs(output_path, exist_ok=True)
 
         self._cancel_event.clear()
-        self._running_total = len(python_files)
+        self._running_total = 0
         self._running_index = 0
         self._running_filename = ""
 
@@ -448,7 +555,7 @@ class PromptEngineeringGUI:
         self._progress.configure(mode="indeterminate")
         self._progress.start(120)
         self._run_started_at = monotonic()
-        self._status_var.set(f"Running: 0/{len(python_files)}  (starting...)")
+        self._status_var.set("Running  (starting...)")
         self._schedule_heartbeat()
 
         self._append_output(f"Input Path: {input_path}\n")
@@ -458,12 +565,11 @@ class PromptEngineeringGUI:
         self._append_output(f"Local provider: {provider_id}\n")
         self._append_output("Analyzing file(s)...\n")
 
-        t = threading.Thread(
-            target=self._run_test_thread,
-            args=(smell_id, mode, python_files, output_path, provider_id),
-            daemon=True,
-        )
-        t.start()
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._worker.start()
+        draft_prompt = prompt_text if mode == PromptMode.DRAFT else None
+        self._job_queue.put(_TestJob(smell_id, mode, input_path, output_path, provider_id, draft_prompt))
 
     def _on_cancel_clicked(self) -> None:
         if self._cancel_event.is_set():
@@ -484,7 +590,8 @@ class PromptEngineeringGUI:
                 return
             try:
                 self.catalog_service.save_draft_prompt(smell_id, prompt_text)
-                self._draft_dirty = False
+                self._recache_prompts(smell_id)
+                self._mark_draft_clean()
             except CatalogValidationError as e:
                 messagebox.showerror("Errore", str(e))
                 return
@@ -499,6 +606,7 @@ class PromptEngineeringGUI:
 
         try:
             self.catalog_service.promote_draft_to_default(smell_id)
+            self._recache_prompts(smell_id)
         except Exception as e:
             messagebox.showerror("Errore", str(e))
             return
@@ -511,6 +619,7 @@ class PromptEngineeringGUI:
         return self._prompt_text.get("1.0", "end")
 
     def _confirm_discard_unsaved_draft_if_needed(self, context: str) -> bool:
+        self._flush_prompt_edit()
         if not self._draft_dirty:
             return True
         return messagebox.askyesno(
@@ -520,6 +629,7 @@ class PromptEngineeringGUI:
         )
 
     def _on_close(self) -> None:
+        self._flush_prompt_edit()
         if self._draft_dirty:
             ok = messagebox.askyesno(
                 "Uscita",
@@ -528,95 +638,137 @@ class PromptEngineeringGUI:
             )
             if not ok:
                 return
+        if self._worker is not None:
+            self._job_queue.put(None)
         self.master.destroy()
 
     # ---------------- Background test ----------------
 
+    def _worker_loop(self) -> None:
+        # None is queued when the window closes
+        while (job := self._job_queue.get()) is not None:
+            self._run_test_thread(*job)
+
     def _run_test_thread(
         self,
         smell_id: str,
         mode: PromptMode,
-        python_files: list[str],
+        input_path: str,
         output_path: str,
         provider_id: str,
+        draft_prompt: Optional[str] = None,
     ) -> None:
         try:
-            catalog = self.catalog_service.load()
-            smell = catalog.get_smell(smell_id)
+            catalog = self._get_catalog()
+            catalog.get_smell(smell_id)
 
-            # ensure catalog contains the draft prompt used for the run
-            if mode == PromptMode.DRAFT:
-                prompt_text = self._get_current_prompt_text().strip()
-                smell = replace(smell, draft_prompt=prompt_text)
-                catalog.upsert_smell(smell)
+            # The draft goes straight to the orchestrator; the shared catalog
+            # is left as it is
+            if mode == PromptMode.DRAFT and draft_prompt is None:
+                draft_prompt = self._get_current_prompt_text().strip()
+            prompt_override = draft_prompt if mode == PromptMode.DRAFT else None
 
-            provider = self._build_local_provider_by_id(catalog, provider_id)
+            provider = self._get_local_provider(catalog, provider_id)
             orchestrator = LLMOrchestrator(provider=provider, catalog=catalog)
-
-            all_findings = []
+            # Prompts of a batch are in flight together, as in generate_batch()
+            max_workers = getattr(provider, "num_parallel", 1)
+
+            python_files = FileUtils.get_python_files(input_path)
+            # Diagnostic rows carry the raw response, which is already
+            # streamed to the JSONL file, so they are only counted
+            valid_count = 0
+            parse_error_count = 0
             prompts_sent = 0
             total = len(python_files)
-            raw_records: list[dict[str, str]] = []
-
-            for idx, filename in enumerate(python_files, start=1):
-                if self._cancel_event.is_set():
-                    break
-
-                with open(filename, "r", encoding="utf-8") as f:
-                    code = f.read()
-
-                target = DetectionTarget(filename=filename, code=code)
-
-                def _ui_start_file(i: int = idx, n: int = total, fn: str = filename, chars: int = len(code)) -> None:
-                    self._running_index = i
-                    self._running_total = n
-                    self._running_filename = os.path.basename(fn)
-                    self._append_output(f"[{i}/{n}] Avvio analisi: {os.path.basename(fn)} (chars: {chars})\n")
-
-                self.master.after(0, _ui_start_file)
-
-                findings, stats, raw_by_file = orchestrator.detect_for_prompt_engineering_with_raw(
-                    targets=[target],
-                    smell_id=smell_id,
-                    prompt_mode=mode,
-                )
-                all_findings.extend(findings)
-                prompts_sent += stats.prompts_sent
-
-                raw_records.append(
-                    {
-                        "filename": filename,
-                        "smell_id": smell_id,
-                        "prompt_mode": mode.value,
-                        "provider_id": provider_id,
-                        "raw_response": raw_by_file.get(filename, ""),
-                    }
-                )
-
-            # more consistent than "!= -1"
-            valid_findings = [f for f in all_findings if getattr(f, "line", -1) > 0]
-            parse_error_count = len(all_findings) - len(valid_findings)
-
-            df = orchestrator.findings_to_dataframe(valid_findings)
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_dir = os.path.join(output_path, "output")
             os.makedirs(output_dir, exist_ok=True)
 
+            # Findings and raw responses are streamed to disk as they arrive
+            # rather than kept in memory for the whole run
             out_file = os.path.join(output_dir, f"prompt_engineering_{smell_id}_{timestamp}.csv")
-            df.to_csv(out_file, index=False)
-            csv_rows = int(len(df.index))
+            raw_file = os.path.join(output_dir, f"prompt_engineering_{smell_id}_{timestamp}_raw.jsonl")
+            batch_size = self.TEST_BATCH_SIZE
+            with (
+                ThreadPoolExecutor(max_workers=1) as reader,
+                open(out_file, "w", newline="", encoding="utf-8") as csv_fh,
+                open(raw_file, "wb") as raw_fh,
+            ):
+                writer = csv.DictWriter(csv_fh, fieldnames=OVERVIEW_COLUMNS)
+                writer.writeheader()
+                # Each batch is read while the previous one is with the LLM
+                next_targets = reader.submit(self._read_targets, python_files[:batch_size])
+                for first in range(0, total, batch_size):
+                    if self._cancel_event.is_set():
+                        break
+
+                    targets = next_targets.result()
+                    if first + batch_size < total:
+                        next_targets = reader.submit(
+                            self._read_targets, python_files[first + batch_size:first + 2 * batch_size]
+                        )
+
+                    # Names and lengths are worked out here, off the UI thread
+                    bases = [os.path.basename(t.filename) for t in targets]
+                    start_text = "".join(
+                        f"[{j}/{total}] Avvio analisi: {base} (chars: {len(t.code)})\n"
+                        for j, (base, t) in enumerate(zip(bases, targets), start=first + 1)
+                    )
+
+                    def _ui_start_batch(
+                        i: int = first + len(targets), n: int = total, base: str = bases[-1], text: str = start_text
+                    ) -> None:
+                        self._running_index = i
+                        self._running_total = n
+                        self._running_filename = base
+                        self._append_output(text)
+
+                    self.master.after(0, _ui_start_batch)
+
+                    findings, stats, raw_by_file = orchestrator.detect_for_prompt_engineering_with_raw(
+                        targets=targets,
+                        smell_id=smell_id,
+                        prompt_mode=mode,
+                        max_workers=max_workers,
+                        cancel_check=self._cancel_event.is_set,
+                        draft_prompt_override=prompt_override,
+                    )
+                    for finding in findings:
+                        # more consistent than "!= -1"
+                        if getattr(finding, "line", -1) > 0:
+                            writer.writerow(finding.to_overview_row())
+                            valid_count += 1
+                        else:
+                            parse_error_count += 1
+                    prompts_sent += stats.prompts_sent
+
+                    raw_fh.write(
+                        b"".join(
+                            _jsonl_line(
+                                {
+                                    "filename": target.filename,
+                                    "smell_id": smell_id,
+                                    "prompt_mode": mode.value,
+                                    "provider_id": provider_id,
+                                    "raw_response": raw_by_file[target.filename],
+                                }
+                            )
+                            for target in targets
+                            if target.filename in raw_by_file
+                        )
+                    )
+                    if len(raw_by_file) < len(targets):
+                        # cancelled before the rest of the batch was sent
+                        break
+
+            csv_rows = valid_count
 
             try:
                 csv_size = int(os.path.getsize(out_file))
             except Exception:
                 csv_size = -1
 
-            raw_file = os.path.join(output_dir, f"prompt_engineering_{smell_id}_{timestamp}_raw.jsonl")
-            with open(raw_file, "w", encoding="utf-8") as f:
-                for rec in raw_records:
-                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-
             try:
                 raw_size = int(os.path.getsize(raw_file))
             except Exception:
@@ -629,17 +781,17 @@ class PromptEngineeringGUI:
 
                 self._append_output(
                     f"Test completato. Prompts sent: {prompts_sent} | "
-                    f"Targets: {total} | Findings: {len(all_findings)} "
-                    f"(valid: {len(valid_findings)} | parse_errors: {parse_error_count})\n"
+                    f"Targets: {total} | Findings: {valid_count + parse_error_count} "
+                    f"(valid: {valid_count} | parse_errors: {parse_error_count})\n"
                 )
-                self._append_output(f"Analysis completed. Total code smells found: {len(valid_findings)}\n")
+                self._append_output(f"Analysis completed. Total code smells found: {valid_count}\n")
                 self._append_output(f"Output folder: {output_dir}\n")
                 self._append_output(f"Risultati salvati in: {out_file}\n")
                 self._append_output(f"Raw responses salvate in: {raw_file}\n")
                 self._append_output(f"CSV rows: {csv_rows} | CSV bytes: {csv_size}\n")
                 self._append_output(f"Raw bytes: {raw_size}\n")
 
-                if df.empty:
+                if not csv_rows:
                     if parse_error_count > 0:
                         self._append_output("Nessun finding valido estratto (solo parse/validation errors).\n")
                     else:
@@ -647,7 +799,7 @@ class PromptEngineeringGUI:
                 else:
                     self._append_output("Findings validi generati e salvati su CSV.\n")
 
-                if any(getattr(f, "line", None) <= 0 for f in all_findings):
+                if parse_error_count > 0:
                     self._append_output(
                         "Nota: almeno una risposta non era JSON valido o era troncata. "
                         "Vedi *_raw.jsonl per la risposta grezza.\n"
@@ -682,19 +834,27 @@ class PromptEngineeringGUI:
 
     def _schedule_heartbeat(self) -> None:
         self._stop_heartbeat()
+        last_status: Optional[tuple] = None
 
         def _tick() -> None:
+            nonlocal last_status
             if self._run_started_at is None:
                 return
             elapsed_s = int(monotonic() - self._run_started_at)
             i = self._running_index
             n = self._running_total
             fn = self._running_filename
-            cancel = " (cancelling...)" if self._cancel_event.is_set() else ""
-            if fn:
-                self._status_var.set(f"Running: {i}/{n}  (file: {fn})  elapsed: {elapsed_s}s{cancel}")
-            else:
-                self._status_var.set(f"Running: {i}/{n}  elapsed: {elapsed_s}s{cancel}")
+            cancelling = self._cancel_event.is_set()
+            # The StringVar (and the label redraw it triggers) is only touched
+            # when the text would actually change
+            status = (i, n, fn, elapsed_s, cancelling)
+            if status != last_status:
+                last_status = status
+                cancel = " (cancelling...)" if cancelling else ""
+                if fn:
+                    self._status_var.set(f"Running: {i}/{n}  (file: {fn})  elapsed: {elapsed_s}s{cancel}")
+                else:
+                    self._status_var.set(f"Running: {i}/{n}  elapsed: {elapsed_s}s{cancel}")
             self._heartbeat_after_id = self.master.after(1000, _tick)
 
         self._heartbeat_after_id = self.master.after(250, _tick)
@@ -724,20 +884,41 @@ class PromptEngineeringGUI:
         self._local_provider_combo.configure(state="disabled" if running else ("disabled" if self._ui_disabled_no_smells else "readonly"))
 
         if running:
-            self._prompt_text.configure(state="disabled")
+            self._set_prompt_state("disabled")
         else:
             self._refresh_prompt_view()
 
+    @staticmethod
+    def _read_targets(filenames: list[str]) -> list[DetectionTarget]:
+        # One bytes read + decode per file; the text layer's incremental
+        # decoding and newline translation are not needed
+        return [
+            DetectionTarget(filename=filename, code=Path(filename).read_bytes().decode("utf-8"))
+            for filename in filenames
+        ]
+
     # ---------------- Provider builder ----------------
 
+    def _get_local_provider(self, catalog, provider_id: str) -> LocalLLMProvider:
+        """Provider for provider_id, rebuilt only when its catalog config changed."""
+        try:
+            config = catalog.get_provider(provider_id).config
+        except KeyError:
+            config = None
+        cached = self._local_providers.get(provider_id)
+        if cached is not None and cached[0] == config:
+            return cached[1]
+        provider = self._build_local_provider_by_id(catalog, provider_id)
+        self._local_providers[provider_id] = (dict(config), provider)
+        return provider
+
     @staticmethod
     def _build_local_provider_by_id(catalog, provider_id: str) -> LocalLLMProvider:
-        local = None
-        for p in catalog.providers:
-            if p.provider_id == provider_id and p.kind == ProviderKind.LOCAL:
-                local = p
-                break
-        if local is None:
+        try:
+            local = catalog.get_provider(provider_id)
+        except KeyError:
+            local = None
+        if local is None or local.kind != ProviderKind.LOCAL:
             raise RuntimeError(f"Local provider not found or not local: provider_id='{provider_id}'")
 
         model_name = str(local.config.get("model_name") or "qwen2.5-coder:7b")
@@ -758,12 +939,18 @@ class PromptEngineeringGUI:
     # ---------------- Output helpers ----------------
 
     def _append_output(self, text: str) -> None:
-        self._output_text.configure(state="normal")
-        self._output_text.insert("end", text)
-        # Ensure geometry/layout is up-to-date before scrolling.
-        self._output_text.update_idletasks()
-        self._output_text.see("end")
-        self._output_text.configure(state="disabled")
+        # Queued and written by _flush_output, so a burst of messages costs a
+        # single insert/scroll instead of one per message
+        self._output_sink.write(text)
+        if self._output_flush_id is None:
+            self._output_flush_id = self.master.after(self.OUTPUT_FLUSH_MS, self._flush_output)
+
+    def _flush_output(self) -> None:
+        self._output_flush_id = None
+        self._output_sink.drain()
+        if not self._output_sink.queue.empty():
+            # drain() caps each batch; pick up the rest on the next tick
+            self._output_flush_id = self.master.after(self.OUTPUT_FLUSH_MS, self._flush_output)
 
 
 def main() -> None:
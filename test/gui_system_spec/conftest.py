@@ -1,12 +1,20 @@
+import atexit
+import importlib
+import os
 import shutil
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
 
 class ImmediateThread:
-    """Sostituto di threading.Thread: esegue subito target() nel test (no async)."""
+    """
+    Sostituto di threading.Thread: esegue subito target() nel test (no async).
+    Mantenuto per compatibilità: force_sync_threads ora usa _SyncThread.
+    """
 
     def __init__(self, target=None, args=(), kwargs=None, daemon=None):
         self._target = target
@@ -19,65 +27,140 @@ class ImmediateThread:
             self._target(*self._args, **self._kwargs)
 
 
+class _SyncThread(threading.Thread):
+    """Vero threading.Thread il cui start() esegue run() subito nel thread del test."""
+
+    def start(self):
+        self.run()
+
+    def join(self, timeout=None):
+        pass
+
+
+class _SyncThreading:
+    """Il modulo threading visto dalla GUI: solo Thread è sostituito."""
+
+    Thread = _SyncThread
+
+    def __getattr__(self, name):
+        return getattr(threading, name)
+
+
 @pytest.fixture(scope="session")
 def repo_root() -> Path:
     # test/gui_system_spec/conftest.py -> repo root
     return Path(__file__).resolve().parents[2]
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _repo_on_syspath(repo_root: Path):
+    # Una sola modifica di sys.path per sessione, mai annullata: ogni modifica
+    # invalida le cache di importlib per gli import successivi
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+        importlib.invalidate_caches()
+    yield
+
+
 @pytest.fixture(scope="session")
 def fixtures_root(repo_root: Path) -> Path:
     return repo_root / "test" / "system_testing"
 
 
+@pytest.fixture(scope="module")
+def _module_output_root(tmp_path_factory) -> Path:
+    return tmp_path_factory.mktemp("out")
+
+
 @pytest.fixture()
-def tmp_output_dir(tmp_path: Path) -> Path:
-    out = tmp_path / "out"
+def tmp_output_dir(_module_output_root: Path, request) -> Path:
+    # Una sottocartella per test dentro la tmp del modulo: resta isolata
+    # (i test verificano che overview.csv NON esista) senza una tmp_path a test
+    out = _module_output_root / request.node.name
     out.mkdir(parents=True, exist_ok=True)
     return out
 
 
 @pytest.fixture()
 def force_sync_threads(monkeypatch):
-    import threading
+    """
+    Il thread di analisi della GUI gira subito nel thread del test.
+    Si sostituisce solo il `threading` visto da gui.code_smell_detector_gui:
+    gli altri thread (es. i worker di un ThreadPoolExecutor) restano veri.
+    """
+    import gui.code_smell_detector_gui as detector_gui
 
-    monkeypatch.setattr(threading, "Thread", ImmediateThread)
+    monkeypatch.setattr(detector_gui, "threading", _SyncThreading())
     return ImmediateThread
 
 
-@pytest.fixture(scope="session")
-def tk_root():
-    """Crea Tk root; se non disponibile (headless senza Xvfb), skip."""
+# Unica root Tk (nascosta) del processo: creata al primo uso, distrutta all'uscita
+_TK_ROOT = None
+
+
+def _destroy_tk_root() -> None:
     try:
+        _TK_ROOT.destroy()
+    except Exception:
+        pass
+
+
+def _get_tk_root():
+    global _TK_ROOT
+    if _TK_ROOT is None:
         import tkinter as tk
 
         root = tk.Tk()
         root.withdraw()
+        _TK_ROOT = root
+        atexit.register(_destroy_tk_root)
+    return _TK_ROOT
+
+
+@pytest.fixture(scope="session")
+def tk_root():
+    """Root Tk condivisa; se non disponibile (headless senza Xvfb), skip."""
+    try:
+        return _get_tk_root()
     except Exception as e:
         pytest.skip(f"Tk not available for GUI system tests: {e}")
-    yield root
-    try:
-        root.destroy()
-    except Exception:
-        pass
 
 
-@pytest.fixture()
-def gui_app(repo_root: Path, tk_root, monkeypatch):
+@pytest.fixture(scope="session")
+def _gui_app_singleton(tk_root):
     """
-    Istanzia la GUI senza redirezione stdout sulla textbox,
-    così pytest cattura i print() con capsys.
+    Istanzia la GUI una sola volta per sessione, senza redirezione stdout sulla
+    textbox, così pytest cattura i print() con capsys.
     """
-    sys.path.insert(0, str(repo_root))
     from gui.code_smell_detector_gui import CodeSmellDetectorGUI
 
-    monkeypatch.setattr(CodeSmellDetectorGUI, "configure_stdout", lambda self: None)
+    # configure_stdout è chiamato solo dal costruttore: la patch serve solo lì
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(CodeSmellDetectorGUI, "configure_stdout", lambda self: None)
+        app = CodeSmellDetectorGUI(tk_root)
+    return app
+
 
-    app = CodeSmellDetectorGUI(tk_root)
-    yield app
+def _reset_gui_state(app) -> None:
+    """Riporta i widget della GUI condivisa ai valori iniziali."""
+    app.input_path.configure(text="No path selected")
+    app.output_path.configure(text="No path selected")
+    app.walker_picker.delete(0, "end")
+    app.walker_picker.insert(0, "1")
+    for var in (app.parallel_var, app.resume_var, app.multiple_var, app.llm_var):
+        var.set(False)
+    app.provider_type_var.set("local")
+    app.toggle_llm_controls()
+    app.update_provider_list()
+    app.smell_listbox.selection_clear(0, "end")
+    app.project_analyzer = None
 
-    if str(repo_root) in sys.path:
-        sys.path.remove(str(repo_root))
+
+@pytest.fixture()
+def gui_app(_gui_app_singleton):
+    """GUI condivisa dalla sessione, ripulita prima di ogni test."""
+    _reset_gui_state(_gui_app_singleton)
+    return _gui_app_singleton
 
 
 def _wait_for_daemon_threads(timeout: int = 60) -> None:
@@ -85,36 +168,122 @@ def _wait_for_daemon_threads(timeout: int = 60) -> None:
     Aspetta che tutti i thread daemon completino.
     Utile per test async/parallel che usano thread daemon.
     """
-    import threading
     import time
 
-    start = time.time()
+    deadline = time.monotonic() + timeout
     main_thread = threading.current_thread()
 
-    while time.time() - start < timeout:
+    # join() si sveglia appena il thread termina, senza polling; si ricontrolla
+    # solo dopo i join, per i daemon avviati nel frattempo da quelli attesi
+    while True:
         daemon_threads = [
             t for t in threading.enumerate()
-            if t != main_thread and t.daemon
+            if t is not main_thread and t.daemon
         ]
         if not daemon_threads:
             return  # Tutti i daemon thread hanno terminato
-        time.sleep(0.01)  # Aspetta 10ms prima di controllare di nuovo
+        for t in daemon_threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+            if t.is_alive():
+                raise TimeoutError(f"Daemon threads didn't complete within {timeout}s")
 
-    # Se arriviamo qui, è timeout
-    raise TimeoutError(f"Daemon threads didn't complete within {timeout}s")
+
+def _link_or_copy(src, dst) -> None:
+    # Hardlink: nessun byte copiato; su un altro filesystem si copia
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 
-def copy_project(src: Path, dst: Path) -> None:
+def copy_project(src: Path, dst: Path, *, writable: bool = False) -> None:
+    """
+    Clona src in dst. I file sono hardlink ai sorgenti, quindi vanno solo letti:
+    con writable=True si fa una copia vera, modificabile senza toccare src.
+    """
     if dst.exists():
         shutil.rmtree(dst)
-    shutil.copytree(src, dst)
+    shutil.copytree(src, dst, copy_function=shutil.copy2 if writable else _link_or_copy)
+
+
+def _copy_projects(jobs: list[tuple[Path, Path]], max_workers: int = 8) -> None:
+    """
+    copy_project(src, dst) per ogni coppia, in parallelo: è I/O e i thread
+    rilasciano il GIL nelle syscall.
+    """
+    if len(jobs) < 2:
+        for src, dst in jobs:
+            copy_project(src, dst)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        # list() propaga la prima eccezione
+        list(pool.map(lambda job: copy_project(*job), jobs))
+
+
+# (cartella, sottocartelle relative, file relativi) di una cartella TC
+TcListing = tuple[Path, list[Path], list[Path]]
+
+
+def _clone_listing(listing: TcListing, dst: Path, *, writable: bool = False) -> None:
+    """Come copy_project, ma da un elenco già noto: src non viene riletto."""
+    src, dirs, files = listing
+    if dst.exists():
+        shutil.rmtree(dst)
+    dst.mkdir(parents=True)
+    for d in dirs:
+        (dst / d).mkdir(parents=True, exist_ok=True)
+    copy = shutil.copy2 if writable else _link_or_copy
+    for f in files:
+        copy(src / f, dst / f)
+
+
+@pytest.fixture(scope="session")
+def _tc_registry(fixtures_root: Path) -> dict[str, TcListing]:
+    """Contenuto di ogni cartella TC, letto una sola volta per sessione."""
+    registry: dict[str, TcListing] = {}
+    with os.scandir(fixtures_root) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            src = Path(entry.path)
+            dirs: list[Path] = []
+            files: list[Path] = []
+            for p in sorted(src.rglob("*")):
+                (dirs if p.is_dir() else files).append(p.relative_to(src))
+            registry[entry.name] = (src, dirs, files)
+    return registry
+
+
+@pytest.fixture(scope="session")
+def _tc_cache(tmp_path_factory, _tc_registry: dict[str, TcListing]):
+    """
+    Copia ogni cartella TC al massimo una volta per sessione, nella tmp di pytest:
+    i progetti dei test sono poi hardlink a questa copia (stesso filesystem).
+    La copia è vera, così un test che scrive per errore su un hardlink non
+    altera i file in test/system_testing.
+    """
+    cache_dir = tmp_path_factory.mktemp("tc_cache")
+    cached: dict[str, TcListing] = {}
+
+    def _get(tc_folder: str) -> TcListing:
+        if tc_folder not in cached:
+            _src, dirs, files = listing = _tc_registry[tc_folder]
+            dst = cache_dir / tc_folder
+            _clone_listing(listing, dst, writable=True)
+            cached[tc_folder] = (dst, dirs, files)
+        return cached[tc_folder]
+
+    return _get
 
 
 @pytest.fixture()
-def project_factory(tmp_path: Path, fixtures_root: Path):
+def project_factory(tmp_path: Path, _tc_cache):
     """
     Crea directory input ad-hoc usando i file presenti in test/system_testing/TC*
     Ritorna path della directory creata.
+    I file delle cartelle TC sono hardlink in sola lettura; per modificarli
+    usare "single_from_tc_rw".
     """
 
     def _mk_empty(name="empty_project") -> Path:
@@ -124,36 +293,40 @@ def project_factory(tmp_path: Path, fixtures_root: Path):
 
     def _mk_single_file_no_py(name="single_no_py") -> Path:
         # Usa TC15 (contiene sum.c) come sorgente “nessun .py”
-        src = fixtures_root / "TC15"
         dst = tmp_path / name
-        copy_project(src, dst)
+        _clone_listing(_tc_cache("TC15"), dst)
         return dst
 
     def _mk_single_project_from_tc(tc_folder: str, name: str) -> Path:
-        src = fixtures_root / tc_folder
         dst = tmp_path / name
-        copy_project(src, dst)
+        _clone_listing(_tc_cache(tc_folder), dst)
+        return dst
+
+    def _mk_single_project_from_tc_rw(tc_folder: str, name: str) -> Path:
+        dst = tmp_path / name
+        _clone_listing(_tc_cache(tc_folder), dst, writable=True)
         return dst
 
     def _mk_single_project_custom(files: list[Path], name: str) -> Path:
         dst = tmp_path / name
         dst.mkdir(parents=True, exist_ok=True)
         for f in files:
-            shutil.copy2(f, dst / f.name)
+            # Solo il contenuto (nessun test guarda mtime/permessi): su Linux
+            # copyfile usa già os.sendfile, senza copystat
+            shutil.copyfile(f, dst / f.name)
         return dst
 
     def _mk_multi_base(projects: dict[str, Path], name="multi_base") -> Path:
         base = tmp_path / name
         base.mkdir(parents=True, exist_ok=True)
-        for proj_name, proj_src in projects.items():
-            proj_dst = base / proj_name
-            copy_project(proj_src, proj_dst)
+        _copy_projects([(proj_src, base / proj_name) for proj_name, proj_src in projects.items()])
         return base
 
     return {
         "empty": _mk_empty,
         "single_no_py": _mk_single_file_no_py,
         "single_from_tc": _mk_single_project_from_tc,
+        "single_from_tc_rw": _mk_single_project_from_tc_rw,
         "single_custom": _mk_single_project_custom,
         "multi_base": _mk_multi_base,
     }
\ No newline at end of file
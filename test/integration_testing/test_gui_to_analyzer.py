@@ -11,7 +11,7 @@ def gui_setup():
     return gui
 
 
-@patch("gui.code_smell_detector_gui.ProjectAnalyzer")
+@patch("components.project_analyzer.ProjectAnalyzer")
 def test_gui_calls_project_analyzer(mock_analyzer, gui_setup):
     mock_instance = Mock()
     mock_instance.analyze_project.return_value = 5
@@ -23,12 +23,6 @@ def mock_file_system():
         )
 
 
-@pytest.fixture
-def mock_walk():
-    with patch("os.walk") as mock_walk:
-        yield mock_walk
-
-
 @pytest.fixture
 def mock_merge():
     with patch("os.makedirs") as mock_makedirs, patch(
@@ -72,24 +66,20 @@ def test_clean_directory(mock_file_system):
     assert cleaned_path == os.path.join(root_path, subfolder_name)
 
 
-def test_get_python_files(mock_walk):
-    # Mock os.walk to simulate directory structure
-    mock_walk.return_value = [
-        ("root", ["subdir1", "subdir2"], ["file1.py", "file2.txt"]),
-        ("root/subdir1", [], ["file3.py"]),
-        ("root/subdir2", [], ["file4.py"]),
-    ]
-
-    path = "root"
+def test_get_python_files(tmp_path):
+    (tmp_path / "subdir1").mkdir()
+    (tmp_path / "subdir2").mkdir()
+    for rel in ("file1.py", "file2.txt", "subdir1/file3.py", "subdir2/file4.py"):
+        (tmp_path / rel).write_text("")
 
     # Call the method
-    python_files = FileUtils.get_python_files(path)
+    python_files = FileUtils.get_python_files(str(tmp_path))
 
     # Calculate the expected absolute paths dynamically
     expected_files = [
-        os.path.abspath(os.path.join("root", "file1.py")),
-        os.path.abspath(os.path.join("root/subdir1", "file3.py")),
-        os.path.abspath(os.path.join("root/subdir2", "file4.py")),
+        os.path.abspath(os.path.join(tmp_path, "file1.py")),
+        os.path.abspath(os.path.join(tmp_path, "subdir1", "file3.py")),
+        os.path.abspath(os.path.join(tmp_path, "subdir2", "file4.py")),
     ]
 
     # Assert that only Python files are returned with absolute paths
@@ -98,10 +88,61 @@ def test_get_python_files(mock_walk):
     assert expected_files[1] in python_files
     assert expected_files[2] in python_files
     assert (
-        os.path.abspath(os.path.join("root", "file2.txt")) not in python_files
+        os.path.abspath(os.path.join(tmp_path, "file2.txt")) not in python_files
     )  # Non-Python file
 
 
+def test_iter_python_files_is_lazy_and_skips_venv_and_lib(tmp_path):
+    for rel in ("a.py", "venv/v.py", "lib/l.py", "pkg/b.py", "pkg/notes.md"):
+        (tmp_path / rel).parent.mkdir(exist_ok=True)
+        (tmp_path / rel).write_text("")
+
+    files = FileUtils.iter_python_files(str(tmp_path))
+
+    # Files of a folder come before those of its subfolders, as with os.walk
+    assert next(files) == str(tmp_path / "a.py")
+    assert list(files) == [str(tmp_path / "pkg" / "b.py")]
+
+
+def test_get_python_files_matches_os_walk_order(tmp_path):
+    for rel in ("z.py", "a/x.py", "a/b/y.py", "a/b/skip.txt", "c/w.py", "top.py"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("")
+
+    expected = [
+        os.path.abspath(os.path.join(root, name))
+        for root, _, files in os.walk(tmp_path)
+        for name in files
+        if name.endswith(".py")
+    ]
+
+    assert FileUtils.get_python_files(str(tmp_path)) == expected
+
+
+def test_get_python_files_does_not_follow_symlinked_dirs(tmp_path):
+    target = tmp_path / "elsewhere"
+    target.mkdir()
+    (target / "outside.py").write_text("")
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "inside.py").write_text("")
+    try:
+        os.symlink(target, project / "linked", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+
+    assert FileUtils.get_python_files(str(project)) == [
+        str(project / "inside.py")
+    ]
+
+
+def test_get_python_files_single_file(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text("")
+
+    assert FileUtils.get_python_files(str(script)) == [str(script)]
+
+
 def test_merge_results(mock_merge):
     mock_makedirs, mock_walk, mock_read_csv, mock_to_csv = mock_merge
 
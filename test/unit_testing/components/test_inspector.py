@@ -167,3 +167,14 @@ def my_function():
     ]
     assert list(result.columns) == expected_columns
     assert len(result) > 0
+
+
+def test_inspect_populates_file_cache(tmp_path):
+    source_file = tmp_path / "module.py"
+    source_file.write_text("x = 1\n", encoding="utf-8")
+    file_cache = {}
+
+    inspector = Inspector(output_path=str(tmp_path), file_cache=file_cache)
+    inspector.inspect(str(source_file))
+
+    assert file_cache == {os.path.abspath(str(source_file)): "x = 1\n"}
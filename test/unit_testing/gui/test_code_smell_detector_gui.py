@@ -1,6 +1,6 @@
 import pytest
 import tkinter as tk
-from gui.code_smell_detector_gui import CodeSmellDetectorGUI
+from gui.code_smell_detector_gui import CodeSmellDetectorGUI, _count_projects
 
 
 @pytest.fixture
@@ -83,7 +83,7 @@ def test_run_analysis_with_resume(gui, mocker):
     # Arrange
     mock_project_analyzer = mocker.MagicMock()
     mocker.patch(
-        'gui.code_smell_detector_gui.ProjectAnalyzer',
+        'components.project_analyzer.ProjectAnalyzer',
         return_value=mock_project_analyzer
     )
     
@@ -123,3 +123,29 @@ def test_gui_layout(gui):
 
     for widget in widgets:
         assert widget.winfo_exists()
+
+
+def test_count_projects_skips_files_and_output_dir(tmp_path):
+    """
+    Test that only project folders are counted, excluding `output`.
+    """
+    (tmp_path / "project_a").mkdir()
+    (tmp_path / "project_b").mkdir()
+    (tmp_path / "output").mkdir()
+    (tmp_path / "notes.txt").write_text("x")
+
+    mtime = tmp_path.stat().st_mtime_ns
+    assert _count_projects(str(tmp_path), mtime) == 2
+
+
+def test_count_projects_is_cached_per_mtime(tmp_path, mocker):
+    """
+    Test that repeated runs on an unchanged folder do not rescan it.
+    """
+    (tmp_path / "project_a").mkdir()
+    mtime = tmp_path.stat().st_mtime_ns
+    assert _count_projects(str(tmp_path), mtime) == 1
+
+    spy = mocker.patch("os.scandir", side_effect=AssertionError("rescanned"))
+    assert _count_projects(str(tmp_path), mtime) == 1
+    spy.assert_not_called()
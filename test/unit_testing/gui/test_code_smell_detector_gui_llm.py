@@ -11,7 +11,8 @@ import tkinter as tk
 from unittest.mock import MagicMock, Mock, patch, call
 import pytest
 
-from gui.code_smell_detector_gui import CodeSmellDetectorGUI
+from gui.code_smell_detector_gui import CodeSmellDetectorGUI, _SourceCache
+from llm_detection.orchestrator import LLMOrchestrator
 from llm_detection.types import (
     LLMCatalog,
     LLMSmellDefinition,
@@ -84,12 +85,36 @@ def mock_catalog_service():
     return service
 
 
+def _patch_scandir(*filenames, root="/test"):
+    """Patch os.scandir so that root appears to contain only the given files."""
+    entries = []
+    for name in filenames:
+        entry = MagicMock()
+        entry.name = name
+        entry.path = os.path.join(root, name)
+        entry.is_dir.return_value = False
+        entry.is_file.return_value = True
+        entries.append(entry)
+    scandir = MagicMock()
+    scandir.return_value.__enter__.return_value = entries
+    return patch('os.scandir', scandir)
+
+
+def _detect_iter_yielding(findings, stats):
+    """Build a detect_iter side effect that consumes the targets and yields one batch."""
+    def detect_iter(targets, **kwargs):
+        detect_iter.targets = list(targets)
+        yield findings, stats
+    return detect_iter
+
+
 @pytest.fixture
 def gui(mock_catalog_service):
     """Create GUI instance with mocked dependencies."""
     with patch('gui.code_smell_detector_gui.LLMCatalogService', return_value=mock_catalog_service):
         root = tk.Tk()
         gui_instance = CodeSmellDetectorGUI(root)
+        root.update_idletasks()  # Run the deferred catalog load
         yield gui_instance
         try:
             root.destroy()
@@ -189,12 +214,26 @@ class TestUpdateProviderList:
     def test_update_provider_list_exception_handling(self, gui):
         """Branch: except Exception -> error printed"""
         # Arrange
-        gui.catalog = None  # Force exception
+        gui.catalog = MagicMock(providers=None)  # Force exception
         
         # Act & Assert (should not raise, only print)
         with patch('builtins.print') as mock_print:
             gui.update_provider_list()
             assert any('Error updating provider list' in str(call) for call in mock_print.call_args_list)
+    
+    def test_update_provider_list_catalog_not_loaded(self, gui):
+        """Branch: catalog is None -> early return, combobox untouched"""
+        # Arrange
+        gui.catalog = None
+        gui.provider_combo['values'] = ["Existing"]
+        
+        # Act
+        with patch('builtins.print') as mock_print:
+            gui.update_provider_list()
+        
+        # Assert
+        mock_print.assert_not_called()
+        assert list(gui.provider_combo['values']) == ["Existing"]
 
 
 class TestUpdateSmellList:
@@ -448,7 +487,7 @@ class TestRunAnalysisLLMExecution:
         # Arrange
         with patch.object(gui, '_run_llm_detection') as mock_llm:
             # Mock ProjectAnalyzer class to avoid file system checks
-            with patch('gui.code_smell_detector_gui.ProjectAnalyzer') as mock_analyzer_class:
+            with patch('components.project_analyzer.ProjectAnalyzer') as mock_analyzer_class:
                 mock_analyzer = MagicMock()
                 mock_analyzer.analyze_project.return_value = 5
                 mock_analyzer_class.return_value = mock_analyzer
@@ -471,7 +510,9 @@ class TestRunAnalysisLLMExecution:
                     "/test/input",
                     "/test/output",
                     "local-ollama",
-                    ["test_smell_1"]
+                    ["test_smell_1"],
+                    2,
+                    file_cache={},
                 )
 
 
@@ -482,14 +523,13 @@ class TestRunLLMDetection:
         """Branch: provider_def.kind == LOCAL -> LocalLLMProvider created"""
         # Arrange
         mock_provider = MagicMock()
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = ([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
-        
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider', return_value=mock_provider) as mock_local:
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator):
-                with patch('os.walk', return_value=[("/test", [], ["file.py"])]):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
+        
+        with patch('llm_detection.providers.LocalLLMProvider', return_value=mock_provider) as mock_local:
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with _patch_scandir("file.py"):
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         
                         # Act
                         gui._run_llm_detection(
@@ -507,14 +547,13 @@ class TestRunLLMDetection:
         """Branch: provider_def.kind == API -> ApiLLMProvider created"""
         # Arrange
         mock_provider = MagicMock()
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = ([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
-        
-        with patch('gui.code_smell_detector_gui.ApiLLMProvider', return_value=mock_provider) as mock_api:
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator):
-                with patch('os.walk', return_value=[("/test", [], ["file.py"])]):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
+        
+        with patch('llm_detection.providers.ApiLLMProvider', return_value=mock_provider) as mock_api:
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with _patch_scandir("file.py"):
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         
                         # Act
                         gui._run_llm_detection(
@@ -531,14 +570,13 @@ class TestRunLLMDetection:
     def test_run_llm_detection_single_file_input(self, gui, mock_catalog_service):
         """Branch: os.path.isfile(input_path) -> single file target"""
         # Arrange
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = ([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding([], MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1))
         
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator) as mock_orch_cls:
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
                 with patch('os.path.isfile', return_value=True):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         
                         # Act
                         gui._run_llm_detection(
@@ -549,26 +587,21 @@ class TestRunLLMDetection:
                         )
                         
                         # Assert
-                        orchestrator = mock_orch_cls.return_value
-                        call_args = orchestrator.detect.call_args[1]
-                        targets = call_args['targets']
+                        targets = mock_orchestrator.detect_iter.side_effect.targets
                         assert len(targets) == 1
                         assert targets[0].filename == "file.py"
     
     def test_run_llm_detection_directory_walk(self, gui, mock_catalog_service):
-        """Branch: else (directory) -> os.walk for multiple files"""
+        """Branch: else (directory) -> os.scandir walk for multiple files"""
         # Arrange
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = ([], MagicMock(targets_processed=2, smells_processed=1, prompts_sent=2))
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding([], MagicMock(targets_processed=2, smells_processed=1, prompts_sent=2))
         
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator) as mock_orch_cls:
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
                 with patch('os.path.isfile', return_value=False):
-                    with patch('os.walk', return_value=[
-                        ("/test", [], ["file1.py", "file2.py", "other.txt"])
-                    ]):
-                        with patch('builtins.open', create=True) as mock_open:
-                            mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+                    with _patch_scandir("file1.py", "file2.py", "other.txt"):
+                        with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                             
                             # Act
                             gui._run_llm_detection(
@@ -579,18 +612,45 @@ class TestRunLLMDetection:
                             )
                             
                             # Assert
-                            orchestrator = mock_orch_cls.return_value
-                            call_args = orchestrator.detect.call_args[1]
-                            targets = call_args['targets']
+                            targets = mock_orchestrator.detect_iter.side_effect.targets
                             assert len(targets) == 2  # Only .py files
     
+    def test_run_llm_detection_splits_oversized_files(self, gui, mock_catalog_service):
+        """Branch: file longer than LLM_MAX_TARGET_CHARS -> several windows, one file"""
+        # Arrange
+        code = "def a():\n    return 1\n\ndef b():\n    return 2\n"
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding([], MagicMock(prompts_sent=2))
+        
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with patch('os.path.isfile', return_value=False):
+                    with _patch_scandir("big.py"):
+                        with patch.object(CodeSmellDetectorGUI, '_read_source', return_value=code):
+                            with patch.object(CodeSmellDetectorGUI, 'LLM_MAX_TARGET_CHARS', 25):
+                                with patch('builtins.print') as mock_print:
+                                    
+                                    # Act
+                                    gui._run_llm_detection(
+                                        input_path="/test",
+                                        output_path="/output",
+                                        provider_id="local-ollama",
+                                        smell_ids=["test_smell_1"]
+                                    )
+                                    
+                                    # Assert
+                                    targets = mock_orchestrator.detect_iter.side_effect.targets
+                                    assert [t.first_line for t in targets] == [1, 4]
+                                    assert {t.filename for t in targets} == {"big.py"}
+                                    assert any('Files processed: 1' in str(call) for call in mock_print.call_args_list)
+    
     def test_run_llm_detection_no_python_files(self, gui, mock_catalog_service):
         """Branch: not targets -> early return with message"""
         # Arrange
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator'):
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator'):
                 with patch('os.path.isfile', return_value=False):
-                    with patch('os.walk', return_value=[("/test", [], ["file.txt"])]):
+                    with _patch_scandir("file.txt"):
                         
                         # Act & Assert
                         with patch('builtins.print') as mock_print:
@@ -615,17 +675,16 @@ class TestRunLLMDetection:
             )
         ]
         
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = (
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding(
             mock_findings,
             MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1)
         )
         
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator):
-                with patch('os.walk', return_value=[("/test", [], ["file.py"])]):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with _patch_scandir("file.py"):
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         with patch.object(gui, '_save_llm_findings') as mock_save:
                             
                             # Act
@@ -642,17 +701,16 @@ class TestRunLLMDetection:
     def test_run_llm_detection_no_findings(self, gui, mock_catalog_service):
         """Branch: else (no findings) -> message only"""
         # Arrange
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = (
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding(
             [],
             MagicMock(targets_processed=1, smells_processed=1, prompts_sent=1)
         )
         
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator):
-                with patch('os.walk', return_value=[("/test", [], ["file.py"])]):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with _patch_scandir("file.py"):
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         with patch.object(gui, '_save_llm_findings') as mock_save:
                             with patch('builtins.print') as mock_print:
                                 
@@ -671,7 +729,7 @@ class TestRunLLMDetection:
     def test_run_llm_detection_exception_handling(self, gui, mock_catalog_service):
         """Branch: except Exception -> error printed with traceback"""
         # Arrange
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider', side_effect=Exception("Provider error")):
+        with patch('llm_detection.providers.LocalLLMProvider', side_effect=Exception("Provider error")):
             with patch('builtins.print') as mock_print:
                 with patch('traceback.print_exc') as mock_traceback:
                     
@@ -694,8 +752,8 @@ class TestRunLLMDetection:
         no targets are created and appropriate message is shown.
         """
         # Arrange
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator'):
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator'):
                 with patch('os.path.isfile', return_value=True):
                     with patch('builtins.print') as mock_print:
                         
@@ -730,17 +788,16 @@ class TestRunLLMDetection:
             to_overview_row=MagicMock(return_value={"file": "test.py", "line": 20})
         )
         
-        mock_orchestrator = MagicMock()
-        mock_orchestrator.detect.return_value = (
+        mock_orchestrator = MagicMock(spec=LLMOrchestrator)
+        mock_orchestrator.detect_iter.side_effect = _detect_iter_yielding(
             [mock_finding1, mock_finding2],
             MagicMock(targets_processed=1, smells_processed=2, prompts_sent=2)
         )
         
-        with patch('gui.code_smell_detector_gui.LocalLLMProvider'):
-            with patch('gui.code_smell_detector_gui.LLMOrchestrator', return_value=mock_orchestrator):
-                with patch('os.walk', return_value=[("/test", [], ["file.py"])]):
-                    with patch('builtins.open', create=True) as mock_open:
-                        mock_open.return_value.__enter__.return_value.read.return_value = "print('test')"
+        with patch('llm_detection.providers.LocalLLMProvider'):
+            with patch('llm_detection.orchestrator.LLMOrchestrator', return_value=mock_orchestrator):
+                with _patch_scandir("file.py"):
+                    with patch.object(CodeSmellDetectorGUI, '_read_source', return_value="print('test')"):
                         with patch.object(gui, '_save_llm_findings') as mock_save:
                             with patch('builtins.print') as mock_print:
                                 
@@ -756,9 +813,154 @@ class TestRunLLMDetection:
                                 assert any('test.py: 2 code smell(s)' in str(call) for call in mock_print.call_args_list)
 
 
+class TestReadTarget:
+    """Test _read_target() - Branch coverage for the shared file cache."""
+    
+    def test_read_target_uses_and_evicts_cached_source(self, gui):
+        """Branch: source in file_cache -> no disk read, entry released"""
+        # Arrange
+        file_path = os.path.join("/test", "pkg", "mod.py")
+        file_cache = {os.path.abspath(file_path): "x = 1\n"}
+        
+        # Act
+        with patch.object(CodeSmellDetectorGUI, '_read_source') as mock_read:
+            target = gui._read_target(file_path, "/test", file_cache)
+        
+        # Assert
+        mock_read.assert_not_called()
+        assert target.code == "x = 1\n"
+        assert target.filename == os.path.join("pkg", "mod.py")
+        assert file_cache == {}
+    
+    def test_read_target_falls_back_to_disk(self, gui, tmp_path):
+        """Branch: source not cached -> file read"""
+        # Arrange
+        source_file = tmp_path / "other.py"
+        source_file.write_text("y = 'é'\n", encoding="utf-8")
+        
+        # Act
+        target = gui._read_target(str(source_file), str(tmp_path), {"/elsewhere.py": "z"})
+        
+        # Assert
+        assert target.code == "y = 'é'\n"
+        assert target.filename == "other.py"
+    
+    def test_read_source_decodes_large_files_from_mmap(self, tmp_path):
+        """Branch: size >= MMAP_MIN_SIZE -> decoded from a memory map"""
+        # Arrange
+        source_file = tmp_path / "big.py"
+        source_file.write_text("z = 'ü'\n" * 3, encoding="utf-8")
+        
+        # Act
+        with patch.object(CodeSmellDetectorGUI, 'MMAP_MIN_SIZE', 1):
+            with patch('mmap.mmap', wraps=__import__('mmap').mmap) as mock_mmap:
+                code = CodeSmellDetectorGUI._read_source(str(source_file))
+        
+        # Assert
+        mock_mmap.assert_called_once()
+        assert code == "z = 'ü'\n" * 3
+    
+    def test_read_source_normalizes_line_endings_like_text_mode(self, tmp_path):
+        """Branch: \r in source -> same text as the static analysis' text-mode read"""
+        # Arrange
+        source_file = tmp_path / "crlf.py"
+        source_file.write_bytes(b"a = 1\r\nb = 2\rc = 3\n")
+        
+        # Act
+        code = CodeSmellDetectorGUI._read_source(str(source_file))
+        
+        # Assert
+        with open(source_file, "r", encoding="utf-8") as f:
+            assert code == f.read() == "a = 1\nb = 2\nc = 3\n"
+
+
+class TestSourceCache:
+    """Test _SourceCache - file_cache bounded to a character budget."""
+    
+    def test_sources_over_budget_are_not_kept(self):
+        """Branch: budget exceeded -> entry dropped, read again later"""
+        cache = _SourceCache(max_chars=10)
+        cache["/a.py"] = "x = 1\n"
+        cache["/b.py"] = "y = 22\n"
+        
+        assert cache == {"/a.py": "x = 1\n"}
+    
+    def test_pop_and_clear_release_budget(self):
+        """Branch: popped/cleared entries free their share of the budget"""
+        cache = _SourceCache(max_chars=10)
+        cache["/a.py"] = "x = 1\n"
+        assert cache.pop("/a.py") == "x = 1\n"
+        assert cache.pop("/a.py") is None
+        
+        cache["/b.py"] = "y = 22\n"
+        cache.clear()
+        cache["/c.py"] = "z = 333\n"
+        assert cache == {"/c.py": "z = 333\n"}
+
+
+class TestSaveLLMFindings:
+    """Test _save_llm_findings() - CSV output written row by row."""
+    
+    def test_save_llm_findings_writes_header_and_rows(self, gui, tmp_path):
+        """Branch: findings present -> CSV with overview columns"""
+        # Arrange
+        from llm_detection.types import LLMSmellFinding
+        findings = [
+            LLMSmellFinding(
+                filename="a.py",
+                function_name=None,
+                smell_name="Smell",
+                line=3,
+                description='uses "x", y',
+            ),
+            LLMSmellFinding(
+                filename="b.py",
+                function_name="f",
+                smell_name="Smell",
+                line=7,
+                description="d",
+            ),
+        ]
+        
+        # Act
+        gui._save_llm_findings(findings, str(tmp_path / "out"))
+        
+        # Assert
+        import pandas as pd
+        df = pd.read_csv(tmp_path / "out" / "llm_detection_results.csv")
+        assert list(df.columns) == [
+            "filename", "function_name", "smell_name", "line", "description", "additional_info"
+        ]
+        assert df["filename"].tolist() == ["a.py", "b.py"]
+        assert df["description"].tolist() == ['uses "x", y', "d"]
+    
+    def test_save_llm_findings_no_findings_writes_nothing(self, gui, tmp_path):
+        """Branch: first is None -> no file created"""
+        # Act
+        gui._save_llm_findings([], str(tmp_path / "out"))
+        
+        # Assert
+        assert not (tmp_path / "out" / "llm_detection_results.csv").exists()
+
+
 class TestLoadLLMData:
     """Test load_llm_data() - Branch coverage for initialization."""
     
+    def test_load_llm_data_deferred_until_idle(self, mock_catalog_service):
+        """Branch: construction -> catalog load scheduled, not run inline"""
+        with patch('gui.code_smell_detector_gui.LLMCatalogService', return_value=mock_catalog_service):
+            root = tk.Tk()
+            try:
+                gui = CodeSmellDetectorGUI(root)
+                assert gui.catalog is None
+                mock_catalog_service.load.assert_not_called()
+                
+                root.update_idletasks()
+                
+                assert gui.catalog is not None
+            finally:
+                root.destroy()
+    
     def test_load_llm_data_success(self, gui):
         """Branch: Success path -> catalog loaded, lists updated"""
         # Arrange is done in fixture
@@ -779,6 +981,7 @@ class TestLoadLLMData:
                 
                 # Act
                 gui = CodeSmellDetectorGUI(root)
+                root.update_idletasks()
                 
                 # Assert
                 assert any('Could not load LLM catalog' in str(call) for call in mock_print.call_args_list)
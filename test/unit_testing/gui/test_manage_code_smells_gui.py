@@ -87,7 +87,7 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
     def test_load_smells_error_handling(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
         """Test error handling when loading smells fails."""
         error_service = MagicMock(spec=LLMCatalogService)
-        error_service.load.side_effect = Exception("Load error")
+        error_service.load.side_effect = OSError("Load error")
         
         gui = ManageCodeSmellsGUI(self.mock_root, error_service)
         
@@ -111,6 +111,7 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
         
         # Verify current smell was set
         self.assertEqual(gui._current_smell_id, "smell-1")
+        gui._desc_text.replace.assert_called_with("1.0", "end", "Description 1")
 
     @patch('gui.manage_code_smells_gui.messagebox')
     @patch('gui.manage_code_smells_gui.ttk')
@@ -150,12 +151,15 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
         
         # Mock catalog.get_smell to raise error
         self.mock_catalog.get_smell = MagicMock(side_effect=KeyError("Not found"))
+        fresh_catalog = LLMCatalog(schema_version=1, smells=[self.smell1], providers=[])
+        self.mock_catalog_service.load.return_value = fresh_catalog
         
         gui._smell_combo.get.return_value = "Test Smell 1"
         gui._on_smell_selected()
         
-        # Verify error was shown
+        # Verify error was shown and the catalog re-read for the next lookup
         mock_msgbox.showerror.assert_called()
+        self.assertIs(gui._catalog, fresh_catalog)
 
     @patch('gui.manage_code_smells_gui.AddSmellDialog')
     @patch('gui.manage_code_smells_gui.messagebox')
@@ -270,16 +274,19 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
     def test_remove_smell_error(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
         """Test error handling when removing smell fails."""
         mock_msgbox.askyesno.return_value = True
-        self.mock_catalog_service.remove_smell.side_effect = Exception("Delete error")
+        self.mock_catalog_service.remove_smell.side_effect = KeyError("Delete error")
         
         gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
         gui._current_smell_id = "smell-1"
         gui._name_var.get = MagicMock(return_value="Test Smell 1")
+        self.mock_catalog_service.load.reset_mock()
         
         gui._on_remove_smell()
         
-        # Verify error shown
+        # Verify error shown and the dropdown resynced with the saved catalog
         mock_msgbox.showerror.assert_called()
+        self.mock_catalog_service.load.assert_called_once()
+        self.assertEqual(gui._smell_values, ["Another Smell", "Test Smell 1"])
 
     @patch('gui.manage_code_smells_gui.messagebox')
     @patch('gui.manage_code_smells_gui.ttk')
@@ -338,8 +345,9 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
         gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
         gui._current_smell_id = "smell-1"
         
-        # Mock load to fail on second call
-        self.mock_catalog_service.load.side_effect = Exception("Load error")
+        # Mock lookup of the loaded catalog to fail
+        gui._catalog = MagicMock(spec=LLMCatalog)
+        gui._catalog.get_smell.side_effect = OSError("Load error")
         
         gui._desc_text.get = MagicMock(return_value="New description")
         
@@ -407,17 +415,40 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
     def test_save_changes_error(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
         """Test error handling when save fails."""
         mock_msgbox.askyesno.return_value = True
-        self.mock_catalog_service.update_smell_description.side_effect = Exception("Save error")
+        self.mock_catalog_service.update_smell_description.side_effect = OSError("Save error")
         
         gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
         gui._current_smell_id = "smell-1"
+        saved_catalog = LLMCatalog(schema_version=1, smells=[self.smell1], providers=[])
+        self.mock_catalog_service.load.return_value = saved_catalog
         
         gui._desc_text.get = MagicMock(return_value="New description")
+        gui._desc_text.replace = MagicMock()
         
         gui._on_save_changes()
         
         # Verify error shown
         self.assertTrue(len(mock_msgbox.showerror.call_args_list) > 0)
+        # The cached catalog is re-read, the text being edited is left alone
+        self.assertIs(gui._catalog, saved_catalog)
+        gui._desc_text.replace.assert_not_called()
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_selection_and_save_reuse_loaded_catalog(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test selecting and diffing a smell do not reload the catalog."""
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+        self.mock_catalog_service.load.reset_mock()
+
+        gui._smell_combo.get.return_value = "Test Smell 1"
+        gui._on_smell_selected()
+        gui._desc_text.get = MagicMock(return_value="Description 1")
+        gui._on_save_changes()
+
+        self.mock_catalog_service.load.assert_not_called()
+        mock_msgbox.showinfo.assert_called_once()
 
     @patch('gui.manage_code_smells_gui.messagebox')
     @patch('gui.manage_code_smells_gui.ttk')
@@ -453,6 +484,126 @@ class TestManageCodeSmellsGUI(unittest.TestCase):
         # Verify defaults to first smell
         self.assertTrue(gui._smell_combo.current.called)
 
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_add_callback_inserts_label_in_sorted_position(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that adding a smell inserts its label without a full rebuild."""
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+        self.mock_catalog.smells.append(LLMSmellDefinition(
+            smell_id="middle",
+            display_name="middle smell",
+            description="d",
+            default_prompt="",
+        ))
+
+        gui._on_smell_added_callback("middle")
+
+        self.assertEqual(gui._smell_values, ["Another Smell", "middle smell", "Test Smell 1"])
+        self.assertEqual(gui._smell_display_to_id["middle smell"], "middle")
+        gui._smell_combo.set.assert_called_with("middle smell")
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_add_callback_orders_labels_like_a_reload(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that the incremental insert and sorted_smells() agree (casefold)."""
+        self.smell2.display_name = "Ssb"
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+        self.mock_catalog.smells.append(LLMSmellDefinition(
+            smell_id="eszett",
+            display_name="\u00dfa",
+            description="d",
+            default_prompt="",
+        ))
+
+        gui._on_smell_added_callback("eszett")
+
+        self.assertEqual(
+            gui._smell_values,
+            [s.display_name for s in self.mock_catalog.sorted_smells()],
+        )
+        self.assertEqual(gui._smell_values[0], "\u00dfa")
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_remove_drops_label_without_reloading(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that removing a smell only drops its entry from the dropdown."""
+        mock_msgbox.askyesno.return_value = True
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+        gui._current_smell_id = "smell-1"
+        self.mock_catalog_service.load.reset_mock()
+
+        gui._on_remove_smell()
+
+        self.mock_catalog_service.load.assert_not_called()
+        self.assertEqual(gui._smell_values, ["Another Smell"])
+        self.assertNotIn("Test Smell 1", gui._smell_display_to_id)
+        self.assertEqual(gui._id_to_display, {"smell-2": "Another Smell"})
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_selection_events_are_debounced(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that a burst of selection events schedules a single update."""
+        self.mock_root.after.side_effect = ["after#1", "after#2"]
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+
+        gui._schedule_smell_selected()
+        gui._schedule_smell_selected()
+
+        self.mock_root.after_cancel.assert_called_once_with("after#1")
+        self.assertEqual(gui._pending_select_id, "after#2")
+
+        gui._smell_combo.get.return_value = "Another Smell"
+        callback = self.mock_root.after.call_args[0][1]
+        callback()
+
+        self.assertIsNone(gui._pending_select_id)
+        self.assertEqual(gui._current_smell_id, "smell-2")
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_unexpected_errors_are_not_masked(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that only catalog errors are turned into error dialogs."""
+        broken_service = MagicMock(spec=LLMCatalogService)
+        broken_service.load.side_effect = TypeError("bug")
+
+        with self.assertRaises(TypeError):
+            ManageCodeSmellsGUI(self.mock_root, broken_service)
+        mock_msgbox.showerror.assert_not_called()
+
+    @patch('gui.manage_code_smells_gui.messagebox')
+    @patch('gui.manage_code_smells_gui.ttk')
+    @patch('gui.manage_code_smells_gui.tk')
+    @patch('gui.manage_code_smells_gui.ScrolledText')
+    def test_save_changes_diffs_against_selection_snapshot(self, mock_st, mock_tk, mock_ttk, mock_msgbox):
+        """Test that saving diffs against the description shown on selection."""
+        mock_msgbox.askyesno.return_value = True
+        gui = ManageCodeSmellsGUI(self.mock_root, self.mock_catalog_service)
+        gui._smell_combo.get.return_value = "Test Smell 1"
+        gui._on_smell_selected()
+        gui._catalog = MagicMock(spec=LLMCatalog)  # must not be consulted
+        self.mock_catalog_service.load.reset_mock()
+
+        gui._desc_text.get = MagicMock(return_value="New description")
+        gui._on_save_changes()
+        gui._on_save_changes()  # unchanged since the save: nothing to write
+
+        self.mock_catalog_service.update_smell_description.assert_called_once_with(
+            "smell-1", "New description"
+        )
+        gui._catalog.get_smell.assert_not_called()
+        self.mock_catalog_service.load.assert_not_called()
+        self.assertEqual(gui._loaded_desc, ("smell-1", "New description"))
+
 
 class TestAddSmellDialog(unittest.TestCase):
     """Test suite for AddSmellDialog class using direct method testing."""
@@ -517,6 +668,18 @@ class TestAddSmellDialog(unittest.TestCase):
         # Verify at least 2 buttons created (Save and Cancel)
         self.assertGreaterEqual(mock_button.call_count, 2, "At least 2 buttons should be created")
 
+    def test_centered_geometry_uses_fixed_dialog_size(self):
+        """Test the dialog is centered on the parent without measuring itself."""
+        parent = MagicMock()
+        parent.winfo_x.return_value = 100
+        parent.winfo_y.return_value = 50
+        parent.winfo_width.return_value = 800
+        parent.winfo_height.return_value = 600
+
+        geometry = AddSmellDialog._centered_geometry(parent, 400, 300)
+
+        self.assertEqual(geometry, "400x300+300+200")
+
     @patch('gui.manage_code_smells_gui.messagebox')
     def test_save_missing_name(self, mock_msgbox):
         """Test save with missing name shows warning."""
@@ -619,7 +782,7 @@ class TestAddSmellDialog(unittest.TestCase):
     def test_save_generic_error(self, mock_msgbox):
         """Test save with generic error."""
         dialog = self._create_dialog_instance()
-        dialog.catalog_service.add_smell.side_effect = Exception("Generic error")
+        dialog.catalog_service.add_smell.side_effect = OSError("Generic error")
         
         dialog.name_entry.get.return_value = "New Smell"
         dialog.desc_text.get.return_value = "Description"
@@ -0,0 +1,124 @@
+import threading
+import tkinter as tk
+from unittest.mock import MagicMock
+
+from gui.textbox_redirect import TextBoxRedirect
+
+
+def test_write_only_queues_text():
+    """
+    write() must not touch the widget, so worker threads can print safely.
+    """
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox)
+
+    assert redirect.write("hello") == 5
+
+    textbox.insert.assert_not_called()
+    assert redirect.queue.qsize() == 1
+
+
+def test_drain_coalesces_queued_text_into_one_insert():
+    """
+    Test that drain() flushes all pending writes with a single insert.
+    """
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox)
+
+    workers = [
+        threading.Thread(target=redirect.write, args=(f"line {i}\n",))
+        for i in range(10)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    redirect.drain()
+
+    textbox.insert.assert_called_once()
+    inserted = textbox.insert.call_args[0][1]
+    assert sorted(inserted.splitlines()) == sorted(f"line {i}" for i in range(10))
+    textbox.see.assert_called_once_with(tk.END)
+    textbox.update_idletasks.assert_called_once()
+    assert redirect.queue.empty()
+
+
+def test_drain_with_empty_queue_does_nothing():
+    """
+    Test that idle ticks do not generate widget updates.
+    """
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox)
+
+    redirect.drain()
+
+    textbox.config.assert_not_called()
+    textbox.insert.assert_not_called()
+    textbox.see.assert_not_called()
+    textbox.update_idletasks.assert_not_called()
+
+
+def test_drain_respects_max_chunks():
+    """
+    Test that a single drain is bounded and leaves the rest for the next tick.
+    """
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox, max_chunks=2)
+    for text in ("a", "b", "c"):
+        redirect.write(text)
+
+    redirect.drain()
+    assert textbox.insert.call_args[0][1] == "ab"
+
+    redirect.drain()
+    assert textbox.insert.call_args[0][1] == "c"
+
+
+def test_drain_trims_old_lines_past_the_overflow_threshold():
+    """
+    Test that a capped redirect keeps only the last max_lines lines.
+    """
+    textbox = MagicMock()
+    # 13 lines of output plus the empty line after the final newline
+    textbox.index.return_value = "14.0"
+    redirect = TextBoxRedirect(textbox, max_lines=8, overflow_lines=12)
+
+    redirect.write("x\n")
+    redirect.drain()
+
+    textbox.index.assert_called_once_with("end-1c")
+    textbox.delete.assert_called_once_with("1.0", "6.0")
+
+    textbox.reset_mock()
+    textbox.index.return_value = "13.0"
+    redirect.write("y\n")
+    redirect.drain()
+    textbox.delete.assert_not_called()
+
+
+def test_drain_never_trims_without_max_lines():
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox)
+
+    redirect.write("x\n")
+    redirect.drain()
+
+    textbox.index.assert_not_called()
+    textbox.delete.assert_not_called()
+
+
+def test_drain_inserts_only_the_tail_of_a_batch_that_fills_max_lines():
+    """
+    Test that lines a large batch would trim straight away are never inserted.
+    """
+    textbox = MagicMock()
+    redirect = TextBoxRedirect(textbox, max_lines=3, overflow_lines=5)
+    for i in range(10):
+        redirect.write(f"line {i}\n")
+
+    redirect.drain()
+
+    textbox.delete.assert_called_once_with("1.0", tk.END)
+    textbox.insert.assert_called_once_with(tk.END, "line 7\nline 8\nline 9\n")
+    textbox.index.assert_not_called()
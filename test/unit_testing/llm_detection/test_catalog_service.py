@@ -3,7 +3,9 @@ from dataclasses import replace
 
 import pytest
 
+from utils.file_utils import FileUtils
 from llm_detection.catalog_service import CatalogValidationError, LLMCatalogService
+from llm_detection.catalog_store import LLMCatalogStore
 from llm_detection.types import (
     DetectionTarget,
     LLMCatalog,
@@ -107,6 +109,36 @@ def test_prompt_engineering_save_draft_and_promote(base_catalog):
     assert smell.enabled is True
 
 
+def test_failed_save_leaves_no_unsaved_edit_in_memory(base_catalog):
+    store = InMemoryStore(base_catalog)
+    svc = LLMCatalogService(store=store)
+    smell_id = svc.add_smell("A", "desc")
+    svc.save_draft_prompt(smell_id, "draft")
+
+    def failing_save(catalog):
+        raise OSError("disk full")
+
+    store.save = failing_save
+    with pytest.raises(OSError):
+        svc.update_smell_description(smell_id, "new")
+    with pytest.raises(OSError):
+        svc.save_draft_prompt(smell_id, "other draft")
+    with pytest.raises(OSError):
+        svc.promote_draft_to_default(smell_id)
+    with pytest.raises(OSError):
+        svc.remove_smell(smell_id)
+    with pytest.raises(OSError):
+        svc.add_smell("B", "desc")
+
+    catalog = svc.load()
+    assert [s.smell_id for s in catalog.smells] == [smell_id]
+    smell = catalog.get_smell(smell_id)
+    assert smell.description == "desc"
+    assert smell.draft_prompt == "draft"
+    assert smell.default_prompt == ""
+    assert smell.enabled is False
+
+
 def test_get_prompt_delegates_to_smell(base_catalog):
     smell = LLMSmellDefinition(
         smell_id="s1",
@@ -168,6 +200,31 @@ def test_build_targets_from_input_path_reads_python_files(tmp_path):
     assert "print('hi')" in targets[0].code
 
 
+def test_build_targets_from_input_path_keeps_file_order(tmp_path):
+    project = tmp_path / "proj"
+    project.mkdir()
+    for i in range(5):
+        (project / f"m{i}.py").write_text(f"x = {i}\n", encoding="utf-8")
+
+    targets = LLMCatalogService.build_targets_from_input_path(str(project))
+    filenames = FileUtils.get_python_files(str(project))
+    assert [t.filename for t in targets] == filenames
+    assert [t.code for t in targets] == [
+        open(f, encoding="utf-8").read() for f in filenames
+    ]
+
+
+def test_build_targets_from_input_path_sees_files_added_in_subfolders(tmp_path):
+    project = tmp_path / "proj"
+    (project / "pkg").mkdir(parents=True)
+    (project / "a.py").write_text("x = 1\n", encoding="utf-8")
+    assert len(LLMCatalogService.build_targets_from_input_path(str(project))) == 1
+
+    (project / "pkg" / "b.py").write_text("x = 2\n", encoding="utf-8")
+    targets = LLMCatalogService.build_targets_from_input_path(str(project))
+    assert len(targets) == 2
+
+
 def test_build_targets_from_input_path_raises_if_no_py(tmp_path):
     d = tmp_path / "empty"
     d.mkdir()
@@ -207,6 +264,25 @@ def test_validate_prompt_engineering_input_path_allows_single_project_dir(tmp_pa
     LLMCatalogService.validate_prompt_engineering_input_path(str(root))
 
 
+def test_validate_prompt_engineering_input_path_looks_into_nested_and_skipped_dirs(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "p1" / "src" / "pkg").mkdir(parents=True)
+    (root / "p1" / "src" / "pkg" / "a.py").write_text("x=1\n", encoding="utf-8")
+    LLMCatalogService.validate_prompt_engineering_input_path(str(root))
+
+    (root / "p2" / "deep").mkdir(parents=True)
+    (root / "p2" / "deep" / "b.py").write_text("x=2\n", encoding="utf-8")
+    with pytest.raises(CatalogValidationError, match="multiple projects"):
+        LLMCatalogService.validate_prompt_engineering_input_path(str(root))
+
+    # .py files under venv alone do not make the folder valid
+    only_venv = tmp_path / "only_venv"
+    (only_venv / "venv").mkdir(parents=True)
+    (only_venv / "venv" / "site.py").write_text("x=1\n", encoding="utf-8")
+    with pytest.raises(CatalogValidationError, match="at least one .py"):
+        LLMCatalogService.validate_prompt_engineering_input_path(str(only_venv))
+
+
 def test_validate_prompt_engineering_input_path_validates_missing_or_invalid(tmp_path):
     with pytest.raises(CatalogValidationError):
         LLMCatalogService.validate_prompt_engineering_input_path("")
@@ -218,3 +294,40 @@ def test_validate_prompt_engineering_input_path_validates_missing_or_invalid(tmp
     d.mkdir()
     with pytest.raises(CatalogValidationError):
         LLMCatalogService.validate_prompt_engineering_input_path(str(d))
+
+    f = tmp_path / "file.py"
+    f.write_text("x=1\n", encoding="utf-8")
+    with pytest.raises(CatalogValidationError, match="must be a directory"):
+        LLMCatalogService.validate_prompt_engineering_input_path(str(f))
+
+
+def test_load_reuses_parsed_catalog_until_file_changes(tmp_path, mocker):
+    store = LLMCatalogStore(file_path=str(tmp_path / "catalog.json"))
+    svc = LLMCatalogService(store=store)
+    svc.load()  # creates the file
+    first = svc.load()
+
+    spy = mocker.spy(store, "load")
+    assert svc.load() is first
+    spy.assert_not_called()
+
+    other = LLMCatalogService(store=LLMCatalogStore(file_path=store.file_path))
+    other.add_smell("External", "desc")
+
+    reloaded = svc.load()
+    spy.assert_called_once()
+    assert [s.display_name for s in reloaded.smells] == ["External"]
+
+
+def test_save_refreshes_cache_without_rereading(tmp_path, mocker):
+    store = LLMCatalogStore(file_path=str(tmp_path / "catalog.json"))
+    svc = LLMCatalogService(store=store)
+    smell_id = svc.add_smell("A", "desc")
+
+    spy = mocker.spy(store, "load")
+    assert svc.load().get_smell(smell_id).description == "desc"
+    spy.assert_not_called()
+
+    svc.invalidate()
+    assert svc.load().get_smell(smell_id).description == "desc"
+    spy.assert_called_once()
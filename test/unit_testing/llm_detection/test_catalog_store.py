@@ -1,5 +1,6 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -156,3 +157,132 @@ def test_catalog_store_save_does_not_rewrite_kind_if_already_serializable(tmp_pa
 
     data = json.loads(path.read_text(encoding="utf-8"))
     assert data["providers"][0]["kind"] == "local"
+
+
+def test_catalog_store_save_overwrites_without_leaving_temp_files(tmp_path):
+    path = tmp_path / "llm_catalog.json"
+    store = LLMCatalogStore(file_path=str(path))
+
+    store.save(LLMCatalog(schema_version=1))
+    store.save(LLMCatalog(schema_version=2))
+
+    assert json.loads(path.read_text(encoding="utf-8"))["schema_version"] == 2
+    assert os.listdir(tmp_path) == ["llm_catalog.json"]
+
+
+def test_catalog_store_first_save_goes_through_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "llm_catalog.json"
+    store = LLMCatalogStore(file_path=str(path))
+
+    def failing_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        store.save(LLMCatalog(schema_version=1))
+
+    # No half-written catalog, and the temp file is cleaned up
+    assert os.listdir(tmp_path) == []
+
+
+def test_catalog_store_concurrent_saves_leave_a_complete_file(tmp_path):
+    path = tmp_path / "llm_catalog.json"
+    smells = [
+        LLMSmellDefinition(
+            smell_id=f"s{i}", display_name=f"S{i}", description="d" * 500, default_prompt="p"
+        )
+        for i in range(200)
+    ]
+    catalogs = [LLMCatalog(schema_version=v, smells=smells[: 10 * v]) for v in range(1, 9)]
+
+    def save(catalog):
+        LLMCatalogStore(file_path=str(path)).save(catalog)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, catalogs))
+
+    loaded = LLMCatalogStore(file_path=str(path)).load()
+    assert len(loaded.smells) == 10 * loaded.schema_version
+    assert os.listdir(tmp_path) == ["llm_catalog.json"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_catalog_store_roundtrip_with_and_without_orjson(tmp_path, monkeypatch, use_orjson):
+    import llm_detection.catalog_store as catalog_store
+
+    if not use_orjson:
+        monkeypatch.setattr(catalog_store, "orjson", None)
+    elif catalog_store.orjson is None:
+        pytest.skip("orjson not installed")
+
+    store = LLMCatalogStore(file_path=str(tmp_path / "llm_catalog.json"))
+    catalog = LLMCatalog(
+        schema_version=1,
+        smells=[LLMSmellDefinition("s1", "Città", "d", "p")],
+        providers=[LLMProviderDefinition("p1", ProviderKind.API, "Api", {"k": 1})],
+    )
+    store.save(catalog)
+
+    assert "Città" in (tmp_path / "llm_catalog.json").read_text(encoding="utf-8")
+    loaded = store.load()
+    assert loaded.smells[0].display_name == "Città"
+    assert loaded.providers[0].kind == ProviderKind.API
+    assert loaded.providers[0].config == {"k": 1}
+
+
+def test_catalog_store_load_rejects_unknown_provider_kind(tmp_path):
+    path = tmp_path / "llm_catalog.json"
+    path.write_text(
+        json.dumps({"providers": [{"provider_id": "p1", "kind": "remote"}]}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError):
+        LLMCatalogStore(file_path=str(path)).load()
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_catalog_store_save_compact_by_default(tmp_path, pretty):
+    path = tmp_path / "llm_catalog.json"
+    store = LLMCatalogStore(file_path=str(path))
+
+    store.save(LLMCatalog(schema_version=1), pretty=pretty)
+
+    text = path.read_text(encoding="utf-8")
+    assert ("\n" in text) is pretty
+    assert store.load().schema_version == 1
+
+
+def test_catalog_store_read_bytes_handles_short_reads(tmp_path, monkeypatch):
+    path = tmp_path / "blob.json"
+    path.write_bytes(b"0123456789")
+
+    real_read = os.read
+    monkeypatch.setattr(os, "read", lambda fd, n: real_read(fd, min(n, 3)))
+
+    assert LLMCatalogStore._read_bytes(str(path)) == b"0123456789"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_catalog_store_save_matches_asdict_layout(tmp_path, monkeypatch, use_orjson):
+    from dataclasses import asdict
+
+    import llm_detection.catalog_store as catalog_store
+
+    if not use_orjson:
+        monkeypatch.setattr(catalog_store, "orjson", None)
+    elif catalog_store.orjson is None:
+        pytest.skip("orjson not installed")
+
+    catalog = LLMCatalog(
+        schema_version=3,
+        smells=[LLMSmellDefinition("s1", "S1", "d", "p", draft_prompt="x", enabled=True)],
+        providers=[LLMProviderDefinition("p1", ProviderKind.LOCAL, "Local", {"m": "x"})],
+    )
+    catalog.get_smell("s1")  # builds the (non-persisted) index
+    path = tmp_path / "llm_catalog.json"
+    LLMCatalogStore(file_path=str(path)).save(catalog)
+
+    expected = asdict(catalog)
+    expected["providers"][0]["kind"] = "local"
+    assert json.loads(path.read_text(encoding="utf-8")) == expected
@@ -1,5 +1,6 @@
 import pytest
 
+import llm_detection.orchestrator as orchestrator_module
 from llm_detection.orchestrator import LLMOrchestrator
 from llm_detection.providers import MockLLMProvider
 from llm_detection.types import (
@@ -100,7 +101,8 @@ def test_normalize_response_strict_accepts_only_findings_array(catalog_with_smel
     assert out[0].line == 2
     assert out[0].smell_name == "Ready"
     assert out[0].confidence == 0.9
-    assert out[0].raw_response == raw
+    # raw text is only kept on diagnostic rows
+    assert out[0].raw_response is None
 
     # Wrong schema => empty
     out2 = orch._normalize_response(
@@ -158,7 +160,7 @@ def test_normalize_response_salvage_recovers_from_fallback_key(catalog_with_smel
     assert out[0].line == 3
     assert "Recovered from non-standard" in out[0].description
     assert out[0].additional_info == "x=1"
-    assert out[0].raw_response == raw
+    assert out[0].raw_response is None
 
 
 def test_normalize_response_salvage_recovers_single_object_under_key(catalog_with_smells):
@@ -269,6 +271,36 @@ def test_detect_for_prompt_engineering_with_raw_returns_mapping_per_file():
     assert any(f.filename == "a.py" and f.line == 1 for f in findings)
 
 
+def test_detect_for_prompt_engineering_uses_draft_prompt_override():
+    smell = LLMSmellDefinition(
+        smell_id="s1",
+        display_name="S1",
+        description="desc",
+        default_prompt="Prompt",
+        draft_prompt="Saved draft",
+        enabled=False,
+    )
+    catalog = LLMCatalog(schema_version=1, smells=[smell], providers=[])
+    prompts: list[str] = []
+
+    def factory(prompt: str) -> str:
+        prompts.append(prompt)
+        return '{"findings": []}'
+
+    orch = LLMOrchestrator(provider=MockLLMProvider(response_factory=factory), catalog=catalog)
+
+    _findings, stats, _raw = orch.detect_for_prompt_engineering_with_raw(
+        targets=[DetectionTarget(filename="a.py", code="x=1\n")],
+        smell_id="s1",
+        prompt_mode=PromptMode.DRAFT,
+        draft_prompt_override="Unsaved draft",
+    )
+
+    assert stats.prompts_sent == 1
+    assert prompts[0].startswith("Unsaved draft\n\n")
+    assert catalog.get_smell("s1").draft_prompt == "Saved draft"
+
+
 def test_try_parse_json_payload_extracts_first_json_array(catalog_with_smells):
     provider = MockLLMProvider(fixed_response="")
     orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
@@ -358,3 +390,384 @@ def test_normalize_response_salvage_skips_non_dict_and_invalid_lines(catalog_wit
     assert len(out) == 1
     assert out[0].line == 3
     assert out[0].description == "ok"
+
+
+def test_detect_async_matches_detect_order_and_stats(catalog_with_smells):
+    import asyncio
+
+    provider = MockLLMProvider(
+        response_factory=lambda prompt: (
+            '{"findings": [{"line": 1, "description": "'
+            + ("a" if "FILENAME: a.py" in prompt else "b")
+            + '"}]}'
+        )
+    )
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    targets = [
+        DetectionTarget(filename="a.py", code="x=1\n"),
+        DetectionTarget(filename="b.py", code="y=2\n"),
+    ]
+
+    findings, stats = asyncio.run(
+        orch.detect_async(
+            targets=targets,
+            smell_ids=["s_ready", "s_not"],
+            prompt_mode=PromptMode.DEFAULT,
+            concurrency=2,
+        )
+    )
+    assert [f.filename for f in findings] == ["a.py", "b.py"]
+    assert [f.description for f in findings] == ["a", "b"]
+    assert stats.prompts_sent == 2
+    assert stats.targets_processed == 2
+    assert stats.smells_processed == 2
+
+
+def test_detect_iter_pulls_targets_lazily_in_batches(catalog_with_smells):
+    provider = MockLLMProvider(fixed_response='{"findings": [{"line": 1, "description": "d"}]}')
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    pulled = []
+
+    def targets():
+        for name in ["a.py", "b.py", "c.py"]:
+            pulled.append(name)
+            yield DetectionTarget(filename=name, code="x=1\n")
+
+    batches = orch.detect_iter(
+        targets(),
+        smell_ids=["s_ready"],
+        prompt_mode=PromptMode.DEFAULT,
+        batch_size=2,
+    )
+
+    findings, stats = next(batches)
+    assert pulled == ["a.py", "b.py"]
+    assert [f.filename for f in findings] == ["a.py", "b.py"]
+    assert stats.targets_processed == 2
+
+    findings, stats = next(batches)
+    assert [f.filename for f in findings] == ["c.py"]
+    assert stats.prompts_sent == 1
+    assert next(batches, None) is None
+
+
+def test_detect_with_max_workers_uses_threads_and_keeps_order(catalog_with_smells):
+    import threading
+    import time
+
+    thread_names = set()
+
+    def respond(prompt):
+        thread_names.add(threading.current_thread().name)
+        # Later files answer first, to check that order is preserved
+        time.sleep(0.02 if "FILENAME: a.py" in prompt else 0.0)
+        name = "a" if "FILENAME: a.py" in prompt else "b"
+        return '{"findings": [{"line": 1, "description": "' + name + '"}]}'
+
+    orch = LLMOrchestrator(provider=MockLLMProvider(response_factory=respond), catalog=catalog_with_smells)
+    targets = [
+        DetectionTarget(filename="a.py", code="x=1\n"),
+        DetectionTarget(filename="b.py", code="y=2\n"),
+    ]
+
+    findings, stats = orch.detect(
+        targets=targets,
+        smell_ids=["s_ready", "s_not"],
+        prompt_mode=PromptMode.DEFAULT,
+        max_workers=2,
+    )
+    assert [f.description for f in findings] == ["a", "b"]
+    assert stats.prompts_sent == 2
+    assert threading.current_thread().name not in thread_names
+
+
+def test_detect_iter_reuses_one_event_loop_across_batches(catalog_with_smells):
+    import asyncio
+
+    class LoopRecordingProvider(MockLLMProvider):
+        async def agenerate(self, prompt):
+            loops.append(asyncio.get_running_loop())
+            return '{"findings": []}'
+
+    loops = []
+    orch = LLMOrchestrator(provider=LoopRecordingProvider(), catalog=catalog_with_smells)
+    targets = [DetectionTarget(filename=f"{i}.py", code="x=1\n") for i in range(5)]
+
+    batches = list(
+        orch.detect_iter(targets, smell_ids=["s_ready"], prompt_mode=PromptMode.DEFAULT, batch_size=2)
+    )
+    assert len(batches) == 3
+    assert len(loops) == 5
+    assert all(loop is loops[0] for loop in loops)
+    assert loops[0].is_closed()
+
+
+def test_build_prompt_numbers_chunk_lines_from_first_line(catalog_with_smells):
+    provider = MockLLMProvider(fixed_response='{ "findings": [] }')
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    target = DetectionTarget(filename="f.py", code="def g():\n    pass\n", first_line=40)
+
+    prompt = orch.build_prompt("s_ready", target, PromptMode.DEFAULT)
+    assert "40: def g():" in prompt
+    assert "41:     pass" in prompt
+
+
+def test_detect_for_prompt_engineering_with_max_workers_keeps_file_order():
+    import threading
+    import time
+
+    smell = LLMSmellDefinition(
+        smell_id="s1",
+        display_name="S1",
+        description="desc",
+        default_prompt="Prompt",
+    )
+    catalog = LLMCatalog(schema_version=1, smells=[smell], providers=[])
+    thread_names = set()
+
+    def factory(prompt: str) -> str:
+        thread_names.add(threading.current_thread().name)
+        name = "a" if "FILENAME: a.py" in prompt else "b"
+        time.sleep(0.02 if name == "a" else 0.0)
+        return '{"findings": [{"line": 1, "description": "' + name + '"}]}'
+
+    orch = LLMOrchestrator(provider=MockLLMProvider(response_factory=factory), catalog=catalog)
+    targets = [
+        DetectionTarget(filename="a.py", code="x=1\n"),
+        DetectionTarget(filename="b.py", code="x=2\n"),
+    ]
+
+    findings, stats, raw_by_filename = orch.detect_for_prompt_engineering_with_raw(
+        targets=targets,
+        smell_id="s1",
+        prompt_mode=PromptMode.DEFAULT,
+        max_workers=2,
+    )
+
+    assert [f.description for f in findings] == ["a", "b"]
+    assert list(raw_by_filename) == ["a.py", "b.py"]
+    assert stats.prompts_sent == 2
+    assert threading.current_thread().name not in thread_names
+
+
+def test_detect_for_prompt_engineering_stops_sending_once_cancelled():
+    smell = LLMSmellDefinition(
+        smell_id="s1",
+        display_name="S1",
+        description="desc",
+        default_prompt="Prompt",
+    )
+    catalog = LLMCatalog(schema_version=1, smells=[smell], providers=[])
+    sent = []
+
+    def factory(prompt: str) -> str:
+        sent.append(prompt)
+        return '{"findings": [{"line": 1, "description": "d"}]}'
+
+    orch = LLMOrchestrator(provider=MockLLMProvider(response_factory=factory), catalog=catalog)
+    targets = [DetectionTarget(filename=f"{name}.py", code="x=1\n") for name in "abc"]
+
+    findings, stats, raw_by_filename = orch.detect_for_prompt_engineering_with_raw(
+        targets=targets,
+        smell_id="s1",
+        prompt_mode=PromptMode.DEFAULT,
+        cancel_check=lambda: len(sent) >= 2,
+    )
+
+    assert len(sent) == 2
+    assert list(raw_by_filename) == ["a.py", "b.py"]
+    assert [f.filename for f in findings] == ["a.py", "b.py"]
+    assert (stats.prompts_sent, stats.targets_processed) == (2, 2)
+
+
+def test_detect_sends_all_prompts_through_generate_batch(catalog_with_smells):
+    batches = []
+
+    class BatchRecordingProvider(MockLLMProvider):
+        def generate_batch(self, prompts):
+            batches.append(list(prompts))
+            return super().generate_batch(prompts)
+
+    orch = LLMOrchestrator(
+        provider=BatchRecordingProvider(fixed_response='{"findings": []}'),
+        catalog=catalog_with_smells,
+    )
+    targets = [DetectionTarget(filename=f"{i}.py", code="x=1\n") for i in range(3)]
+
+    orch.detect(targets=targets, smell_ids=["s_ready"], prompt_mode=PromptMode.DEFAULT)
+
+    assert len(batches) == 1
+    assert [p.count("FILENAME: ") for p in batches[0]] == [1, 1, 1]
+
+
+def test_build_prompt_layout_is_prompt_contract_then_code(catalog_with_smells):
+    provider = MockLLMProvider(fixed_response='{ "findings": [] }')
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    target = DetectionTarget(filename="f.py", code="x = 1\n")
+
+    prompt = orch.build_prompt("s_ready", target, PromptMode.DEFAULT)
+    assert prompt.startswith("Detect stuff.\n\nYou are a code smell detector.\n")
+    assert prompt.endswith("\n\nFILENAME: f.py\nCODE (numbered):\n1: x = 1\n")
+    assert prompt.count("CODE (numbered):") == 1
+
+
+def test_detect_numbers_each_target_once_and_matches_build_prompt(mocker):
+    smells = [
+        LLMSmellDefinition(
+            smell_id=f"s{i}",
+            display_name=f"S{i}",
+            description="d",
+            default_prompt=f"Detect {i}.",
+            draft_prompt=None,
+            enabled=True,
+        )
+        for i in range(3)
+    ]
+    cat = LLMCatalog(schema_version=1, smells=smells, providers=[])
+    provider = MockLLMProvider(fixed_response='{ "findings": [] }')
+    orch = LLMOrchestrator(provider=provider, catalog=cat)
+    targets = [DetectionTarget(filename="a.py", code="x = 1\n"), DetectionTarget(filename="b.py", code="y = 2\n")]
+    expected = [orch.build_prompt(s.smell_id, t, PromptMode.DEFAULT) for t in targets for s in smells]
+
+    spy = mocker.spy(LLMOrchestrator, "_code_with_line_numbers")
+    jobs = orch._build_jobs(targets, [s.smell_id for s in smells], PromptMode.DEFAULT)
+
+    assert [prompt for _, _, prompt in jobs] == expected
+    assert spy.call_count == len(targets)
+
+
+def test_try_parse_json_payload_falls_back_to_array_after_invalid_object(catalog_with_smells):
+    provider = MockLLMProvider(fixed_response="")
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+
+    assert orch._try_parse_json_payload("see {oops} then [1, 2] and {\"a\": 1") == [1, 2]
+    assert orch._try_parse_json_payload("{\"a\": [1, 2}") is None
+
+
+def test_normalize_response_json_mode_provider_parses_directly(catalog_with_smells, mocker):
+    provider = MockLLMProvider(fixed_response="")
+    mocker.patch.object(MockLLMProvider, "returns_json", new_callable=mocker.PropertyMock, return_value=True)
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    scan = mocker.spy(LLMOrchestrator, "_try_parse_json_payload")
+
+    raw = '{"findings": [{"function_name": "f", "line": 3, "description": "d"}]}'
+    findings = orch._normalize_response(raw, "a.py", "s_ready", normalize_mode=NormalizationMode.STRICT)
+    assert [f.line for f in findings] == [3]
+    scan.assert_not_called()
+
+    # A stray fence still goes through the best-effort extraction
+    fenced = "```json\n" + raw + "\n```"
+    findings = orch._normalize_response(fenced, "a.py", "s_ready", normalize_mode=NormalizationMode.STRICT)
+    assert [f.line for f in findings] == [3]
+    scan.assert_called_once()
+
+
+def test_detect_resolves_each_smell_once_per_call(catalog_with_smells, mocker):
+    provider = MockLLMProvider(fixed_response='{ "findings": [] }')
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    targets = [DetectionTarget(filename=f"f{i}.py", code="x = 1\n") for i in range(5)]
+    lookup = mocker.spy(catalog_with_smells, "get_smell")
+
+    orch.detect(targets, ["s_ready"], PromptMode.DEFAULT)
+
+    # once while preparing the smell table, reused for normalizing responses
+    assert lookup.call_count == 1
+
+
+def test_try_parse_json_payload_prefers_fenced_block_after_prose(catalog_with_smells):
+    provider = MockLLMProvider(fixed_response="")
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+
+    raw = "Checked {every} function.\n```json\n{\"findings\": []}\n```\nDone."
+    assert orch._try_parse_json_payload(raw) == {"findings": []}
+
+
+def test_findings_to_dataframe_empty_keeps_columns():
+    df = LLMOrchestrator.findings_to_dataframe(iter([]))
+    assert list(df.columns) == [
+        "filename",
+        "function_name",
+        "smell_name",
+        "line",
+        "description",
+        "additional_info",
+    ]
+    assert len(df.index) == 0
+
+
+def test_idetect_yields_findings_as_responses_arrive(catalog_with_smells):
+    calls: list[str] = []
+
+    def respond(prompt: str) -> str:
+        calls.append(prompt)
+        return '{"findings": [{"function_name": "f", "line": 1, "description": "d"}]}'
+
+    provider = MockLLMProvider(response_factory=respond)
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    targets = [DetectionTarget(filename=f"f{i}.py", code="x = 1\n") for i in range(3)]
+
+    stream = orch.idetect(targets, ["s_ready", "s_not"], PromptMode.DEFAULT)
+    first = next(stream)
+    assert first.filename == "f0.py"
+    assert len(calls) == 1
+
+    rest = list(stream)
+    expected, _ = orch.detect(targets, ["s_ready", "s_not"], PromptMode.DEFAULT)
+    assert [first, *rest] == expected
+    assert list(orch.idetect(targets, ["s_ready"], PromptMode.DEFAULT, max_workers=3)) == expected
+
+
+def test_try_parse_json_payload_uses_module_json_loader(catalog_with_smells, mocker):
+    loader = mocker.patch.object(orchestrator_module, "_json_loads", return_value={"findings": []})
+    assert LLMOrchestrator._try_parse_json_payload('{"findings": []}') == {"findings": []}
+    loader.assert_called_once_with('{"findings": []}')
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "```json\n{\"a\": 1}\n```",
+        "```JSON\n{\"a\": 1}\n```",
+        "```\n{\"a\": 1}\n```",
+        "  ```json\r\n{\"a\": 1}\r\n```  ",
+        "```json\n{\"a\": 1}",
+    ],
+)
+def test_try_parse_json_payload_strips_leading_and_trailing_fences(raw):
+    assert LLMOrchestrator._try_parse_json_payload(raw) == {"a": 1}
+
+
+def test_identical_prompts_are_sent_once(catalog_with_smells):
+    calls: list[str] = []
+
+    def respond(prompt: str) -> str:
+        calls.append(prompt)
+        return '{"findings": [{"function_name": "f", "line": 1, "description": "d"}]}'
+
+    provider = MockLLMProvider(response_factory=respond)
+    orch = LLMOrchestrator(provider=provider, catalog=catalog_with_smells)
+    target = DetectionTarget(filename="a.py", code="x = 1\n")
+    other = DetectionTarget(filename="b.py", code="x = 1\n")
+
+    findings, stats = orch.detect([target, target, other], ["s_ready"], PromptMode.DEFAULT)
+    assert len(calls) == 2
+    assert [f.filename for f in findings] == ["a.py", "a.py", "b.py"]
+    assert stats.prompts_sent == 3
+
+    calls.clear()
+    import asyncio
+
+    findings, _ = asyncio.run(
+        orch.detect_async([target, target], ["s_ready"], PromptMode.DEFAULT)
+    )
+    assert len(calls) == 1
+    assert len(findings) == 2
+
+
+def test_try_parse_json_payload_leading_value_with_trailing_text(catalog_with_smells, mocker):
+    decode = mocker.spy(orchestrator_module._JSON_DECODER, "raw_decode")
+
+    assert LLMOrchestrator._try_parse_json_payload('{"findings": []}\nHope this helps!') == {"findings": []}
+    assert decode.call_count == 1
+    # same shape as the clean response '[{"line": 3}]' would give
+    assert LLMOrchestrator._try_parse_json_payload('[{"line": 3}] (1 finding)') == [{"line": 3}]
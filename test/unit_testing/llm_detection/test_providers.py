@@ -3,7 +3,12 @@ import types
 
 import pytest
 
-from llm_detection.providers import ApiLLMProvider, LocalLLMProvider, MockLLMProvider
+from llm_detection.providers import (
+    ApiLLMProvider,
+    CachedLLMProvider,
+    LocalLLMProvider,
+    MockLLMProvider,
+)
 
 
 def test_mock_provider_fixed_response():
@@ -235,3 +240,188 @@ def test_api_provider_falls_back_to_text_if_not_json(monkeypatch):
 
     p = ApiLLMProvider(base_url="http://example/")
     assert p.generate("p") == "plain"
+
+
+def test_mock_provider_agenerate_falls_back_to_generate():
+    import asyncio
+
+    p = MockLLMProvider(fixed_response="ok")
+    assert asyncio.run(p.agenerate("prompt")) == "ok"
+
+
+def test_api_provider_reuses_one_client_and_closes_it(monkeypatch):
+    import asyncio
+
+    class StubResp:
+        def __init__(self):
+            self.headers = {"content-type": "application/json"}
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"response": "hello"}
+
+    created = []
+
+    class StubClient:
+        def __init__(self, timeout):
+            self.timeout = timeout
+            self.closed = False
+            created.append(self)
+
+        def post(self, url, json):
+            assert not self.closed
+            return StubResp()
+
+        def close(self):
+            self.closed = True
+
+    stub_httpx = types.SimpleNamespace(Client=lambda timeout: StubClient(timeout=timeout))
+    monkeypatch.setitem(__import__("sys").modules, "httpx", stub_httpx)
+
+    with ApiLLMProvider(base_url="http://example", timeout_s=5.0) as p:
+        assert p.generate("a") == "hello"
+        assert asyncio.run(p.agenerate("b")) == "hello"
+
+    assert len(created) == 1
+    assert created[0].timeout == 5.0
+    assert created[0].closed
+
+
+def test_local_provider_reuses_host_client(monkeypatch):
+    created = []
+
+    class StubClient:
+        def __init__(self, host: str):
+            created.append(host)
+
+        def generate(self, **kwargs):
+            return {"response": "ok"}
+
+    stub = types.SimpleNamespace(Client=lambda host: StubClient(host=host))
+    monkeypatch.setitem(__import__("sys").modules, "ollama", stub)
+
+    p = LocalLLMProvider(model_name="m", host="http://my-ollama")
+    assert p.generate("a") == "ok"
+    assert p.generate("b") == "ok"
+    assert created == ["http://my-ollama"]
+
+
+def test_mock_provider_generate_batch_keeps_order():
+    p = MockLLMProvider(response_factory=lambda prompt: prompt.upper())
+    assert p.generate_batch(["a", "b"]) == ["A", "B"]
+
+
+def test_local_provider_generate_batch_sends_prompts_concurrently(monkeypatch):
+    import threading
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def stub_generate(**kwargs):
+        # Every prompt must be in flight at once for the barrier to open
+        barrier.wait()
+        return {"response": kwargs["prompt"] + "!"}
+
+    stub = types.SimpleNamespace(generate=stub_generate)
+    monkeypatch.setitem(__import__("sys").modules, "ollama", stub)
+
+    p = LocalLLMProvider(model_name="m", num_parallel=3)
+    assert p.generate_batch(["a", "b", "c"]) == ["a!", "b!", "c!"]
+
+
+def test_cached_provider_answers_repeated_prompts_from_memory():
+    calls = []
+
+    def respond(prompt):
+        calls.append(prompt)
+        return prompt + "!"
+
+    p = CachedLLMProvider(MockLLMProvider(response_factory=respond), max_size=2)
+    assert p.generate("a") == "a!"
+    assert p.generate("a") == "a!"
+    assert calls == ["a"]
+    assert (p.hits, p.misses) == (1, 1)
+
+    # Least recently used entry ("a") is evicted past max_size
+    p.generate("b")
+    p.generate("c")
+    p.generate("a")
+    assert calls == ["a", "b", "c", "a"]
+
+
+def test_cached_provider_batch_sends_each_missing_prompt_once():
+    batches = []
+
+    class Inner(MockLLMProvider):
+        def generate_batch(self, prompts):
+            batches.append(list(prompts))
+            return super().generate_batch(prompts)
+
+    p = CachedLLMProvider(Inner(response_factory=str.upper))
+    p.generate("a")
+
+    assert p.generate_batch(["a", "b", "b", "c"]) == ["A", "B", "B", "C"]
+    assert batches == [["b", "c"]]
+
+
+def test_api_provider_sends_response_schema_as_response_format(monkeypatch):
+    from llm_detection.types import FINDINGS_JSON_SCHEMA
+
+    sent = {}
+
+    class StubResp:
+        headers = {"content-type": "text/plain"}
+        text = '{"findings": []}'
+
+        def raise_for_status(self):
+            return None
+
+    class StubClient:
+        def __init__(self, timeout):
+            self.timeout = timeout
+
+        def post(self, url, json):
+            sent.update(json)
+            return StubResp()
+
+    stub_httpx = types.SimpleNamespace(Client=lambda timeout: StubClient(timeout=timeout))
+    monkeypatch.setitem(__import__("sys").modules, "httpx", stub_httpx)
+
+    p = ApiLLMProvider(base_url="http://example", response_schema=FINDINGS_JSON_SCHEMA)
+    assert p.returns_json
+    assert p.generate("p") == '{"findings": []}'
+    assert sent["response_format"]["type"] == "json_schema"
+    assert sent["response_format"]["json_schema"]["schema"] is FINDINGS_JSON_SCHEMA
+
+
+def test_returns_json_follows_structured_output_settings():
+    assert not MockLLMProvider(fixed_response="x").returns_json
+    assert not ApiLLMProvider(base_url="http://example").returns_json
+    assert not LocalLLMProvider(model_name="m").returns_json
+    assert LocalLLMProvider(model_name="m", response_format="json").returns_json
+    assert CachedLLMProvider(LocalLLMProvider(model_name="m", response_format="json")).returns_json
+
+
+def test_api_provider_sizes_keepalive_pool_from_max_connections(monkeypatch):
+    created = []
+
+    class StubLimits:
+        def __init__(self, max_connections, max_keepalive_connections):
+            self.max_connections = max_connections
+            self.max_keepalive_connections = max_keepalive_connections
+
+    def make_client(timeout, limits=None):
+        created.append(limits)
+        return types.SimpleNamespace(close=lambda: None)
+
+    stub_httpx = types.SimpleNamespace(Client=make_client, Limits=StubLimits)
+    monkeypatch.setitem(__import__("sys").modules, "httpx", stub_httpx)
+
+    with ApiLLMProvider(base_url="http://example", max_connections=8) as p:
+        p._get_client()
+        p._get_client()
+
+    assert len(created) == 1
+    assert created[0].max_connections == 8
+    assert created[0].max_keepalive_connections == 8
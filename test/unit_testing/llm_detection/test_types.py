@@ -1,6 +1,15 @@
+from dataclasses import asdict
+
 import pytest
 
-from llm_detection.types import LLMCatalog, LLMSmellDefinition, PromptMode
+from llm_detection.types import (
+    DetectionTarget,
+    LLMCatalog,
+    LLMProviderDefinition,
+    LLMSmellDefinition,
+    PromptMode,
+    ProviderKind,
+)
 
 
 def test_smell_is_ready_for_detection_requires_enabled_and_default_prompt():
@@ -137,3 +146,236 @@ def test_catalog_get_smell_and_upsert():
     catalog.upsert_smell(s1_updated)
     assert len(catalog.smells) == 1
     assert catalog.get_smell("s1").display_name == "S1-new"
+
+
+def test_catalog_index_follows_direct_list_changes_and_remove():
+    def smell(smell_id):
+        return LLMSmellDefinition(
+            smell_id=smell_id,
+            display_name=smell_id.upper(),
+            description="d",
+            default_prompt="p",
+        )
+
+    catalog = LLMCatalog(smells=[smell("s1")])
+    assert catalog.has_smell("s1")
+
+    catalog.smells.append(smell("s2"))
+    assert catalog.get_smell("s2").display_name == "S2"
+
+    catalog.smells = [smell("s3")]
+    assert not catalog.has_smell("s1")
+    assert catalog.get_smell("s3").display_name == "S3"
+
+    catalog.remove_smell("s3")
+    assert catalog.smells == []
+    with pytest.raises(KeyError):
+        catalog.remove_smell("s3")
+    assert "_positions" not in asdict(catalog)
+
+
+def test_catalog_index_follows_items_replaced_in_place():
+    def smell(smell_id, name):
+        return LLMSmellDefinition(
+            smell_id=smell_id, display_name=name, description="d", default_prompt="p"
+        )
+
+    catalog = LLMCatalog(smells=[smell("s1", "beta"), smell("s2", "gamma")])
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["s1", "s2"]
+
+    catalog.smells[0] = smell("s3", "alpha")
+    assert not catalog.has_smell("s1")
+    with pytest.raises(KeyError):
+        catalog.get_smell("s1")
+    assert catalog.has_smell("s3")
+    assert catalog.get_smell("s3").display_name == "alpha"
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["s3", "s2"]
+
+    catalog.upsert_smell(smell("s3", "delta"))
+    assert [s.smell_id for s in catalog.smells] == ["s3", "s2"]
+    catalog.remove_smell("s3")
+    assert [s.smell_id for s in catalog.smells] == ["s2"]
+    with pytest.raises(KeyError):
+        catalog.remove_smell("s1")
+
+
+def test_catalog_get_provider_follows_provider_list_changes():
+    def provider(provider_id):
+        return LLMProviderDefinition(
+            provider_id=provider_id, kind=ProviderKind.LOCAL, display_name=provider_id
+        )
+
+    catalog = LLMCatalog(providers=[provider("p1")])
+    assert catalog.get_provider("p1").provider_id == "p1"
+    with pytest.raises(KeyError):
+        catalog.get_provider("p2")
+
+    catalog.providers.append(provider("p2"))
+    assert catalog.get_provider("p2").provider_id == "p2"
+
+    catalog.providers = [provider("p3")]
+    with pytest.raises(KeyError):
+        catalog.get_provider("p1")
+    assert "_provider_positions" not in asdict(catalog)
+
+
+def test_catalog_get_provider_follows_items_replaced_in_place():
+    def provider(provider_id):
+        return LLMProviderDefinition(
+            provider_id=provider_id, kind=ProviderKind.LOCAL, display_name=provider_id
+        )
+
+    catalog = LLMCatalog(providers=[provider("a"), provider("c")])
+    assert catalog.get_provider("a").provider_id == "a"
+
+    replacement = provider("b")
+    catalog.providers[0] = replacement
+    assert catalog.get_provider("b") is replacement
+    with pytest.raises(KeyError):
+        catalog.get_provider("a")
+    assert catalog.get_provider("c").provider_id == "c"
+
+
+def test_catalog_sorted_smells_is_cached_until_smells_change():
+    def smell(smell_id, name):
+        return LLMSmellDefinition(
+            smell_id=smell_id, display_name=name, description="d", default_prompt="p"
+        )
+
+    catalog = LLMCatalog(smells=[smell("b", "beta"), smell("a", "Alpha")])
+    first = catalog.sorted_smells()
+    assert [s.smell_id for s in first] == ["a", "b"]
+
+    catalog.upsert_smell(smell("c", "Aardvark"))
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["c", "a", "b"]
+
+    catalog.smells.append(smell("d", "delta"))
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["c", "a", "b", "d"]
+    # Persisted order is left untouched
+    assert [s.smell_id for s in catalog.smells] == ["b", "a", "c", "d"]
+
+
+def test_catalog_sorted_smells_follows_in_place_edits():
+    def smell(smell_id, name):
+        return LLMSmellDefinition(
+            smell_id=smell_id, display_name=name, description="d", default_prompt="p"
+        )
+
+    catalog = LLMCatalog(smells=[smell("x", "beta"), smell("y", "alpha")])
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["y", "x"]
+
+    catalog.smells[0] = smell("z", "gamma")
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["y", "z"]
+
+    catalog.smells[1].display_name = "omega"
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["z", "y"]
+
+
+def test_detection_target_split_keeps_small_or_unparseable_targets():
+    small = DetectionTarget(filename="a.py", code="x = 1\n")
+    assert small.split(max_chars=100) == [small]
+
+    broken = DetectionTarget(filename="b.py", code="def f(:\n" * 20)
+    assert broken.split(max_chars=10) == [broken]
+
+
+def test_detection_target_split_aligns_windows_on_top_level_statements():
+    code = (
+        "# header\n"
+        "import os\n"
+        "\n"
+        "@decorator\n"
+        "def a():\n"
+        "    return 1\n"
+        "\n"
+        "class B:\n"
+        "    x = 1\n"
+    )
+    target = DetectionTarget(filename="pkg/mod.py", code=code)
+
+    windows = target.split(max_chars=30)
+
+    assert [w.first_line for w in windows] == [1, 4, 8]
+    assert windows[1].code.startswith("@decorator\ndef a():")
+    assert all(w.filename == "pkg/mod.py" for w in windows)
+    assert "".join(w.code for w in windows) == code
+
+
+def test_detection_target_split_packs_statements_up_to_limit():
+    code = "".join(f"v{i} = {i}\n" for i in range(10))  # 7 chars per line
+    windows = DetectionTarget(filename="m.py", code=code).split(max_chars=21)
+
+    assert [w.first_line for w in windows] == [1, 4, 7, 10]
+    assert windows[0].code == "v0 = 0\nv1 = 1\nv2 = 2\n"
+
+
+def test_detection_target_split_counts_only_real_newlines():
+    code = (
+        "x = 1\n"
+        "\x0c\n"
+        "s = 'a\u2028b'\n"
+        "def f():\n"
+        "    return 1\n"
+        "\n"
+        "def g():\n"
+        "    return 2\n"
+    )
+    windows = DetectionTarget(filename="m.py", code=code).split(max_chars=30)
+
+    assert "".join(w.code for w in windows) == code
+    for w in windows:
+        first = code.split("\n")[w.first_line - 1]
+        assert w.code.startswith(first)
+    assert any(w.code.startswith("def f():") for w in windows)
+    assert any(w.code.startswith("def g():") for w in windows)
+
+
+def test_detection_target_and_finding_are_slotted():
+    from llm_detection.types import LLMSmellFinding
+
+    target = DetectionTarget(filename="a.py", code="x = 1\n")
+    finding = LLMSmellFinding(
+        filename="a.py", function_name="", smell_name="S", line=1, description="d"
+    )
+    assert not hasattr(target, "__dict__")
+    assert not hasattr(finding, "__dict__")
+    assert asdict(finding)["line"] == 1
+
+
+def test_smell_get_prompt_accepts_mode_values_and_reflects_edits():
+    smell = LLMSmellDefinition(
+        smell_id="s1",
+        display_name="S1",
+        description="desc",
+        default_prompt="default",
+        draft_prompt=None,
+    )
+    assert smell.get_prompt("draft_if_available") == "default"
+
+    smell.draft_prompt = "draft"
+    assert smell.get_prompt(PromptMode.DRAFT_IF_AVAILABLE) == "draft"
+    assert "_PROMPT_GETTERS" not in asdict(smell)
+
+
+def test_detection_target_split_also_caps_lines_per_window():
+    code = "".join(f"v{i} = {i}\n" for i in range(10))
+    target = DetectionTarget(filename="m.py", code=code, first_line=5)
+
+    assert target.split(max_chars=10_000) == [target]
+    windows = target.split(max_chars=10_000, max_lines=4)
+    assert [w.first_line for w in windows] == [5, 9, 13]
+    assert all(w.code.count("\n") <= 4 for w in windows)
+    assert "".join(w.code for w in windows) == code
+
+
+def test_catalog_sorted_smells_compares_display_names_casefolded():
+    def smell(smell_id, name):
+        return LLMSmellDefinition(
+            smell_id=smell_id, display_name=name, description="d", default_prompt="p"
+        )
+
+    catalog = LLMCatalog(smells=[smell("b", "strasse b"), smell("a", "STRASSE")])
+    # "Straße" casefolds to "strasse", which lower() alone would not produce
+    catalog.upsert_smell(smell("c", "Straße"))
+
+    assert [s.smell_id for s in catalog.sorted_smells()] == ["a", "c", "b"]
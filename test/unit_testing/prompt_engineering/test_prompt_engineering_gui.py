@@ -1,8 +1,9 @@
+import json
+import os
 import tkinter as tk
 from types import SimpleNamespace
 
 import pytest
-import pandas as pd
 
 from llm_detection.catalog_service import CatalogValidationError
 from llm_detection.types import (
@@ -116,6 +117,7 @@ def test_empty_smell_catalog_disables_ui_and_logs_message(tk_root):
     assert str(gui._test_btn.cget("state")) == "disabled"
     assert str(gui._local_provider_combo.cget("state")) == "disabled"
 
+    gui._flush_output()
     out = gui._output_text.get("1.0", "end")
     assert "Catalogo smell vuoto" in out
 
@@ -143,6 +145,7 @@ def test_no_local_provider_disables_provider_combo_and_logs_message(tk_root):
     assert gui._selected_local_provider_id is None
     assert str(gui._local_provider_combo.cget("state")) == "disabled"
 
+    gui._flush_output()
     out = gui._output_text.get("1.0", "end")
     assert "Nessun provider LLM locale configurato" in out
     assert str(gui._test_btn.cget("state")) == "disabled"
@@ -268,6 +271,15 @@ def test_build_local_provider_by_id_uses_fallbacks_and_aliases():
     assert provider.response_format == "json"
 
 
+@pytest.mark.parametrize("provider_id", ["api", "missing"])
+def test_build_local_provider_by_id_rejects_unknown_or_non_local(provider_id):
+    api_provider = LLMProviderDefinition(provider_id="api", kind=ProviderKind.API, display_name="Api")
+    cat = _catalog_with_smells_and_providers(smells=[], providers=[api_provider])
+
+    with pytest.raises(RuntimeError, match="Local provider not found or not local"):
+        PromptEngineeringGUI._build_local_provider_by_id(cat, provider_id)
+
+
 def _make_ready_gui(tk_root, *, mode: PromptMode = PromptMode.DRAFT) -> tuple[PromptEngineeringGUI, FakeCatalogService]:
     smell = LLMSmellDefinition(
         smell_id="s1",
@@ -324,7 +336,7 @@ def test_on_test_clicked_validation_errors(tk_root, mocker, variant, expected_ti
         gui._set_prompt_text("   ", editable=True)
     elif variant == "no_py_files":
         mocker.patch(
-            "prompt_engineering.prompt_engineering_gui.FileUtils.get_python_files",
+            "prompt_engineering.prompt_engineering_gui.FileUtils.iter_python_files",
             return_value=[],
         )
     else:
@@ -340,7 +352,7 @@ def test_on_test_clicked_validation_errors(tk_root, mocker, variant, expected_ti
 def test_on_test_clicked_many_files_user_cancels_does_not_start_thread(tk_root, mocker):
     gui, _svc = _make_ready_gui(tk_root)
     mocker.patch(
-        "prompt_engineering.prompt_engineering_gui.FileUtils.get_python_files",
+        "prompt_engineering.prompt_engineering_gui.FileUtils.iter_python_files",
         return_value=[f"f{i}.py" for i in range(16)],
     )
     mocker.patch("tkinter.messagebox.askyesno", return_value=False)
@@ -351,6 +363,29 @@ def test_on_test_clicked_many_files_user_cancels_does_not_start_thread(tk_root,
     thread_ctor.assert_not_called()
 
 
+def test_on_test_clicked_stops_walking_once_confirmation_is_needed(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    walked = []
+
+    def endless_walk(_path):
+        i = 0
+        while True:
+            walked.append(i)
+            yield f"f{i}.py"
+            i += 1
+
+    mocker.patch(
+        "prompt_engineering.prompt_engineering_gui.FileUtils.iter_python_files",
+        side_effect=endless_walk,
+    )
+    askyesno = mocker.patch("tkinter.messagebox.askyesno", return_value=False)
+
+    gui._on_test_clicked()
+
+    askyesno.assert_called_once()
+    assert len(walked) == gui.CONFIRM_FILE_COUNT + 1
+
+
 @pytest.mark.parametrize(
     "mode, expect_draft_saved",
     [
@@ -361,7 +396,7 @@ def test_on_test_clicked_many_files_user_cancels_does_not_start_thread(tk_root,
 def test_on_test_clicked_starts_thread_and_optional_draft_save(tk_root, mocker, mode, expect_draft_saved):
     gui, svc = _make_ready_gui(tk_root, mode=mode)
     mocker.patch(
-        "prompt_engineering.prompt_engineering_gui.FileUtils.get_python_files",
+        "prompt_engineering.prompt_engineering_gui.FileUtils.iter_python_files",
         return_value=["a.py"],
     )
     mocker.patch("prompt_engineering.prompt_engineering_gui.os.makedirs")
@@ -383,12 +418,44 @@ def test_on_test_clicked_starts_thread_and_optional_draft_save(tk_root, mocker,
     gui._on_test_clicked()
 
     assert started["value"] is True
+    assert gui._worker.target == gui._worker_loop
+    expected_draft = "PROMPT" if mode == PromptMode.DRAFT else None
+    assert gui._job_queue.get_nowait() == ("s1", mode, "C:/in", "C:/out", "local", expected_draft)
     if expect_draft_saved:
         assert ("s1", "PROMPT") in svc.saved_drafts
     else:
         assert svc.saved_drafts == []
 
 
+def test_worker_loop_runs_queued_jobs_until_stopped(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    run = mocker.patch.object(gui, "_run_test_thread")
+    job = ("s1", PromptMode.DEFAULT, "in", "out", "local")
+
+    gui._job_queue.put(job)
+    gui._job_queue.put(job)
+    gui._job_queue.put(None)
+    gui._worker_loop()
+
+    assert run.call_args_list == [mocker.call(*job), mocker.call(*job)]
+
+
+def test_local_provider_is_reused_until_its_config_changes(tk_root, mocker):
+    gui, svc = _make_ready_gui(tk_root)
+    build = mocker.patch.object(
+        PromptEngineeringGUI, "_build_local_provider_by_id", side_effect=lambda _c, _p: object()
+    )
+    catalog = svc.load()
+
+    first = gui._get_local_provider(catalog, "local")
+    assert gui._get_local_provider(catalog, "local") is first
+    assert build.call_count == 1
+
+    catalog.get_provider("local").config = {"model_name": "y"}
+    assert gui._get_local_provider(catalog, "local") is not first
+    assert build.call_count == 2
+
+
 def test_on_save_default_clicked_saves_and_promotes(tk_root, mocker):
     gui, svc = _make_ready_gui(tk_root, mode=PromptMode.DRAFT)
     gui._set_prompt_text("NEW DRAFT", editable=True)
@@ -409,11 +476,13 @@ def test_on_cancel_clicked_sets_event_and_logs(tk_root):
     gui._on_cancel_clicked()
 
     assert gui._cancel_event.is_set() is True
+    gui._flush_output()
     assert "Richiesta cancellazione" in gui._output_text.get("1.0", "end")
 
 
 def test_run_test_thread_success_writes_outputs_and_updates_ui(tk_root, mocker, tmp_path):
-    gui, _svc = _make_ready_gui(tk_root, mode=PromptMode.DRAFT)
+    gui, svc = _make_ready_gui(tk_root, mode=PromptMode.DRAFT)
+    overrides = []
 
     # Make after() execute callbacks immediately.
     def immediate_after(_ms, func=None, *args):
@@ -431,7 +500,10 @@ def test_run_test_thread_success_writes_outputs_and_updates_ui(tk_root, mocker,
             self.provider = provider
             self.catalog = catalog
 
-        def detect_for_prompt_engineering_with_raw(self, targets, smell_id, prompt_mode):
+        def detect_for_prompt_engineering_with_raw(
+            self, targets, smell_id, prompt_mode, max_workers=1, cancel_check=None, draft_prompt_override=None
+        ):
+            overrides.append(draft_prompt_override)
             findings = [
                 LLMSmellFinding(
                     filename=targets[0].filename,
@@ -452,21 +524,6 @@ def test_run_test_thread_success_writes_outputs_and_updates_ui(tk_root, mocker,
             raw = {targets[0].filename: "RAW"}
             return findings, stats, raw
 
-        def findings_to_dataframe(self, findings):
-            return pd.DataFrame(
-                [
-                    {
-                        "filename": f.filename,
-                        "function_name": f.function_name,
-                        "smell_name": f.smell_name,
-                        "line": f.line,
-                        "description": f.description,
-                        "additional_info": "",
-                    }
-                    for f in findings
-                ]
-            )
-
     mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", FakeOrchestrator)
 
     in_dir = tmp_path / "proj"
@@ -481,21 +538,42 @@ def test_run_test_thread_success_writes_outputs_and_updates_ui(tk_root, mocker,
     gui._run_test_thread(
         smell_id="s1",
         mode=PromptMode.DRAFT,
-        python_files=[str(py_file)],
+        input_path=str(py_file),
         output_path=str(out_dir),
         provider_id="local",
     )
 
+    # The draft is handed to the orchestrator without touching the catalog
+    assert overrides == ["DRAFT RUN"]
+    assert svc.load().get_smell("s1").draft_prompt == "draft"
+
     # Ensure output artifacts exist.
     output_folder = out_dir / "output"
     assert output_folder.exists()
-    assert list(output_folder.glob("prompt_engineering_s1_*.csv"))
-    assert list(output_folder.glob("prompt_engineering_s1_*_raw.jsonl"))
+    csv_files = list(output_folder.glob("prompt_engineering_s1_*.csv"))
+    assert len(csv_files) == 1
+    assert csv_files[0].read_text(encoding="utf-8").splitlines() == [
+        "filename,function_name,smell_name,line,description,additional_info",
+        f"{py_file},f,S,10,d,",
+    ]
+    raw_files = list(output_folder.glob("prompt_engineering_s1_*_raw.jsonl"))
+    assert raw_files
+    records = [json.loads(line) for line in raw_files[0].read_text(encoding="utf-8").splitlines()]
+    assert records == [
+        {
+            "filename": str(py_file),
+            "smell_id": "s1",
+            "prompt_mode": "draft",
+            "provider_id": "local",
+            "raw_response": "RAW",
+        }
+    ]
 
     # UI log contains completion.
+    gui._flush_output()
     out_text = gui._output_text.get("1.0", "end")
     assert "Test completato" in out_text
-    assert "parse_errors" in out_text
+    assert "Findings: 2 (valid: 1 | parse_errors: 1)" in out_text
 
 
 def test_run_test_thread_handles_exception_and_logs_traceback(tk_root, mocker, tmp_path):
@@ -516,9 +594,6 @@ def test_run_test_thread_handles_exception_and_logs_traceback(tk_root, mocker, t
         def detect_for_prompt_engineering_with_raw(self, *args, **kwargs):
             raise RuntimeError("boom")
 
-        def findings_to_dataframe(self, findings):
-            return pd.DataFrame([])
-
     mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", BoomOrchestrator)
 
     in_dir = tmp_path / "proj"
@@ -532,16 +607,204 @@ def test_run_test_thread_handles_exception_and_logs_traceback(tk_root, mocker, t
     gui._run_test_thread(
         smell_id="s1",
         mode=PromptMode.DEFAULT,
-        python_files=[str(py_file)],
+        input_path=str(py_file),
         output_path=str(out_dir),
         provider_id="local",
     )
 
+    gui._flush_output()
     out_text = gui._output_text.get("1.0", "end")
     assert "Errore durante il test" in out_text
     assert "RuntimeError: boom" in out_text
 
 
+def test_run_test_thread_streams_raw_records_before_a_later_failure(tk_root, mocker, tmp_path):
+    gui, _svc = _make_ready_gui(tk_root, mode=PromptMode.DEFAULT)
+    mocker.patch.object(gui.master, "after", return_value="after-id")
+    mocker.patch.object(PromptEngineeringGUI, "_build_local_provider_by_id", return_value=object())
+
+    class SecondFileFails:
+        def __init__(self, provider=None, catalog=None):
+            self.calls = 0
+
+        def detect_for_prompt_engineering_with_raw(
+            self, targets, smell_id, prompt_mode, max_workers=1, cancel_check=None, draft_prompt_override=None
+        ):
+            self.calls += 1
+            if self.calls > 1:
+                raise RuntimeError("boom")
+            return [], SimpleNamespace(prompts_sent=1), {targets[0].filename: "RAW-1"}
+
+    mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", SecondFileFails)
+    gui.TEST_BATCH_SIZE = 1
+
+    in_dir = tmp_path / "proj"
+    in_dir.mkdir()
+    files = []
+    for name in ("a.py", "b.py"):
+        (in_dir / name).write_text("x = 1\n", encoding="utf-8")
+        files.append(str(in_dir / name))
+
+    gui._run_test_thread(
+        smell_id="s1",
+        mode=PromptMode.DEFAULT,
+        input_path=str(in_dir),
+        output_path=str(tmp_path),
+        provider_id="local",
+    )
+
+    (raw_file,) = (tmp_path / "output").glob("prompt_engineering_s1_*_raw.jsonl")
+    records = [json.loads(line) for line in raw_file.read_text(encoding="utf-8").splitlines()]
+    assert [r["raw_response"] for r in records] == ["RAW-1"]
+
+
+def test_run_test_thread_sends_files_to_the_orchestrator_in_batches(tk_root, mocker, tmp_path):
+    gui, _svc = _make_ready_gui(tk_root, mode=PromptMode.DEFAULT)
+    gui._flush_output()
+    after = mocker.patch.object(gui.master, "after", return_value="after-id")
+    mocker.patch.object(PromptEngineeringGUI, "_build_local_provider_by_id", return_value=object())
+    gui.TEST_BATCH_SIZE = 2
+    batches = []
+
+    class Recording:
+        def __init__(self, provider=None, catalog=None):
+            pass
+
+        def detect_for_prompt_engineering_with_raw(
+            self, targets, smell_id, prompt_mode, max_workers=1, cancel_check=None, draft_prompt_override=None
+        ):
+            batches.append([os.path.basename(t.filename) for t in targets])
+            raw = {t.filename: f"RAW {os.path.basename(t.filename)}" for t in targets}
+            return [], SimpleNamespace(prompts_sent=len(targets)), raw
+
+    mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", Recording)
+
+    in_dir = tmp_path / "proj"
+    in_dir.mkdir()
+    for name in ("a.py", "b.py", "c.py"):
+        (in_dir / name).write_text("x = 1\n", encoding="utf-8")
+    mocker.patch(
+        "prompt_engineering.prompt_engineering_gui.FileUtils.get_python_files",
+        return_value=[str(in_dir / name) for name in ("a.py", "b.py", "c.py")],
+    )
+
+    gui._run_test_thread(
+        smell_id="s1",
+        mode=PromptMode.DEFAULT,
+        input_path=str(in_dir),
+        output_path=str(tmp_path),
+        provider_id="local",
+    )
+
+    assert batches == [["a.py", "b.py"], ["c.py"]]
+    (raw_file,) = (tmp_path / "output").glob("prompt_engineering_s1_*_raw.jsonl")
+    records = [json.loads(line) for line in raw_file.read_text(encoding="utf-8").splitlines()]
+    assert [r["raw_response"] for r in records] == ["RAW a.py", "RAW b.py", "RAW c.py"]
+
+    # One progress callback per batch (plus the final one), each logging its files
+    callbacks = [c.args[1] for c in after.call_args_list]
+    assert len(callbacks) == 3
+    callbacks[0]()
+    gui._flush_output()
+    out_text = gui._output_text.get("1.0", "end")
+    assert "[1/3] Avvio analisi: a.py" in out_text
+    assert "[2/3] Avvio analisi: b.py" in out_text
+    assert gui._running_index == 2
+    assert gui._running_filename == "b.py"
+
+
+def test_run_test_thread_reads_the_next_batch_while_the_current_one_runs(tk_root, mocker, tmp_path):
+    import threading
+
+    gui, _svc = _make_ready_gui(tk_root, mode=PromptMode.DEFAULT)
+    mocker.patch.object(gui.master, "after", return_value="after-id")
+    mocker.patch.object(PromptEngineeringGUI, "_build_local_provider_by_id", return_value=object())
+    gui.TEST_BATCH_SIZE = 1
+
+    read_original = PromptEngineeringGUI._read_targets
+    second_read = threading.Event()
+
+    def read_targets(filenames):
+        if filenames and filenames[0].endswith("b.py"):
+            second_read.set()
+        return read_original(filenames)
+
+    mocker.patch.object(PromptEngineeringGUI, "_read_targets", side_effect=read_targets)
+    overlapped = []
+
+    class Prefetching:
+        def __init__(self, provider=None, catalog=None):
+            pass
+
+        def detect_for_prompt_engineering_with_raw(
+            self, targets, smell_id, prompt_mode, max_workers=1, cancel_check=None, draft_prompt_override=None
+        ):
+            if targets[0].filename.endswith("a.py"):
+                overlapped.append(second_read.wait(timeout=5))
+            return [], SimpleNamespace(prompts_sent=1), {targets[0].filename: "RAW"}
+
+    mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", Prefetching)
+
+    in_dir = tmp_path / "proj"
+    in_dir.mkdir()
+    for name in ("a.py", "b.py"):
+        (in_dir / name).write_text("x = 1\n", encoding="utf-8")
+    mocker.patch(
+        "prompt_engineering.prompt_engineering_gui.FileUtils.get_python_files",
+        return_value=[str(in_dir / "a.py"), str(in_dir / "b.py")],
+    )
+
+    gui._run_test_thread(
+        smell_id="s1",
+        mode=PromptMode.DEFAULT,
+        input_path=str(in_dir),
+        output_path=str(tmp_path),
+        provider_id="local",
+    )
+
+    assert overlapped == [True]
+
+
+def test_run_test_thread_lets_the_orchestrator_observe_cancellation(tk_root, mocker, tmp_path):
+    gui, _svc = _make_ready_gui(tk_root, mode=PromptMode.DEFAULT)
+    mocker.patch.object(gui.master, "after", return_value="after-id")
+    mocker.patch.object(PromptEngineeringGUI, "_build_local_provider_by_id", return_value=object())
+    calls = []
+
+    class CancelledMidRun:
+        def __init__(self, provider=None, catalog=None):
+            pass
+
+        def detect_for_prompt_engineering_with_raw(
+            self, targets, smell_id, prompt_mode, max_workers=1, cancel_check=None, draft_prompt_override=None
+        ):
+            calls.append(targets[0].filename)
+            # The user cancels while the first file is being analyzed
+            gui._on_cancel_clicked()
+            if cancel_check():
+                return [], SimpleNamespace(prompts_sent=0), {}
+            raise AssertionError("cancel_check should see the cancellation")
+
+    mocker.patch("prompt_engineering.prompt_engineering_gui.LLMOrchestrator", CancelledMidRun)
+
+    in_dir = tmp_path / "proj"
+    in_dir.mkdir()
+    for name in ("a.py", "b.py"):
+        (in_dir / name).write_text("x = 1\n", encoding="utf-8")
+
+    gui._run_test_thread(
+        smell_id="s1",
+        mode=PromptMode.DEFAULT,
+        input_path=str(in_dir),
+        output_path=str(tmp_path),
+        provider_id="local",
+    )
+
+    assert len(calls) == 1
+    (raw_file,) = (tmp_path / "output").glob("prompt_engineering_s1_*_raw.jsonl")
+    assert raw_file.read_bytes() == b""
+
+
 def test_choose_input_and_output_path_update_labels(tk_root, mocker):
     gui, _svc = _make_ready_gui(tk_root)
     mocker.patch("tkinter.filedialog.askdirectory", return_value="C:/my/input")
@@ -588,14 +851,99 @@ def test_on_close_dirty_prompt_user_cancels_does_not_destroy(tk_root, mocker):
     destroy.assert_not_called()
 
 
+def test_prompt_edits_are_debounced_into_one_dirty_update(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    after = mocker.patch.object(gui.master, "after", side_effect=["edit-1", "edit-2", "edit-3"])
+    after_cancel = mocker.patch.object(gui.master, "after_cancel")
+
+    for _ in range(3):
+        gui._on_prompt_edited(None)
+
+    assert gui._draft_dirty is False
+    assert after.call_count == 3
+    assert [c.args[0] for c in after_cancel.call_args_list] == ["edit-1", "edit-2"]
+
+    gui._apply_prompt_edit()
+    assert gui._draft_dirty is True
+    assert gui._edited_after_id is None
+
+
+def test_pending_prompt_edit_is_seen_by_the_discard_check(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    mocker.patch.object(gui.master, "after", return_value="edit-id")
+    after_cancel = mocker.patch.object(gui.master, "after_cancel")
+    ask = mocker.patch("tkinter.messagebox.askyesno", return_value=False)
+
+    gui._on_prompt_edited(None)
+    # Switching to default before the debounce fired still asks to discard
+    gui._mode_var.set(PromptMode.DEFAULT.value)
+    gui._on_prompt_mode_changed()
+
+    after_cancel.assert_called_once_with("edit-id")
+    ask.assert_called_once()
+    assert gui._mode_var.get() == PromptMode.DRAFT.value
+
+
+def test_saving_the_draft_drops_a_pending_prompt_edit(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    mocker.patch.object(gui.master, "after", return_value="edit-id")
+    after_cancel = mocker.patch.object(gui.master, "after_cancel")
+    mocker.patch("tkinter.messagebox.askyesno", return_value=False)
+
+    gui._on_prompt_edited(None)
+    gui._on_save_default_clicked()
+
+    after_cancel.assert_called_once_with("edit-id")
+    assert gui._edited_after_id is None
+    assert gui._draft_dirty is False
+
+
 def test_append_output_keeps_widget_disabled(tk_root):
     gui, _svc = _make_ready_gui(tk_root)
     assert str(gui._output_text.cget("state")) == "disabled"
     gui._append_output("hello")
-    assert "hello" in gui._output_text.get("1.0", "end")
+    gui._append_output(" world")
+    gui._flush_output()
+    assert "hello world" in gui._output_text.get("1.0", "end")
     assert str(gui._output_text.cget("state")) == "disabled"
 
 
+def test_output_box_keeps_only_the_most_recent_lines(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    gui._flush_output()
+    mocker.patch.object(gui.master, "after", return_value="flush-id")
+    gui._output_text.configure(state="normal")
+    gui._output_text.delete("1.0", "end")
+    gui._output_text.configure(state="disabled")
+
+    for i in range(gui.OUTPUT_OVERFLOW_LINES + 1):
+        gui._append_output(f"line {i}\n")
+    while not gui._output_sink.queue.empty():
+        gui._flush_output()
+
+    lines = gui._output_text.get("1.0", "end-1c").splitlines()
+    assert len(lines) == gui.OUTPUT_MAX_LINES
+    assert lines[-1] == f"line {gui.OUTPUT_OVERFLOW_LINES}"
+
+
+def test_append_output_schedules_a_single_flush_per_burst(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    gui._flush_output()
+    after = mocker.patch.object(gui.master, "after", return_value="flush-id")
+    insert = mocker.spy(gui._output_text, "insert")
+
+    for i in range(5):
+        gui._append_output(f"line {i}\n")
+
+    after.assert_called_once_with(gui.OUTPUT_FLUSH_MS, gui._flush_output)
+    insert.assert_not_called()
+
+    gui._flush_output()
+    insert.assert_called_once()
+    assert gui._output_flush_id is None
+    assert "line 0\nline 1\nline 2\nline 3\nline 4\n" in gui._output_text.get("1.0", "end")
+
+
 def test_build_local_provider_by_id_raises_if_missing_or_not_local():
     smell = LLMSmellDefinition(
         smell_id="s1",
@@ -618,6 +966,19 @@ def test_build_local_provider_by_id_raises_if_missing_or_not_local():
         PromptEngineeringGUI._build_local_provider_by_id(cat, "missing")
 
 
+def test_set_prompt_text_only_configures_state_when_it_changes(tk_root, mocker):
+    gui, _svc = _make_ready_gui(tk_root)
+    configure = mocker.spy(gui._prompt_text, "configure")
+
+    gui._set_prompt_text("editable", editable=True)
+    configure.assert_not_called()
+
+    gui._set_prompt_text("read only", editable=False)
+    assert [c.kwargs for c in configure.call_args_list] == [{"state": "disabled"}]
+    assert str(gui._prompt_text.cget("state")) == "disabled"
+    assert "read only" in gui._prompt_text.get("1.0", "end")
+
+
 def test_set_running_state_disables_controls_and_restores_after(tk_root, mocker):
     gui, _svc = _make_ready_gui(tk_root)
     refresh = mocker.patch.object(gui, "_refresh_prompt_view")
@@ -663,6 +1024,13 @@ def test_schedule_and_stop_heartbeat_update_status_once(tk_root, mocker):
     assert "Running:" in gui._status_var.get()
     assert "file: a.py" in gui._status_var.get()
 
+    # A tick with nothing new leaves the status variable alone
+    mocker.patch("prompt_engineering.prompt_engineering_gui.monotonic", return_value=0.5)
+    status_set = mocker.spy(gui._status_var, "set")
+    scheduled["tick"]()
+    scheduled["tick"]()
+    assert status_set.call_count == 1
+
     gui._stop_heartbeat()
     assert calls["canceled"] is True
 
@@ -726,3 +1094,58 @@ def test_on_smell_selected_with_dirty_draft_and_user_cancels_restores_combo(tk_r
 
     assert gui._current_smell_id == "s1"
     assert gui._smell_combo.get() == initial_display
+
+
+def test_ui_actions_reuse_the_parsed_catalog(tk_root, mocker, tmp_path):
+    from llm_detection.catalog_service import LLMCatalogService
+    from llm_detection.catalog_store import LLMCatalogStore
+
+    store = LLMCatalogStore(file_path=str(tmp_path / "catalog.json"))
+    store.save(
+        _catalog_with_smells_and_providers(
+            smells=[
+                LLMSmellDefinition("s1", "One", "d", "default 1", "draft 1", enabled=True),
+                LLMSmellDefinition("s2", "Two", "d", "default 2", "draft 2", enabled=True),
+            ],
+            providers=[LLMProviderDefinition("local", ProviderKind.LOCAL, "Local")],
+        )
+    )
+    reads = mocker.spy(store, "load")
+    gui = PromptEngineeringGUI(tk_root, catalog_service=LLMCatalogService(store=store))
+
+    gui._smell_combo.current(1)
+    gui._on_smell_selected()
+    gui._mode_var.set(PromptMode.DEFAULT.value)
+    gui._on_prompt_mode_changed()
+
+    assert gui._get_current_prompt_text().strip() == "default 2"
+    assert reads.call_count == 1
+
+
+def test_switching_smell_and_mode_is_served_from_the_prompt_cache(tk_root, mocker):
+    gui, svc = _make_ready_gui(tk_root, mode=PromptMode.DEFAULT)
+    load = mocker.spy(svc, "load")
+
+    gui._mode_var.set(PromptMode.DRAFT.value)
+    gui._on_prompt_mode_changed()
+    gui._on_smell_selected()
+
+    load.assert_not_called()
+    assert gui._prompt_cache["s1"][1] == "default"
+
+    gui._set_prompt_text("EDITED", editable=True)
+    mocker.patch("tkinter.messagebox.askyesno", return_value=False)
+    gui._on_save_default_clicked()
+    assert gui._prompt_cache["s1"][0] == "EDITED"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonl_line_is_one_utf8_record(monkeypatch, use_orjson):
+    import prompt_engineering.prompt_engineering_gui as pe_gui
+
+    if not use_orjson:
+        monkeypatch.setattr(pe_gui, "orjson", None)
+    line = pe_gui._jsonl_line({"raw_response": "perché {\"a\": 1}\n"})
+
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line.decode("utf-8")) == {"raw_response": "perché {\"a\": 1}\n"}
@@ -1,6 +1,9 @@
 import os
 import shutil
-import pandas as pd
+from typing import Iterator
+
+# Directories get_python_files() does not descend into
+_SKIPPED_DIRS = ("venv", "lib")
 
 
 class FileUtils:
@@ -48,19 +51,52 @@ class FileUtils:
         Returns:
         - list[str]: List of Python file paths.
         """
-        result = []
+        return list(FileUtils.iter_python_files(path))
+
+    @staticmethod
+    def iter_python_files(path: str) -> Iterator[str]:
+        """
+        Lazily yields the Python files found under the specified path, in the
+        same order as get_python_files(), so callers can stop early.
+
+        Parameters:
+        - path (str): Path to search for Python files.
+
+        Returns:
+        - Iterator[str]: Python file paths.
+        """
         if os.path.isfile(path) and path.endswith(".py"):
-            return [path]
+            yield path
+            return
 
-        for root, dirs, files in os.walk(path):
-            if "venv" in dirs:
-                dirs.remove("venv")
-            if "lib" in dirs:
-                dirs.remove("lib")
-            for file in files:
-                if file.endswith(".py"):
-                    result.append(os.path.abspath(os.path.join(root, file)))
-        return result
+        yield from FileUtils._scan_python_files(os.path.abspath(path))
+
+    @staticmethod
+    def _scan_python_files(directory: str) -> Iterator[str]:
+        # Walks top-down in the same order as os.walk, but uses the type
+        # cached on each scandir entry instead of a stat per name.
+        # Symlinked directories are not followed and unreadable ones are
+        # skipped, as os.walk does by default.
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name not in _SKIPPED_DIRS and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
+
+        for subdir in subdirs:
+            yield from FileUtils._scan_python_files(subdir)
 
     @staticmethod
     def merge_results(input_dir: str, output_dir: str):
@@ -72,6 +108,8 @@ class FileUtils:
           analysis results (project_name.csv files).
         - output_dir (str): Directory where the merged results will be saved.
         """
+        import pandas as pd  # lazy: keeps FileUtils cheap to import
+
         dataframes = []
         print(f"Looking for CSV files in directory: {input_dir}")
 